@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, StudentProfile, CleanerProfile, Booking, Issue, Notification
+from .models import User, StudentProfile, CleanerProfile, Booking, Issue, Notification, NotificationReceipt, NotificationCounter, NotificationPreference, EmailOutbox, BookingDigestRun
 
 
 @admin.register(User)
@@ -57,7 +57,40 @@ class IssueAdmin(admin.ModelAdmin):
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ('id', 'user', 'title', 'is_read', 'created_at')
-    list_filter = ('is_read', 'created_at')
+    list_display = ('id', 'user', 'audience_role', 'audience_block', 'title', 'is_read', 'created_at')
+    list_filter = ('is_read', 'audience_role', 'created_at')
     search_fields = ('user__name', 'title', 'message')
     date_hierarchy = 'created_at'
+
+
+@admin.register(NotificationReceipt)
+class NotificationReceiptAdmin(admin.ModelAdmin):
+    list_display = ('id', 'notification', 'user', 'is_read', 'is_dismissed', 'updated_at')
+    list_filter = ('is_read', 'is_dismissed')
+    search_fields = ('user__name', 'notification__title')
+
+
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'unread', 'updated_at')
+    search_fields = ('user__name', 'user__email')
+
+
+@admin.register(NotificationPreference)
+class NotificationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ('user', 'muted_email_events', 'quiet_hours_start', 'quiet_hours_end', 'updated_at')
+    search_fields = ('user__name', 'user__email')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('to_email', 'subject', 'last_error')
+    date_hierarchy = 'created_at'
+
+
+@admin.register(BookingDigestRun)
+class BookingDigestRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'window_start', 'window_end', 'new_bookings', 'open_bookings', 'recipients')
+    date_hierarchy = 'window_end'
@@ -7,6 +7,8 @@ class ApiConfig(AppConfig):
     name = 'api'
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         from django.contrib.auth import get_user_model
         User = get_user_model()
 
@@ -0,0 +1,90 @@
+import hashlib
+from django.db.models import Count, Max
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def queryset_etag(request, queryset, timestamp_field='updated_at', **aggregates):
+    """
+    Weak ETag for a list response, from one aggregate query over its rows
+
+    Args:
+        request: Request being answered; the user and full path are part of the tag
+        queryset: Rows the response is built from
+        timestamp_field: Field bumped on every change (max is taken)
+        **aggregates: Extra aggregates for state the timestamp misses
+
+    Returns:
+        str: ETag header value
+    """
+    stats = queryset.order_by().aggregate(
+        count=Count('pk'),
+        latest=Max(timestamp_field),
+        **aggregates
+    )
+    return stats_etag(request, stats)
+
+
+def stats_etag(request, stats):
+    """
+    Weak ETag from already computed list statistics
+
+    Args:
+        request: Request being answered; the user and full path are part of the tag
+        stats: dict of values that change whenever the list does
+
+    Returns:
+        str: ETag header value
+    """
+    fingerprint = ':'.join(
+        [str(request.user.pk), request.get_full_path()] +
+        [f'{key}={stats[key]}' for key in sorted(stats)]
+    )
+    return 'W/"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get('If-None-Match', '')
+    return any(tag.strip() in (etag, '*') for tag in if_none_match.split(','))
+
+
+def conditional_response(request, queryset, render, timestamp_field='updated_at', **aggregates):
+    """
+    Answer 304 Not Modified when the client already has the current list,
+    otherwise call render() to serialize it
+
+    Args:
+        request: Request being answered
+        queryset: Rows the response is built from
+        render: Zero-argument callable returning the full Response
+        timestamp_field, **aggregates: Passed to queryset_etag
+
+    Returns:
+        Response: 304 without a body, or render()'s response, with the ETag set
+    """
+    etag = queryset_etag(request, queryset, timestamp_field, **aggregates)
+    return etag_response(request, etag, render)
+
+
+def etag_response(request, etag, render):
+    """
+    conditional_response() for a precomputed ETag
+
+    Args:
+        request: Request being answered
+        etag: Current ETag of the list
+        render: Zero-argument callable returning the full Response
+
+    Returns:
+        Response: 304 without a body, or render()'s response, with the ETag set
+    """
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = render()
+
+    response['ETag'] = etag
+    # Let the browser cache store it, but always revalidate
+    response['Cache-Control'] = 'private, no-cache'
+    response['Vary'] = 'Authorization'
+    return response
@@ -0,0 +1,124 @@
+"""
+In-process publish/subscribe broker for live booking events.
+
+Views publish after their transaction commits; streaming endpoints
+subscribe with the channels their user may see. Channels are
+`user:<id>` and `role:<ROLE>`.
+
+The broker lives in the web process, so events only reach clients
+connected to the same process (run one ASGI worker, or put a shared
+broker behind `publish` before scaling out).
+"""
+import asyncio
+import logging
+import threading
+from django.db import transaction
+from .serializers import BookingSerializer
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """
+    One connected client: a bounded queue on the event loop that created it
+    """
+    def __init__(self, channels):
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def deliver(self, event):
+        # publish() may run on a worker thread, so hand off to the owning loop
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop already closed, the client is gone
+            pass
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping {event['type']} event for slow subscriber on {sorted(self.channels)}")
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class EventBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channels):
+        """
+        Register a subscription; must be called from a running event loop
+        """
+        subscription = Subscription(channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def publish(self, channels, event):
+        """
+        Deliver an event once to every subscriber of any of the channels
+
+        Args:
+            channels: Iterable of channel names
+            event: JSON-serializable dict with a 'type' key
+
+        Returns:
+            int: Number of subscribers the event was handed to
+        """
+        with self._lock:
+            recipients = set()
+            for channel in channels:
+                recipients.update(self._subscriptions.get(channel, ()))
+
+        for subscription in recipients:
+            subscription.deliver(event)
+
+        return len(recipients)
+
+
+broker = EventBroker()
+
+
+def user_channels(user):
+    return [f'user:{user.id}', f'role:{user.role}']
+
+
+def booking_payload(booking):
+    # Full booking so live boards can apply the change without refetching
+    return BookingSerializer(booking).data
+
+
+def publish_booking_event(event_type, booking, cleaners=()):
+    """
+    Tell the booking's student, the admins and the given cleaners that a
+    booking changed, once the current transaction commits
+
+    Args:
+        event_type: 'booking.created', 'booking.claimed' or 'booking.status'
+        booking: Booking instance
+        cleaners: Cleaners to notify in addition to the assigned cleaner
+    """
+    channels = {'role:ADMIN', f'user:{booking.student_id}'}
+    channels.update(f'user:{cleaner.id}' for cleaner in cleaners)
+    if booking.assigned_cleaner_id:
+        channels.add(f'user:{booking.assigned_cleaner_id}')
+
+    event = {'type': event_type, 'booking': booking_payload(booking)}
+    transaction.on_commit(lambda: broker.publish(channels, event))
@@ -0,0 +1,244 @@
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dt_time, timedelta
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.models import User, CleanerProfile, Booking
+from api.utils.email_notifications import send_booking_accepted_email
+from api.views import accept_booking
+
+SEED_DOMAIN = 'claims.benchmark'
+
+
+class SlowEmailBackend(EmailBackend):
+    """In-memory email backend that waits `delay` seconds per send, like a remote SMTP server"""
+
+    delay = 0.0
+
+    def send_messages(self, messages):
+        time.sleep(self.delay)
+        return super().send_messages(messages)
+
+
+@api_view(['POST'])
+def legacy_accept_booking(request, pk):
+    """
+    Previous claim flow, kept here as the baseline for the benchmark: the
+    row is locked with select_for_update and the acceptance email is sent
+    before the transaction commits
+    """
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.select_for_update().get(pk=pk, status='WAITING_FOR_CLEANER')
+
+            if booking.assigned_cleaner is not None:
+                return Response({'error': 'Already accepted'}, status=status.HTTP_400_BAD_REQUEST)
+
+            booking.assigned_cleaner = request.user
+            booking.status = 'ASSIGNED'
+            booking.save()
+            send_booking_accepted_email(booking)
+            return Response({'id': booking.id})
+    except Booking.DoesNotExist:
+        return Response({'error': 'Booking not found or already accepted'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class LockWaitSampler(threading.Thread):
+    """Polls pg_locks for sessions waiting on a lock while the benchmark runs"""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.samples = 0
+        self.waiting_samples = 0
+        self.peak = 0
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.is_set():
+                    cursor.execute("SELECT count(*) FROM pg_locks WHERE NOT granted")
+                    waiting = cursor.fetchone()[0]
+                    self.samples += 1
+                    self.waiting_samples += 1 if waiting else 0
+                    self.peak = max(self.peak, waiting)
+                    time.sleep(self.interval)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class Command(BaseCommand):
+    help = 'Races cleaners for the same bookings and reports claim throughput, latency, lock waits and double claims'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=20, help='Waiting bookings to seed')
+        parser.add_argument('--cleaners', type=int, default=30, help='Cleaners racing for them')
+        parser.add_argument('--workers', type=int, default=None, help='Concurrent requests (default: one per cleaner)')
+        parser.add_argument(
+            '--strategy',
+            choices=('update', 'lock', 'both'),
+            default='both',
+            help='update: current conditional-UPDATE claim; lock: previous select_for_update flow'
+        )
+        parser.add_argument('--smtp-delay', type=float, default=0.2, help='Simulated seconds per acceptance email')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the order of claim attempts')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows instead of deleting them')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] in ('', ':memory:'):
+            raise CommandError('Run against a file-backed SQLite or a PostgreSQL database')
+
+        SlowEmailBackend.delay = options['smtp_delay']
+        strategies = ('update', 'lock') if options['strategy'] == 'both' else (options['strategy'],)
+
+        self.stdout.write(
+            f"{options['cleaners']} cleaners racing for {options['bookings']} bookings on {connection.vendor}, "
+            f"{options['smtp_delay'] * 1000:.0f} ms per email"
+        )
+
+        backend = f'{__name__}.SlowEmailBackend'
+        with override_settings(EMAIL_BACKEND=backend, EMAIL_USE_OUTBOX=False, EMAIL_RATE_LIMIT_PER_SECOND=0):
+            for strategy in strategies:
+                self.cleanup()
+                cleaners, bookings = self.seed(options['cleaners'], options['bookings'])
+                try:
+                    self.report(strategy, self.race(strategy, cleaners, bookings, options))
+                finally:
+                    if not options['keep']:
+                        self.cleanup()
+
+    def seed(self, cleaner_count, booking_count):
+        student = User.objects.create_user(email=f'student@{SEED_DOMAIN}', name='Benchmark Student', role='STUDENT')
+        cleaners = []
+        for i in range(cleaner_count):
+            cleaner = User.objects.create_user(email=f'cleaner{i}@{SEED_DOMAIN}', name=f'Cleaner {i}', role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=f'BENCH{i:04d}', phone='+60123456789')
+            cleaners.append(cleaner)
+
+        bookings = Booking.objects.bulk_create([
+            Booking(
+                student=student,
+                booking_type='STANDARD',
+                preferred_date=date.today() + timedelta(days=1),
+                preferred_time=dt_time(10, 0),
+                block='25E',
+                room_number=f'25E-04-{i:02d}',
+                status='WAITING_FOR_CLEANER'
+            )
+            for i in range(booking_count)
+        ])
+        if bookings[0].pk is None:
+            bookings = list(Booking.objects.filter(student=student).order_by('id'))
+
+        return cleaners, [booking.pk for booking in bookings]
+
+    def cleanup(self):
+        Booking.objects.filter(student__email__endswith=f'@{SEED_DOMAIN}').delete()
+        User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
+
+    def race(self, strategy, cleaners, booking_ids, options):
+        """
+        Every cleaner tries every booking, in a shuffled order so each
+        booking is contended from the start; the requests run on a thread
+        pool, each thread with its own database connection
+        """
+        view = accept_booking if strategy == 'update' else legacy_accept_booking
+        factory = APIRequestFactory()
+        rng = random.Random(options['seed'])
+
+        attempts = [(cleaner, booking_id) for cleaner in cleaners for booking_id in booking_ids]
+        rng.shuffle(attempts)
+
+        def attempt(item):
+            cleaner, booking_id = item
+            request = factory.post(f'/api/cleaner/bookings/{booking_id}/accept/')
+            force_authenticate(request, user=cleaner)
+
+            started = time.perf_counter()
+            try:
+                code = view(request, pk=booking_id).status_code
+            except Exception as e:
+                code = type(e).__name__
+            latency = time.perf_counter() - started
+
+            connections.close_all()
+            return booking_id, cleaner.id, code, latency
+
+        sampler = LockWaitSampler() if connection.vendor == 'postgresql' else None
+        if sampler:
+            sampler.start()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers'] or len(cleaners)) as executor:
+            results = list(executor.map(attempt, attempts))
+        elapsed = time.perf_counter() - started
+
+        if sampler:
+            sampler.stop()
+
+        return {
+            'results': results,
+            'elapsed': elapsed,
+            'sampler': sampler,
+            'booking_ids': booking_ids,
+        }
+
+    def report(self, strategy, run):
+        results = run['results']
+        latencies = sorted(latency for _, _, _, latency in results)
+        codes = Counter(code for _, _, code, _ in results)
+
+        winners = {}
+        for booking_id, cleaner_id, code, _ in results:
+            if code == 200:
+                winners.setdefault(booking_id, []).append(cleaner_id)
+
+        assigned = dict(
+            Booking.objects.filter(pk__in=run['booking_ids']).values_list('pk', 'assigned_cleaner_id')
+        )
+        double_claims = sum(1 for cleaners in winners.values() if len(cleaners) > 1)
+        mismatches = sum(
+            1 for booking_id, cleaners in winners.items()
+            if len(cleaners) == 1 and assigned.get(booking_id) != cleaners[0]
+        )
+        unclaimed = sum(1 for booking_id in run['booking_ids'] if booking_id not in winners)
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        label = 'conditional UPDATE' if strategy == 'update' else 'select_for_update (previous)'
+        self.stdout.write(f"\n{label}")
+        self.stdout.write(f"  requests      {len(results)} in {run['elapsed']:.2f}s ({len(results) / run['elapsed']:,.0f} req/s)")
+        self.stdout.write(f"  claims won    {len(winners)}/{len(run['booking_ids'])}, unclaimed {unclaimed}")
+        self.stdout.write(f"  latency       p50 {percentile(0.5):.1f} ms, p99 {percentile(0.99):.1f} ms, "
+                          f"mean {statistics.mean(latencies) * 1000:.1f} ms")
+        self.stdout.write(f"  responses     {', '.join(f'{code}: {count}' for code, count in sorted(codes.items(), key=str))}")
+
+        sampler = run['sampler']
+        if sampler:
+            self.stdout.write(
+                f"  lock waits    seen in {sampler.waiting_samples}/{sampler.samples} samples, "
+                f"peak {sampler.peak} waiting"
+            )
+        else:
+            errors = sum(count for code, count in codes.items() if code not in (200, 400, 404))
+            self.stdout.write(f"  lock waits    n/a on {connection.vendor} (failed requests: {errors})")
+
+        violations = double_claims + mismatches
+        style = self.style.SUCCESS if not violations else self.style.ERROR
+        self.stdout.write(style(f"  double claims {violations}"))
@@ -0,0 +1,83 @@
+import time
+from datetime import date, time as dt_time, timedelta
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from api.models import User, Booking
+from api.serializers import BookingSerializer, BookingRowSerializer
+
+SEED_DOMAIN = 'serialization.benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks booking list serialization (rows per second), BookingSerializer against BookingRowSerializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Bookings in the list')
+        parser.add_argument('--rounds', type=int, default=20, help='Lists serialized per implementation')
+        parser.add_argument('--fields', default='', help='Optional ?fields= selection, e.g. id,status,preferred_date')
+
+    def handle(self, *args, **options):
+        self.cleanup()
+        try:
+            self.seed(options['rows'])
+            self.run(options)
+        finally:
+            self.cleanup()
+
+    def run(self, options):
+        params = {'fields': options['fields']} if options['fields'] else {}
+        request = Request(APIRequestFactory().get('/api/bookings/', params))
+        context = {'request': request}
+        queryset = Booking.objects.filter(student__email__endswith=f'@{SEED_DOMAIN}')
+
+        # Both include the query, as the list endpoint does
+        implementations = (
+            ('BookingSerializer', lambda: BookingSerializer(
+                BookingSerializer.prepare_queryset(queryset, request), many=True, context=context
+            ).data),
+            ('BookingRowSerializer', lambda: BookingRowSerializer(
+                BookingRowSerializer.rows(queryset, request), context=context
+            ).data),
+        )
+
+        outputs = [JSONRenderer().render(serialize()) for _, serialize in implementations]
+        self.stdout.write(f"Serializing {options['rows']} bookings, {options['rounds']} rounds"
+                          + (f", fields={options['fields']}" if options['fields'] else ''))
+        self.stdout.write(f"JSON identical: {outputs[0] == outputs[1]} ({len(outputs[0]):,} bytes)")
+
+        results = {}
+        for label, serialize in implementations:
+            started = time.perf_counter()
+            for _ in range(options['rounds']):
+                serialize()
+            elapsed = time.perf_counter() - started
+            results[label] = options['rounds'] * options['rows'] / elapsed
+            self.stdout.write(f"  {label:<22}{results[label]:>12,.0f} rows/sec  ({elapsed:.3f}s)")
+
+        speedup = results['BookingRowSerializer'] / results['BookingSerializer']
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {speedup:.1f}x"))
+
+    def seed(self, count):
+        student = User.objects.create_user(email=f'student@{SEED_DOMAIN}', name='Benchmark Student', role='STUDENT')
+        cleaner = User.objects.create_user(email=f'cleaner@{SEED_DOMAIN}', name='Benchmark Cleaner', role='CLEANER')
+
+        Booking.objects.bulk_create([
+            Booking(
+                student=student,
+                assigned_cleaner=cleaner if i % 3 else None,
+                booking_type='DEEP' if i % 2 else 'STANDARD',
+                preferred_date=date.today() + timedelta(days=i % 30),
+                preferred_time=dt_time(8 + i % 12, 30 if i % 2 else 0),
+                block='25E',
+                room_number=f'25E-04-{i % 30:02d}',
+                special_instructions='Please clean the windows as well.' if i % 4 == 0 else None,
+                status='ASSIGNED' if i % 3 else 'WAITING_FOR_CLEANER'
+            )
+            for i in range(count)
+        ], batch_size=1000)
+
+    def cleanup(self):
+        Booking.objects.filter(student__email__endswith=f'@{SEED_DOMAIN}').delete()
+        User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
@@ -0,0 +1,233 @@
+import time
+from datetime import date, time as dt_time
+from django.core.management.base import BaseCommand
+from django.utils.html import strip_tags
+from api.models import User, Booking
+from api.utils.email_notifications import build_booking_created_messages
+
+
+def legacy_generate_email_html(title, greeting, content_blocks, footer_text=None):
+    """
+    Previous per-call f-string implementation of generate_email_html, kept
+    here as the baseline for the benchmark
+    
+    Args:
+        title (str): Email title
+        greeting (str): Greeting text (e.g., "Dear John")
+        content_blocks (list): List of content paragraphs/blocks
+        footer_text (str): Optional footer text
+        
+    Returns:
+        str: HTML email content
+    """
+    html = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{title}</title>
+        <style>
+            body {{
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                background-color: #f4f4f4;
+                margin: 0;
+                padding: 0;
+            }}
+            .container {{
+                max-width: 600px;
+                margin: 20px auto;
+                background-color: #ffffff;
+                border-radius: 8px;
+                overflow: hidden;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            }}
+            .header {{
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white;
+                padding: 30px;
+                text-align: center;
+            }}
+            .header h1 {{
+                margin: 0;
+                font-size: 24px;
+                font-weight: 600;
+            }}
+            .content {{
+                padding: 30px;
+            }}
+            .greeting {{
+                font-size: 18px;
+                font-weight: 500;
+                margin-bottom: 20px;
+                color: #667eea;
+            }}
+            .info-box {{
+                background-color: #f8f9fa;
+                border-left: 4px solid #667eea;
+                padding: 15px;
+                margin: 20px 0;
+                border-radius: 4px;
+            }}
+            .info-box strong {{
+                color: #667eea;
+            }}
+            .button {{
+                display: inline-block;
+                padding: 12px 30px;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white;
+                text-decoration: none;
+                border-radius: 5px;
+                margin: 20px 0;
+                font-weight: 500;
+            }}
+            .footer {{
+                background-color: #f8f9fa;
+                padding: 20px;
+                text-align: center;
+                font-size: 14px;
+                color: #6c757d;
+                border-top: 1px solid #e9ecef;
+            }}
+            .footer p {{
+                margin: 5px 0;
+            }}
+            ul {{
+                padding-left: 20px;
+            }}
+            ul li {{
+                margin: 8px 0;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🏢 AIU Hostel Cleaning Service</h1>
+            </div>
+            <div class="content">
+                <p class="greeting">{greeting}</p>
+    """
+    
+    # Add content blocks
+    for block in content_blocks:
+        html += f"                {block}\n"
+    
+    html += """
+            </div>
+            <div class="footer">
+                <p><strong>AIU Hostel Cleaning Service</strong></p>
+                <p>Albukhary International University</p>
+                <p>Jln Tun Razak, Bandar Alor Setar, 05200 Alor Setar, Kedah</p>
+    """
+    
+    if footer_text:
+        html += f"                <p style='margin-top: 15px;'>{footer_text}</p>\n"
+    
+    html += """
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return html
+
+
+def legacy_build_booking_created_messages(booking, cleaners):
+    """
+    Previous rendering path of send_booking_created_email: the full page is
+    rebuilt for every cleaner and the text part is made by stripping it
+    """
+    messages = []
+    subject = f"🔔 New Cleaning Request Available - {booking.get_booking_type_display()}"
+    
+    for cleaner in cleaners:
+        content_blocks = [
+            "<p>A new cleaning request is available for acceptance!</p>",
+            "<div class='info-box'>",
+            "<strong>📋 Booking Details:</strong><br>",
+            f"🏷️ Type: <strong>{booking.get_booking_type_display()}</strong><br>",
+            f"📍 Location: <strong>{booking.block} - {booking.room_number}</strong><br>",
+            f"📅 Date: <strong>{booking.preferred_date.strftime('%B %d, %Y')}</strong><br>",
+            f"🕐 Time: <strong>{booking.preferred_time.strftime('%I:%M %p')}</strong><br>",
+            f"💰 Payment: <strong>RM{booking.price}</strong><br>",
+            f"⚡ Urgency: <strong>{booking.get_urgency_level_display()}</strong>",
+            "</div>",
+        ]
+        
+        if booking.special_instructions:
+            content_blocks.append(
+                f"<p><strong>Special Instructions:</strong><br>{booking.special_instructions}</p>"
+            )
+        
+        content_blocks.extend([
+            "<p style='color: #e74c3c; font-weight: 500;'>⏰ First come, first serve! Log in now to accept this booking.</p>",
+            "<p>This booking will be assigned to the first cleaner who accepts it.</p>",
+        ])
+        
+        html_content = legacy_generate_email_html(
+            title=subject,
+            greeting=f"Dear {cleaner.name},",
+            content_blocks=content_blocks,
+            footer_text="Log in to the AIU Hostel Cleaning app to accept this booking."
+        )
+        
+        messages.append({
+            'to_email': cleaner.email,
+            'subject': subject,
+            'html_content': html_content,
+            'text_content': strip_tags(html_content),
+        })
+    
+    return messages
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks new-booking email rendering (renders per second) before and after the precompiled layout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cleaners', type=int, default=100, help='Number of cleaners in the fan-out')
+        parser.add_argument('--rounds', type=int, default=50, help='Fan-outs rendered per implementation')
+
+    def handle(self, *args, **options):
+        # Unsaved objects: rendering needs no database access
+        student = User(email='student@example.com', name='Benchmark Student', role='STUDENT')
+        booking = Booking(
+            id=1,
+            student=student,
+            booking_type='DEEP',
+            preferred_date=date.today(),
+            preferred_time=dt_time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            special_instructions='Please clean the windows as well.',
+            status='WAITING_FOR_CLEANER'
+        )
+        cleaners = [
+            User(email=f'cleaner{i}@example.com', name=f'Cleaner {i}', role='CLEANER')
+            for i in range(options['cleaners'])
+        ]
+
+        # The precompiled layout must produce exactly the same HTML
+        before = legacy_build_booking_created_messages(booking, cleaners)
+        after = build_booking_created_messages(booking, cleaners)
+        identical = all(old['html_content'] == new['html_content'] for old, new in zip(before, after))
+
+        self.stdout.write(f"Rendering new-booking emails for {options['cleaners']} cleaners, {options['rounds']} rounds")
+        self.stdout.write(f"HTML identical to previous implementation: {identical}")
+
+        results = {}
+        for label, build in (('before', legacy_build_booking_created_messages), ('after', build_booking_created_messages)):
+            started = time.perf_counter()
+            for _ in range(options['rounds']):
+                build(booking, cleaners)
+            elapsed = time.perf_counter() - started
+
+            results[label] = options['rounds'] * options['cleaners'] / elapsed
+            self.stdout.write(f"  {label:<7}{results[label]:>12,.0f} renders/sec  ({elapsed:.3f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {results['after'] / results['before']:.1f}x"))
@@ -0,0 +1,156 @@
+import random
+import re
+from datetime import date, time as dt_time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from api.models import User, CleanerProfile, CleanerBlock, Booking
+
+SEED_DOMAIN = 'explain.benchmark'
+
+BLOCKS = ['25E', '25F', '26E', '26F', '27E', '27F', '28E', '28F']
+
+# Share of seeded bookings per status; most of a live table is history
+STATUS_WEIGHTS = {
+    'WAITING_FOR_CLEANER': 2,
+    'ASSIGNED': 4,
+    'IN_PROGRESS': 1,
+    'COMPLETED': 85,
+    'CANCELLED': 8,
+}
+
+# Plan lines that read the whole bookings table instead of an index
+SEQUENTIAL_SCANS = {
+    'postgresql': re.compile(r'Seq Scan on bookings\b'),
+    'sqlite': re.compile(r'\bSCAN bookings\b(?! USING (COVERING )?INDEX)'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Seeds bookings, runs EXPLAIN on the hot booking queries and flags sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=20000, help='Bookings to seed')
+        parser.add_argument('--students', type=int, default=500, help='Students owning them')
+        parser.add_argument('--cleaners', type=int, default=24, help='Cleaners they are spread across')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the generated data')
+        parser.add_argument('--plans', action='store_true', help='Print the full plan of every query')
+        parser.add_argument('--check', action='store_true', help='Exit with an error if any query scans the table')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows instead of deleting them')
+
+    def handle(self, *args, **options):
+        pattern = SEQUENTIAL_SCANS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'No plan check for {connection.vendor}')
+
+        self.cleanup()
+        try:
+            student, cleaner = self.seed(options)
+            self.analyze()
+
+            self.stdout.write(f"EXPLAIN on {connection.vendor}, {Booking.objects.count():,} bookings\n")
+            flagged = []
+            for name, queryset in self.hot_queries(student, cleaner):
+                plan = queryset.explain()
+                scans = [line.strip() for line in plan.splitlines() if pattern.search(line)]
+                if scans:
+                    flagged.append(name)
+                    self.stdout.write(self.style.ERROR(f"  SEQ SCAN  {name}: {scans[0]}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"  index     {name}: {self.index_used(plan)}"))
+                if options['plans'] or scans:
+                    for line in plan.splitlines():
+                        self.stdout.write(f"              {line}")
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+        if flagged and options['check']:
+            raise CommandError(f"Sequential scans in: {', '.join(flagged)}")
+        if not flagged:
+            self.stdout.write(self.style.SUCCESS('\nNo sequential scans on bookings'))
+
+    def hot_queries(self, student, cleaner):
+        """The booking queries behind the busiest endpoints, built as the views build them"""
+        today = timezone.now().date()
+        return [
+            ('cleaner new requests', Booking.objects.filter(
+                status='WAITING_FOR_CLEANER'
+            ).filter(
+                CleanerBlock.visibility_q(cleaner)
+            ).order_by('preferred_date', 'preferred_time')),
+            ('cleaner today tasks', Booking.objects.filter(
+                assigned_cleaner=cleaner,
+                preferred_date=today,
+                status__in=['ASSIGNED', 'IN_PROGRESS']
+            ).order_by('preferred_time')),
+            ('cleaner active task count', Booking.objects.filter(
+                assigned_cleaner=cleaner,
+                status__in=['ASSIGNED', 'IN_PROGRESS']
+            ).order_by().values('id')),
+            ('cleaner history', Booking.objects.filter(
+                assigned_cleaner=cleaner,
+                status='COMPLETED'
+            ).order_by('-updated_at')),
+            ('student bookings', Booking.objects.filter(
+                student=student
+            ).order_by('-created_at', '-id')),
+            ('admin payment receipts', Booking.objects.filter(
+                status='COMPLETED',
+                payment_status='PAID'
+            ).order_by('-updated_at')),
+        ]
+
+    def index_used(self, plan):
+        names = re.findall(r'\b(?:USING (?:COVERING )?INDEX|Index (?:Only )?Scan(?: Backward)? using) (\w+)', plan)
+        return ', '.join(dict.fromkeys(names)) or 'no table scan'
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+
+        students = [
+            User.objects.create_user(email=f'student{i}@{SEED_DOMAIN}', name=f'Student {i}', role='STUDENT')
+            for i in range(options['students'])
+        ]
+        cleaners = []
+        for i in range(options['cleaners']):
+            cleaner = User.objects.create_user(email=f'cleaner{i}@{SEED_DOMAIN}', name=f'Cleaner {i}', role='CLEANER')
+            CleanerProfile.objects.create(
+                user=cleaner,
+                staff_id=f'EXPLAIN{i:04d}',
+                phone='+60123456789',
+                assigned_blocks=BLOCKS[i % len(BLOCKS)]
+            )
+            cleaners.append(cleaner)
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        today = date.today()
+
+        bookings = []
+        for i in range(options['bookings']):
+            status = rng.choices(statuses, weights)[0]
+            days = rng.randint(1, 14) if status == 'WAITING_FOR_CLEANER' else rng.randint(-365, 14)
+            bookings.append(Booking(
+                student=rng.choice(students),
+                assigned_cleaner=None if status == 'WAITING_FOR_CLEANER' else rng.choice(cleaners),
+                booking_type=rng.choice(['STANDARD', 'DEEP']),
+                preferred_date=today + timedelta(days=days),
+                preferred_time=dt_time(rng.randint(8, 17), rng.choice([0, 30])),
+                block=rng.choice(BLOCKS),
+                room_number=f'{rng.choice(BLOCKS)}-{rng.randint(1, 12):02d}-{rng.randint(1, 30):02d}',
+                status=status,
+                payment_status='PAID' if status == 'COMPLETED' and rng.random() < 0.9 else 'PENDING'
+            ))
+        Booking.objects.bulk_create(bookings, batch_size=1000)
+
+        return students[0], cleaners[0]
+
+    def analyze(self):
+        """Refresh planner statistics so the plans reflect the seeded data"""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE bookings')
+
+    def cleanup(self):
+        Booking.objects.filter(student__email__endswith=f'@{SEED_DOMAIN}').delete()
+        User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
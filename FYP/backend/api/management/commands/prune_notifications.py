@@ -0,0 +1,101 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from api.models import Notification
+
+
+class Command(BaseCommand):
+    help = 'Deletes old notifications according to the retention policies, in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--read-days',
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_DAYS,
+            help='Delete read notifications older than this many days'
+        )
+        parser.add_argument(
+            '--collapse-days',
+            type=int,
+            default=settings.NOTIFICATION_STATUS_COLLAPSE_DAYS,
+            help='Keep only the latest status update per booking once older than this many days'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.NOTIFICATION_PRUNE_BATCH_SIZE,
+            help='Rows deleted per transaction'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between batches to leave room for live traffic'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count what would be removed without deleting anything'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        now = timezone.now()
+
+        policies = [
+            (
+                f"Read notifications older than {options['read_days']} days",
+                Notification.objects.read_before(now - timedelta(days=options['read_days']))
+            ),
+            (
+                f"Superseded status updates older than {options['collapse_days']} days",
+                Notification.objects.superseded_status_updates(now - timedelta(days=options['collapse_days']))
+            ),
+            (
+                "Broadcasts for bookings no longer open",
+                Notification.objects.stale_broadcasts()
+            ),
+        ]
+
+        total = 0
+        for label, queryset in policies:
+            if options['dry_run']:
+                removed = queryset.count()
+            else:
+                removed = self.prune(queryset, options['batch_size'], options['pause'])
+
+            total += removed
+            self.stdout.write(f"{label}: {removed}")
+
+        verb = 'Would remove' if options['dry_run'] else 'Removed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {total} notifications in {time.monotonic() - started:.2f}s"
+        ))
+
+    def prune(self, queryset, batch_size, pause):
+        """
+        Delete matching rows in id order, one short transaction per batch,
+        so the table is never locked for long
+        """
+        removed = 0
+        last_id = 0
+
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return removed
+
+            # Goes through the ORM so receipts cascade and unread counters stay in step
+            with transaction.atomic():
+                Notification.objects.filter(id__in=ids).delete()
+
+            removed += len(ids)
+            last_id = ids[-1]
+
+            if pause:
+                time.sleep(pause)
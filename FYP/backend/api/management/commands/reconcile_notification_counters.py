@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from api.models import NotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Recounts unread notifications and repairs users whose maintained counter has drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only reconcile the user with this email address'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without fixing it'
+        )
+
+    def handle(self, *args, **options):
+        counters = NotificationCounter.objects.select_related('user').order_by('user_id')
+        if options['user']:
+            counters = counters.filter(user__email=options['user'])
+
+        checked = 0
+        drifted = 0
+        for counter in counters.iterator():
+            checked += 1
+            actual = NotificationCounter.count_unread(counter.user)
+
+            if counter.unread == actual:
+                continue
+
+            drifted += 1
+            self.stdout.write(f"{counter.user.email}: counter {counter.unread}, actual {actual}")
+
+            if not options['dry_run']:
+                NotificationCounter.objects.filter(pk=counter.pk).update(unread=actual)
+
+        verb = 'found' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} counters, {verb} {drifted} with drift"))
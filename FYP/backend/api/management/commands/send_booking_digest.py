@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import User, Booking, BookingDigestRun, NotificationPreference
+from api.utils.email_notifications import send_booking_digest_email
+
+
+class Command(BaseCommand):
+    help = 'Emails each active cleaner one summary of open requests when new bookings arrived in the digest window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=settings.BOOKING_EMAIL_DIGEST_MINUTES or 5,
+            help='Digest window in minutes (default: BOOKING_EMAIL_DIGEST_MINUTES)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sending a digest at the end of every window'
+        )
+
+    def handle(self, *args, **options):
+        window = timedelta(minutes=options['window'])
+
+        try:
+            while True:
+                self.send_digest(window)
+
+                if not options['loop']:
+                    break
+
+                time.sleep(window.total_seconds())
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted, stopping digest sender'))
+
+    def send_digest(self, window):
+        now = timezone.now()
+        last_run = BookingDigestRun.objects.order_by('-window_end').first()
+        window_start = last_run.window_end if last_run else now - window
+
+        open_bookings = list(
+            Booking.objects.filter(status='WAITING_FOR_CLEANER').order_by('preferred_date', 'preferred_time')
+        )
+        new_booking_ids = {
+            booking.id for booking in open_bookings
+            if window_start < booking.created_at <= now
+        }
+
+        if not new_booking_ids:
+            self.stdout.write(f"No new bookings since {timezone.localtime(window_start):%Y-%m-%d %H:%M}, no digest sent")
+            return
+
+        # Each cleaner only hears about their own blocks, plus blocks nobody covers
+        cleaners = list(
+            User.objects.filter(role='CLEANER', is_active=True).prefetch_related('cleaner_profile__blocks')
+        )
+        cleaner_blocks = {
+            cleaner.id: frozenset(
+                block.block for block in cleaner.cleaner_profile.blocks.all()
+            ) if hasattr(cleaner, 'cleaner_profile') else frozenset()
+            for cleaner in cleaners
+        }
+        covered_blocks = frozenset().union(*cleaner_blocks.values())
+        preferences = NotificationPreference.for_users(cleaners)
+
+        groups = {}
+        for cleaner in cleaners:
+            groups.setdefault(cleaner_blocks[cleaner.id], []).append(cleaner)
+
+        successful = 0
+        for blocks, group in groups.items():
+            visible = [
+                booking for booking in open_bookings
+                if booking.block in blocks or booking.block not in covered_blocks
+            ]
+            visible_new = [booking.id for booking in visible if booking.id in new_booking_ids]
+
+            if not visible_new:
+                continue
+
+            results = send_booking_digest_email(visible, group, visible_new, preferences=preferences)
+            successful += sum(1 for result in results if result.get('success'))
+
+        BookingDigestRun.objects.create(
+            window_start=window_start,
+            window_end=now,
+            new_bookings=len(new_booking_ids),
+            open_bookings=len(open_bookings),
+            recipients=successful
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Digest sent to {successful} cleaners: "
+            f"{len(new_booking_ids)} new, {len(open_bookings)} open requests"
+        ))
@@ -0,0 +1,63 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.utils.email_outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued emails from the outbox with retries and dead-lettering'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50),
+            help='Maximum number of emails claimed per batch'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5),
+            help='Attempts before an email is moved to the dead-letter state'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting once it is drained'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls when the outbox is empty (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retried': 0, 'dead': 0}
+
+        try:
+            while True:
+                summary = process_outbox(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts']
+                )
+
+                for key in totals:
+                    totals[key] += summary[key]
+
+                if any(summary.values()):
+                    self.stdout.write(
+                        f"Batch: {summary['sent']} sent, {summary['retried']} retried, {summary['dead']} dead-lettered"
+                    )
+                    continue
+
+                if not options['loop']:
+                    break
+
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted, stopping outbox worker'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox drained: {totals['sent']} sent, {totals['retried']} retried, {totals['dead']} dead-lettered"
+        ))
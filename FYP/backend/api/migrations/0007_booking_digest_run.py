@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_email_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingDigestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField()),
+                ('new_bookings', models.PositiveIntegerField(default=0)),
+                ('open_bookings', models.PositiveIntegerField(default=0)),
+                ('recipients', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Booking Digest Run',
+                'verbose_name_plural': 'Booking Digest Runs',
+                'db_table': 'booking_digest_runs',
+                'ordering': ['-window_end'],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_cleaner_blocks(apps, schema_editor):
+    """Split existing comma-separated assigned_blocks strings into rows"""
+    CleanerProfile = apps.get_model('api', 'CleanerProfile')
+    CleanerBlock = apps.get_model('api', 'CleanerBlock')
+    
+    rows = []
+    for profile in CleanerProfile.objects.exclude(assigned_blocks='').only('id', 'assigned_blocks'):
+        seen = set()
+        for block in profile.assigned_blocks.split(','):
+            block = block.strip().upper()
+            if block and block not in seen:
+                seen.add(block)
+                rows.append(CleanerBlock(cleaner_id=profile.id, block=block))
+    
+    CleanerBlock.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_booking_digest_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CleanerBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('block', models.CharField(db_index=True, max_length=10)),
+                ('cleaner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='api.cleanerprofile')),
+            ],
+            options={
+                'verbose_name': 'Cleaner Block',
+                'verbose_name_plural': 'Cleaner Blocks',
+                'db_table': 'cleaner_blocks',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cleanerblock',
+            constraint=models.UniqueConstraint(fields=('cleaner', 'block'), name='unique_cleaner_block'),
+        ),
+        migrations.RunPython(backfill_cleaner_blocks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_cleaner_blocks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=False)),
+                ('is_dismissed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Notification Receipt',
+                'verbose_name_plural': 'Notification Receipts',
+                'db_table': 'notification_receipts',
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='audience_block',
+            field=models.CharField(blank=True, help_text='Broadcast audience block; empty for every block', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='audience_role',
+            field=models.CharField(blank=True, choices=[('ADMIN', 'Admin'), ('CLEANER', 'Cleaner'), ('STUDENT', 'Student')], help_text='Broadcast audience role', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Recipient; empty for broadcast notifications', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('user__isnull', True)), fields=['audience_role', 'audience_block'], name='notification_broadcast_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationreceipt',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='api.notification'),
+        ),
+        migrations.AddField(
+            model_name='notificationreceipt',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_receipts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationreceipt',
+            constraint=models.UniqueConstraint(fields=('notification', 'user'), name='unique_notification_receipt'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_notification_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('NEW_BOOKING', 'New Booking Available'), ('BOOKING_ACCEPTED', 'Booking Accepted'), ('BOOKING_COMPLETED', 'Booking Completed'), ('BOOKING_STATUS', 'Booking Status Updated'), ('GENERAL', 'General')], default='GENERAL', max_length=20),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_notification_status_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='params',
+            field=models.JSONField(blank=True, default=dict, help_text='Template parameters'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='template_key',
+            field=models.CharField(blank=True, help_text='Key in NOTIFICATION_TEMPLATES', max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='message',
+            field=models.TextField(blank=True, help_text='Rendered message; empty for templated notifications'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='title',
+            field=models.CharField(blank=True, help_text='Rendered title; empty for templated notifications', max_length=255),
+        ),
+    ]
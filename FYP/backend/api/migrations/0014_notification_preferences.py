@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_notification_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationPreference',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_preference', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('muted_email_events', models.JSONField(blank=True, default=list, help_text='Email events this user does not want')),
+                ('quiet_hours_start', models.TimeField(blank=True, help_text='Local time emails start being held', null=True)),
+                ('quiet_hours_end', models.TimeField(blank=True, help_text='Local time held emails are sent as one summary', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Notification Preference',
+                'verbose_name_plural': 'Notification Preferences',
+                'db_table': 'notification_preferences',
+            },
+        ),
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('SENT', 'Sent'), ('DEAD', 'Dead Letter'), ('HELD', 'Held for Quiet Hours'), ('MERGED', 'Merged into Summary')], default='PENDING', max_length=10),
+        ),
+    ]
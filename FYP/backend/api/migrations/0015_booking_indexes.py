@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_notification_preferences'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'WAITING_FOR_CLEANER')), fields=['preferred_date', 'preferred_time'], name='booking_waiting_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['assigned_cleaner', 'status', 'preferred_date'], name='booking_cleaner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['student', '-created_at', '-id'], name='booking_student_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('payment_status', 'PAID'), ('status', 'COMPLETED')), fields=['-updated_at'], name='booking_paid_idx'),
+        ),
+    ]
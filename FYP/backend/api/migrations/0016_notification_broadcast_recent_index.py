@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_booking_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('user__isnull', True)), fields=['audience_role', '-created_at', '-id'], name='notification_bcast_recent_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models import Q, Exists, OuterRef, Subquery, Case, When, F
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.core.validators import RegexValidator
 from django.utils import timezone
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
+from .utils.notification_templates import render_notification
 
 
 class UserManager(BaseUserManager):
@@ -15,6 +17,16 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def cleaners_for_block(self, block):
+        """
+        Active cleaners covering the given hostel block.
+        Falls back to every active cleaner when nobody covers the block.
+        """
+        active_cleaners = self.filter(role='CLEANER', is_active=True)
+        covering = list(active_cleaners.filter(cleaner_profile__blocks__block=block).distinct())
+        
+        return covering if covering else list(active_cleaners)
+
     def create_superuser(self, email, name, password=None, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
@@ -120,6 +132,65 @@ class CleanerProfile(models.Model):
     
     def __str__(self):
         return f"{self.user.name} - {self.staff_id}"
+    
+    @staticmethod
+    def parse_blocks(value):
+        """Split a comma-separated block list into unique, uppercased codes"""
+        blocks = []
+        for block in (value or '').split(','):
+            block = block.strip().upper()
+            if block and block not in blocks:
+                blocks.append(block)
+        return blocks
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.sync_blocks()
+    
+    def sync_blocks(self):
+        """Keep the indexed CleanerBlock rows in step with assigned_blocks"""
+        blocks = self.parse_blocks(self.assigned_blocks)
+        
+        self.blocks.exclude(block__in=blocks).delete()
+        existing = set(self.blocks.values_list('block', flat=True))
+        CleanerBlock.objects.bulk_create([
+            CleanerBlock(cleaner=self, block=block)
+            for block in blocks if block not in existing
+        ])
+
+
+class CleanerBlock(models.Model):
+    """
+    Normalized, indexed form of CleanerProfile.assigned_blocks.
+    One row per block a cleaner covers, used to target booking fan-out.
+    """
+    cleaner = models.ForeignKey(CleanerProfile, on_delete=models.CASCADE, related_name='blocks')
+    block = models.CharField(max_length=10, db_index=True)
+    
+    class Meta:
+        db_table = 'cleaner_blocks'
+        verbose_name = 'Cleaner Block'
+        verbose_name_plural = 'Cleaner Blocks'
+        constraints = [
+            models.UniqueConstraint(fields=['cleaner', 'block'], name='unique_cleaner_block'),
+        ]
+    
+    def __str__(self):
+        return f"{self.cleaner.staff_id} - {self.block}"
+    
+    @classmethod
+    def visibility_q(cls, user, field='block'):
+        """
+        Filter for rows whose `field` is a block the cleaner covers,
+        or a block no active cleaner covers
+        """
+        my_blocks = cls.objects.filter(cleaner__user=user).values('block')
+        covered_blocks = cls.objects.filter(
+            cleaner__user__role='CLEANER',
+            cleaner__user__is_active=True
+        ).values('block')
+        
+        return Q(**{f'{field}__in': my_blocks}) | ~Q(**{f'{field}__in': covered_blocks})
 
 
 class Booking(models.Model):
@@ -186,13 +257,36 @@ class Booking(models.Model):
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
         ordering = ['-created_at']
+        # Hot queries; check their plans with `manage.py explain_booking_queries`
+        indexes = [
+            # Cleaners' new request list
+            models.Index(
+                fields=['preferred_date', 'preferred_time'],
+                condition=Q(status='WAITING_FOR_CLEANER'),
+                name='booking_waiting_idx'
+            ),
+            # Today's tasks, task history and availability counts
+            models.Index(fields=['assigned_cleaner', 'status', 'preferred_date'], name='booking_cleaner_status_idx'),
+            # Student lists, keyset-paginated on (created_at, id)
+            models.Index(fields=['student', '-created_at', '-id'], name='booking_student_recent_idx'),
+            # Admin payment receipts
+            models.Index(
+                fields=['-updated_at'],
+                condition=Q(status='COMPLETED', payment_status='PAID'),
+                name='booking_paid_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Booking #{self.id} - {self.student.name} - {self.booking_type}"
     
+    @staticmethod
+    def price_for(booking_type):
+        return 30 if booking_type == 'DEEP' else 20
+    
     @property
     def price(self):
-        return 30 if self.booking_type == 'DEEP' else 20
+        return self.price_for(self.booking_type)
 
 
 class Issue(models.Model):
@@ -230,30 +324,255 @@ class Issue(models.Model):
         return f"Issue #{self.id} - {self.issue_type} - {self.status}"
 
 
+class NotificationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """
+        Personal notifications plus the broadcasts addressed to the user,
+        minus broadcasts they dismissed. `read_state` holds the effective
+        read flag: the row's own for personal notifications, the user's
+        receipt for broadcasts.
+        """
+        receipts = NotificationReceipt.objects.filter(notification=OuterRef('pk'), user=user)
+        
+        return self.filter(
+            Q(user=user) | self.broadcast_q(user)
+        ).exclude(
+            Exists(receipts.filter(is_dismissed=True))
+        ).annotate(
+            read_state=Case(
+                When(user__isnull=True, then=Exists(receipts.filter(is_read=True))),
+                default=F('is_read'),
+                output_field=models.BooleanField()
+            )
+        )
+    
+    def personal_for(self, user):
+        """
+        The user's own notifications, annotated with `read_state` like
+        for_user(); filtering on user alone lets the (user, created_at, id)
+        indexes drive ORDER BY ... LIMIT
+        """
+        return self.filter(user=user).annotate(read_state=F('is_read'))
+    
+    def broadcasts_for(self, user):
+        """
+        Broadcasts addressed to the user and not dismissed, with
+        `read_state` taken from their receipt
+        """
+        receipts = NotificationReceipt.objects.filter(notification=OuterRef('pk'), user=user)
+        
+        return self.filter(self.broadcast_q(user)).exclude(
+            Exists(receipts.filter(is_dismissed=True))
+        ).annotate(
+            read_state=Exists(receipts.filter(is_read=True))
+        )
+    
+    @staticmethod
+    def broadcast_q(user):
+        broadcast = Q(user__isnull=True, audience_role=user.role)
+        if user.role == 'CLEANER':
+            broadcast &= Q(audience_block='') | CleanerBlock.visibility_q(user, field='audience_block')
+        return broadcast
+    
+    # Retention policies, used by `prune_notifications`
+    
+    def read_before(self, cutoff):
+        """
+        Personal notifications already read and created before cutoff
+        """
+        return self.filter(user__isnull=False, is_read=True, created_at__lt=cutoff)
+    
+    def superseded_status_updates(self, cutoff):
+        """
+        Booking status updates created before cutoff that have a newer
+        status update for the same user and booking
+        """
+        newest = self.model.objects.filter(
+            user=OuterRef('user'),
+            booking=OuterRef('booking'),
+            notification_type='BOOKING_STATUS'
+        ).order_by('-created_at', '-id').values('id')[:1]
+        
+        return self.filter(
+            notification_type='BOOKING_STATUS',
+            booking__isnull=False,
+            created_at__lt=cutoff
+        ).exclude(id=Subquery(newest))
+    
+    def stale_broadcasts(self):
+        """
+        New booking broadcasts whose booking can no longer be claimed
+        (claims and admin assignment delete theirs; cancellations do not)
+        """
+        return self.filter(user__isnull=True, notification_type='NEW_BOOKING').exclude(
+            booking__status='WAITING_FOR_CLEANER'
+        )
+
+
 class Notification(models.Model):
+    """
+    In-app notification.
+    New notifications store a template key and parameters instead of
+    rendered text (see api/utils/notification_templates.py).
+    Personal notifications belong to one user; broadcasts (user is NULL) are a
+    single row per event addressed to a role and optionally a hostel block,
+    with per-user read/dismiss state kept in NotificationReceipt.
+    """
     NOTIFICATION_TYPE_CHOICES = (
         ('NEW_BOOKING', 'New Booking Available'),
         ('BOOKING_ACCEPTED', 'Booking Accepted'),
         ('BOOKING_COMPLETED', 'Booking Completed'),
+        ('BOOKING_STATUS', 'Booking Status Updated'),
         ('GENERAL', 'General'),
     )
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
-    title = models.CharField(max_length=255)
-    message = models.TextField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications', help_text='Recipient; empty for broadcast notifications')
+    audience_role = models.CharField(max_length=10, choices=User.ROLE_CHOICES, blank=True, help_text='Broadcast audience role')
+    audience_block = models.CharField(max_length=10, blank=True, help_text='Broadcast audience block; empty for every block')
+    title = models.CharField(max_length=255, blank=True, help_text='Rendered title; empty for templated notifications')
+    message = models.TextField(blank=True, help_text='Rendered message; empty for templated notifications')
+    template_key = models.CharField(max_length=40, blank=True, help_text='Key in NOTIFICATION_TEMPLATES')
+    params = models.JSONField(default=dict, blank=True, help_text='Template parameters')
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPE_CHOICES, default='GENERAL')
     booking = models.ForeignKey('Booking', on_delete=models.CASCADE, null=True, blank=True, related_name='notifications')
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = NotificationQuerySet.as_manager()
+    
     class Meta:
         db_table = 'notifications'
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['audience_role', 'audience_block'],
+                condition=Q(user__isnull=True),
+                name='notification_broadcast_idx'
+            ),
+            # Broadcast half of the list, seeked separately from personal rows
+            models.Index(
+                fields=['audience_role', '-created_at', '-id'],
+                condition=Q(user__isnull=True),
+                name='notification_bcast_recent_idx'
+            ),
+            # Keyset pagination on (created_at, id), overall and unread only
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_recent_idx'),
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                condition=Q(is_read=False),
+                name='notification_user_unread_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        title = self.render()[0]
+        if self.is_broadcast:
+            return f"Broadcast to {self.audience_role} {self.audience_block or 'ALL'} - {title}"
+        return f"Notification for {self.user.name} - {title}"
+    
+    def render(self):
+        """
+        (title, message) for display: rendered from the template when the
+        notification has one, otherwise the stored text
+        """
+        if self.template_key:
+            rendered = render_notification(self.template_key, self.params)
+            if rendered:
+                return rendered
+        return self.title, self.message
+    
+    @property
+    def is_broadcast(self):
+        return self.user_id is None
+    
+    def audience(self):
+        """
+        Users a broadcast is addressed to, mirroring NotificationQuerySet.for_user
+        """
+        users = User.objects.filter(role=self.audience_role, is_active=True)
+        
+        if self.audience_role == 'CLEANER' and self.audience_block:
+            covering = users.filter(cleaner_profile__blocks__block=self.audience_block)
+            if covering.exists():
+                users = covering
+        
+        return users
+
+
+class NotificationReceipt(models.Model):
+    """
+    Per-user read/dismiss state for a broadcast notification.
+    Rows only exist for users who have acted on the broadcast.
+    """
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='receipts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_receipts')
+    is_read = models.BooleanField(default=False)
+    is_dismissed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'notification_receipts'
+        verbose_name = 'Notification Receipt'
+        verbose_name_plural = 'Notification Receipts'
+        constraints = [
+            models.UniqueConstraint(fields=['notification', 'user'], name='unique_notification_receipt'),
+        ]
     
     def __str__(self):
-        return f"Notification for {self.user.name} - {self.title}"
+        return f"Receipt for {self.user_id} on notification {self.notification_id}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Per-user unread notification count, kept in step with notification
+    writes so the unread badge is a single-row lookup.
+    The row is created from a full count the first time it is read;
+    `reconcile_notification_counters` repairs any drift.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter')
+    unread = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'notification_counters'
+        verbose_name = 'Notification Counter'
+        verbose_name_plural = 'Notification Counters'
+    
+    def __str__(self):
+        return f"{self.unread} unread for {self.user_id}"
+    
+    @classmethod
+    def adjust(cls, users, delta):
+        """
+        Atomically add delta to the counters of the given users
+        
+        Args:
+            users: User ids, or a User queryset
+            delta: Amount to add (negative to subtract)
+        """
+        if delta:
+            cls.objects.filter(user__in=users).update(unread=F('unread') + delta)
+    
+    @classmethod
+    def count_unread(cls, user):
+        """
+        Count unread notifications from scratch
+        """
+        return Notification.objects.for_user(user).filter(read_state=False).count()
+    
+    @classmethod
+    def unread_for(cls, user):
+        """
+        Current unread count for a user, initialising the counter on first use
+        """
+        unread = cls.objects.filter(user=user).values_list('unread', flat=True).first()
+        
+        if unread is None:
+            unread = cls.objects.get_or_create(user=user, defaults={'unread': cls.count_unread(user)})[0].unread
+        
+        return max(unread, 0)
 
 
 class PasswordResetCode(models.Model):
@@ -283,3 +602,134 @@ class PasswordResetCode(models.Model):
     def is_valid(self):
         """Check if the code is valid (not used and not expired)"""
         return not self.is_used and not self.is_expired()
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email queued inside the request transaction.
+    Delivered in batches by the `send_queued_emails` management command.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('DEAD', 'Dead Letter'),
+        ('HELD', 'Held for Quiet Hours'),
+        ('MERGED', 'Merged into Summary'),
+    )
+    
+    to_email = models.EmailField(max_length=255)
+    subject = models.CharField(max_length=255)
+    text_body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text='Earliest time the worker may (re)try delivery')
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'email_outbox'
+        verbose_name = 'Email Outbox Entry'
+        verbose_name_plural = 'Email Outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Email to {self.to_email} - {self.subject} ({self.status})"
+
+
+class NotificationPreference(models.Model):
+    """
+    Per-user email preferences.
+    Users without a row receive every email at any time.
+    """
+    EMAIL_EVENT_CHOICES = (
+        ('NEW_BOOKING', 'New Cleaning Requests'),
+        ('BOOKING_ASSIGNED', 'Cleaner Assignments'),
+        ('BOOKING_ACCEPTED', 'Booking Accepted'),
+        ('BOOKING_STATUS', 'Booking Progress'),
+        ('PAYMENT', 'Payments'),
+    )
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_preference')
+    muted_email_events = models.JSONField(default=list, blank=True, help_text='Email events this user does not want')
+    quiet_hours_start = models.TimeField(null=True, blank=True, help_text='Local time emails start being held')
+    quiet_hours_end = models.TimeField(null=True, blank=True, help_text='Local time held emails are sent as one summary')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'notification_preferences'
+        verbose_name = 'Notification Preference'
+        verbose_name_plural = 'Notification Preferences'
+    
+    def __str__(self):
+        return f"Notification preferences for {self.user_id}"
+    
+    @classmethod
+    def for_users(cls, users):
+        """
+        Load preferences for a whole fan-out in one query
+        
+        Returns:
+            dict: user id -> NotificationPreference (unsaved defaults for users without a row)
+        """
+        user_ids = [user.id for user in users]
+        preferences = {preference.user_id: preference for preference in cls.objects.filter(user_id__in=user_ids)}
+        return {user_id: preferences.get(user_id) or cls(user_id=user_id) for user_id in user_ids}
+    
+    def wants_email(self, event):
+        return event not in self.muted_email_events
+    
+    def quiet_until(self, now=None):
+        """
+        End of the current quiet hours window
+        
+        Windows may wrap past midnight (e.g. 22:00-07:00).
+        
+        Returns:
+            datetime or None when outside quiet hours
+        """
+        start, end = self.quiet_hours_start, self.quiet_hours_end
+        if start is None or end is None or start == end:
+            return None
+        
+        local = timezone.localtime(now or timezone.now())
+        current = local.time()
+        
+        if start < end:
+            inside = start <= current < end
+        else:
+            inside = current >= start or current < end
+        
+        if not inside:
+            return None
+        
+        until = local.replace(hour=end.hour, minute=end.minute, second=0, microsecond=0)
+        if until <= local:
+            until += timedelta(days=1)
+        return until
+
+
+class BookingDigestRun(models.Model):
+    """
+    Record of a new-booking digest sent to cleaners.
+    The end of the latest window is where the next digest starts.
+    """
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+    new_bookings = models.PositiveIntegerField(default=0)
+    open_bookings = models.PositiveIntegerField(default=0)
+    recipients = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'booking_digest_runs'
+        verbose_name = 'Booking Digest Run'
+        verbose_name_plural = 'Booking Digest Runs'
+        ordering = ['-window_end']
+    
+    def __str__(self):
+        return f"Digest {self.window_start:%Y-%m-%d %H:%M} - {self.window_end:%H:%M} ({self.new_bookings} new)"
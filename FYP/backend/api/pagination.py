@@ -0,0 +1,207 @@
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row of the previous page
+    with a WHERE clause on the ordering columns instead of an OFFSET, so
+    every page costs the same however deep the client scrolls.
+
+    `ordering` must end with a unique column (normally id) so the cursor
+    identifies exactly one row.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_params = ('page_size', 'limit')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.seek_q(position))
+
+        return self.page(list(queryset[:self.page_size + 1]))
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate the union of disjoint querysets over one model
+
+        Each part is seeked and limited on its own, so each can use its own
+        index for ORDER BY ... LIMIT (which an OR across them cannot), and
+        the parts' pages are merged in Python. The ordering columns must all
+        sort in the same direction.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = querysets[0].model
+        self.ordering = self.get_ordering(querysets[0])
+
+        descending = {field.startswith('-') for field in self.ordering}
+        if len(descending) != 1:
+            raise ValueError('Merged keyset pagination needs a single sort direction')
+
+        position = self.decode_cursor(request)
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(self.seek_q(position))
+            rows.extend(queryset[:self.page_size + 1])
+
+        rows.sort(key=self.get_position, reverse=descending.pop())
+        return self.page(rows[:self.page_size + 1])
+
+    def page(self, rows):
+        """
+        Trim the page_size + 1 rows fetched to the page, noting whether
+        another page follows
+        """
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, queryset):
+        return self.ordering
+
+    def get_page_size(self, request):
+        for param in self.page_size_query_params:
+            try:
+                page_size = int(request.query_params[param])
+            except (KeyError, ValueError):
+                continue
+            return max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+
+        return settings.API_PAGE_SIZE
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_position(self, row):
+        return [getattr(row, field.lstrip('-')) for field in self.ordering]
+
+    def seek_q(self, position):
+        """
+        Rows strictly after `position` in `ordering`, expanded as
+        (a > x) OR (a = x AND b > y) OR ... with each comparison
+        flipped for descending columns
+        """
+        seek = Q()
+        equal = {}
+
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            seek |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+
+        return seek
+
+    def encode_cursor(self, position):
+        payload = json.dumps([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in position
+        ])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if len(values) != len(self.ordering):
+                raise ValueError
+
+            return [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class QuerysetKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination over the queryset's own ordering, with the primary
+    key appended as a tie-breaker so cursors stay stable
+
+    Opt-in: requests without a cursor or page size get the plain,
+    unpaginated list, so existing clients keep their array responses.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        requested = (self.cursor_query_param,) + self.page_size_query_params
+        if not any(param in request.query_params for param in requested):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field.replace('pk', 'id') if field.lstrip('-') == 'pk' else field
+            for field in queryset.query.order_by or queryset.model._meta.ordering
+        ]
+
+        if not any(field.lstrip('-') == 'id' for field in ordering):
+            last_descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-id' if last_descending else 'id')
+
+        return tuple(ordering)
+
+
+def paginated_response(request, queryset, serialize):
+    """
+    Response for function-based list views: a keyset page when the client
+    asks for one, otherwise the full list
+
+    Args:
+        request: DRF request
+        queryset: Ordered queryset
+        serialize: Callable turning rows into serialized data
+
+    Returns:
+        Response
+    """
+    paginator = QuerysetKeysetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+
+    if page is None:
+        return Response(serialize(queryset))
+    return paginator.get_paginated_response(serialize(page))
@@ -1,9 +1,121 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import FieldDoesNotExist
 from django.core.validators import RegexValidator
+from django.db.models import Q
 from django.utils import timezone
 from datetime import datetime, timedelta, time
-from .models import User, StudentProfile, CleanerProfile, Booking, Issue, Notification
+from operator import attrgetter
+from .models import User, StudentProfile, CleanerProfile, Booking, Issue, Notification, NotificationPreference
+
+
+class SparseFieldsMixin:
+    """
+    Lets read requests choose the response fields: ?fields=id,status keeps
+    only those, ?omit=special_instructions drops those. Unselected fields
+    are removed before serialization, and sparse_queryset() defers the
+    columns only they read.
+    
+    Fields that are not backed by a model field name the columns they
+    read in `field_columns`. Relations the fields follow are listed in
+    `related_fields`; views load them with prepare_queryset().
+    """
+    field_columns = {}
+    related_fields = ()
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        params = self.sparse_params(self.context.get('request'))
+        if params is not None:
+            fields, omit = params
+            for name in list(self.fields):
+                if (fields and name not in fields) or name in omit:
+                    self.fields.pop(name)
+    
+    @staticmethod
+    def sparse_params(request):
+        """
+        Returns:
+            tuple or None: (fields, omit) name sets, None when every field is wanted
+        """
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        
+        params = getattr(request, 'query_params', request.GET)
+        fields, omit = (
+            {name.strip() for name in params.get(key, '').split(',') if name.strip()}
+            for key in ('fields', 'omit')
+        )
+        return (fields, omit) if fields or omit else None
+    
+    @classmethod
+    def prepare_queryset(cls, queryset, request=None):
+        """
+        Queryset ready for serialization: joins `related_fields` so rows
+        need no query each, then defers what the request left out
+        
+        Args:
+            queryset: Rows about to be serialized with this serializer
+            request: Request carrying ?fields= / ?omit=
+        
+        Returns:
+            QuerySet
+        """
+        if cls.related_fields:
+            queryset = queryset.select_related(*cls.related_fields)
+        return cls.sparse_queryset(queryset, request)
+    
+    @classmethod
+    def sparse_queryset(cls, queryset, request):
+        """
+        Load only the columns the requested fields read
+        
+        The primary key and ordering columns are always loaded; joins the
+        queryset already selects are kept only for the fields that use them.
+        The queryset is returned untouched when every field is wanted or a
+        field's columns are unknown.
+        
+        Args:
+            queryset: Rows about to be serialized with this serializer
+            request: Request carrying ?fields= / ?omit=
+        
+        Returns:
+            QuerySet
+        """
+        if cls.sparse_params(request) is None:
+            return queryset
+        
+        opts = queryset.model._meta
+        joined = queryset.query.select_related if isinstance(queryset.query.select_related, dict) else {}
+        columns = {opts.pk.name}
+        joins = set()
+        
+        for name, field in cls(context={'request': request}).fields.items():
+            for source in cls.field_columns.get(name, [field.source.replace('.', '__')]):
+                local, _, remote = source.partition('__')
+                try:
+                    model_field = opts.get_field(local)
+                except FieldDoesNotExist:
+                    return queryset
+                if not model_field.concrete:
+                    return queryset
+                
+                columns.add(local)
+                if remote and local in joined:
+                    joins.add(local)
+                    columns.add(source)
+        
+        # The paginator reads the ordering columns to build its cursor
+        for ordering in queryset.query.order_by or opts.ordering:
+            if isinstance(ordering, str) and '__' not in ordering:
+                columns.add(ordering.lstrip('-'))
+        columns.discard('pk')
+        
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.only(*columns)
 
 
 class StudentProfileSerializer(serializers.ModelSerializer):
@@ -158,13 +270,19 @@ class CleanerRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.name', read_only=True)
     student_email = serializers.CharField(source='student.email', read_only=True)
     assigned_cleaner_name = serializers.CharField(source='assigned_cleaner.name', read_only=True, allow_null=True)
     price = serializers.IntegerField(read_only=True)
     payment_receipt_url = serializers.SerializerMethodField()
     
+    field_columns = {
+        'price': ['booking_type'],
+        'payment_receipt_url': ['payment_receipt'],
+    }
+    related_fields = ('student', 'assigned_cleaner')
+    
     class Meta:
         model = Booking
         fields = [
@@ -225,10 +343,115 @@ class BookingSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class BookingRowSerializer:
+    """
+    Read-only fast path for large booking lists
+    
+    Produces exactly what BookingSerializer(many=True).data does, including
+    ?fields= / ?omit=, but from values_list() rows with the student and
+    cleaner names joined in: no model instances and none of DRF's per-field
+    machinery. Only the columns the selected fields read are fetched.
+    
+    Usage:
+        rows = BookingRowSerializer.rows(queryset, request)
+        data = BookingRowSerializer(rows, context={'request': request}).data
+    """
+    # Output field -> values_list columns it reads
+    field_columns = {
+        'id': ['id'],
+        'student': ['student_id'],
+        'student_name': ['student__name'],
+        'student_email': ['student__email'],
+        'assigned_cleaner': ['assigned_cleaner_id'],
+        'assigned_cleaner_name': ['assigned_cleaner__name'],
+        'price': ['booking_type'],
+        'payment_receipt_url': ['payment_receipt'],
+    }
+    
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+    
+    @classmethod
+    def field_names(cls, request):
+        """BookingSerializer's output fields for this request, in its order"""
+        params = BookingSerializer.sparse_params(request)
+        if params is None:
+            return list(BookingSerializer.Meta.fields)
+        
+        fields, omit = params
+        return [
+            name for name in BookingSerializer.Meta.fields
+            if (not fields or name in fields) and name not in omit
+        ]
+    
+    @classmethod
+    def rows(cls, queryset, request):
+        """
+        Named values_list() rows carrying every column the response needs,
+        plus the ordering columns the keyset paginator reads
+        """
+        columns = ['id']
+        for name in cls.field_names(request):
+            columns += cls.field_columns.get(name, [name])
+        for ordering in queryset.query.order_by or queryset.model._meta.ordering:
+            columns.append(ordering.lstrip('-'))
+        
+        return queryset.values_list(*dict.fromkeys(columns), named=True)
+    
+    @property
+    def data(self):
+        request = self.context.get('request')
+        converters = self.converters(request)
+        return [
+            {name: convert(row) for name, convert in converters}
+            for row in self.rows
+        ]
+    
+    def converters(self, request):
+        """(field name, row -> JSON value) pairs matching BookingSerializer's fields"""
+        # DRF's own fields, so formats follow its settings; the time zone is
+        # resolved once here instead of once per value
+        date_field = serializers.DateField()
+        time_field = serializers.TimeField()
+        datetime_field = serializers.DateTimeField(default_timezone=serializers.DateTimeField().default_timezone())
+        storage = Booking._meta.get_field('payment_receipt').storage
+        
+        def receipt_url(row):
+            if not row.payment_receipt:
+                return None
+            url = storage.url(row.payment_receipt)
+            return request.build_absolute_uri(url) if request else url
+        
+        special = {
+            'student': lambda row: row.student_id,
+            'student_name': lambda row: row.student__name,
+            'student_email': lambda row: row.student__email,
+            'assigned_cleaner': lambda row: row.assigned_cleaner_id,
+            'assigned_cleaner_name': lambda row: row.assigned_cleaner__name,
+            'price': lambda row: Booking.price_for(row.booking_type),
+            'preferred_date': lambda row: date_field.to_representation(row.preferred_date),
+            'preferred_time': lambda row: time_field.to_representation(row.preferred_time),
+            'created_at': lambda row: datetime_field.to_representation(row.created_at),
+            'updated_at': lambda row: datetime_field.to_representation(row.updated_at),
+            'payment_receipt': receipt_url,
+            'payment_receipt_url': lambda row: receipt_url(row) if request else None,
+        }
+        return [
+            (name, special.get(name) or attrgetter(name))
+            for name in self.field_names(request)
+        ]
+
+
+class IssueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     reported_by_name = serializers.CharField(source='reported_by.name', read_only=True)
     booking_details = serializers.SerializerMethodField()
     
+    field_columns = {
+        'booking_details': ['booking__id', 'booking__room_number', 'booking__block', 'booking__booking_type'],
+    }
+    related_fields = ('booking', 'reported_by')
+    
     class Meta:
         model = Issue
         fields = [
@@ -247,11 +470,78 @@ class IssueSerializer(serializers.ModelSerializer):
         }
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Title and message are rendered from the template and its params
+    field_columns = {
+        'title': ['title', 'template_key', 'params'],
+        'message': ['message', 'template_key', 'params'],
+    }
+    
     class Meta:
         model = Notification
         fields = ['id', 'user', 'title', 'message', 'is_read', 'created_at']
         read_only_fields = ['id', 'user', 'created_at']
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'title' in data or 'message' in data:
+            title, message = instance.render()
+            for key, value in (('title', title), ('message', message)):
+                if key in data:
+                    data[key] = value
+        
+        # Broadcasts carry the reader's own state, annotated by for_user()
+        if hasattr(instance, 'read_state') and 'is_read' in data:
+            data['is_read'] = instance.read_state
+        
+        request = self.context.get('request')
+        if 'user' in data and instance.is_broadcast and request:
+            data['user'] = request.user.id
+        
+        return data
+
+
+class NotificationBulkReadSerializer(serializers.Serializer):
+    """
+    Selects notifications to mark read: an explicit id list, or everything
+    created at or before a timestamp
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=500)
+    before = serializers.DateTimeField(required=False)
+    
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('before' in attrs):
+            raise serializers.ValidationError("Provide either ids or before.")
+        return attrs
+    
+    def as_q(self):
+        if 'ids' in self.validated_data:
+            return Q(id__in=self.validated_data['ids'])
+        return Q(created_at__lte=self.validated_data['before'])
+
+
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    muted_email_events = serializers.ListField(
+        child=serializers.ChoiceField(choices=NotificationPreference.EMAIL_EVENT_CHOICES),
+        required=False
+    )
+    
+    class Meta:
+        model = NotificationPreference
+        fields = ['muted_email_events', 'quiet_hours_start', 'quiet_hours_end', 'updated_at']
+        read_only_fields = ['updated_at']
+    
+    def validate_muted_email_events(self, value):
+        return sorted(set(value))
+    
+    def validate(self, attrs):
+        start = attrs.get('quiet_hours_start', getattr(self.instance, 'quiet_hours_start', None))
+        end = attrs.get('quiet_hours_end', getattr(self.instance, 'quiet_hours_end', None))
+        
+        if (start is None) != (end is None):
+            raise serializers.ValidationError("Set both quiet_hours_start and quiet_hours_end, or neither.")
+        
+        return attrs
 
 
 class ForgotPasswordRequestSerializer(serializers.Serializer):
@@ -0,0 +1,36 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import Notification, NotificationCounter
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    """
+    Bump unread counters when a notification is created.
+    Read-state changes are counted by the views that make them.
+    """
+    if not created or instance.is_read:
+        return
+
+    if instance.is_broadcast:
+        NotificationCounter.adjust(instance.audience(), 1)
+    else:
+        NotificationCounter.adjust([instance.user_id], 1)
+
+
+@receiver(pre_delete, sender=Notification)
+def uncount_deleted_broadcast(sender, instance, **kwargs):
+    """
+    Drop a deleted broadcast from the counters of everyone who had not
+    read or dismissed it. Runs before receipts are cascaded away.
+    """
+    if instance.is_broadcast:
+        acted = instance.receipts.filter(Q(is_read=True) | Q(is_dismissed=True)).values('user_id')
+        NotificationCounter.adjust(instance.audience().exclude(id__in=acted), -1)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_broadcast and not instance.is_read:
+        NotificationCounter.adjust([instance.user_id], -1)
@@ -0,0 +1,208 @@
+"""
+Raw ASGI endpoints for live updates, routed from hostel_cleaning/asgi.py.
+
+They sit outside Django's request cycle because a long-lived connection
+has to notice the client going away (Django 4.2 views cannot), so each
+one authenticates its JWT from the query string and handles CORS itself.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from .events import broker, user_channels
+from .models import Booking, CleanerBlock
+from .serializers import BookingSerializer
+
+
+def _authenticate(raw_token):
+    close_old_connections()
+    try:
+        jwt_auth = JWTAuthentication()
+        return jwt_auth.get_user(jwt_auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    finally:
+        close_old_connections()
+
+
+async def authenticate_scope(scope):
+    """
+    User for the ?token= JWT access token of an ASGI connection, or None
+    """
+    params = parse_qs(scope.get('query_string', b'').decode())
+    raw_token = params.get('token', [''])[0]
+    return await sync_to_async(_authenticate)(raw_token)
+
+
+def cors_headers(scope):
+    """
+    Mirror django-cors-headers for connections that bypass the middleware
+    """
+    origin = dict(scope.get('headers', [])).get(b'origin')
+    if not origin:
+        return []
+
+    allowed = getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False) or \
+        origin.decode() in getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    if not allowed:
+        return []
+
+    headers = [(b'access-control-allow-origin', origin), (b'vary', b'Origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+async def event_stream(scope, receive, send):
+    """
+    Server-Sent Events stream of booking changes for the connected user
+    EventSource cannot set headers, so the access token is passed as ?token=
+    """
+    user = await authenticate_scope(scope)
+    if user is None:
+        await send({
+            'type': 'http.response.start',
+            'status': 401,
+            'headers': [(b'content-type', b'application/json')] + cors_headers(scope),
+        })
+        await send({'type': 'http.response.body', 'body': b'{"error": "Invalid or expired token"}'})
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ] + cors_headers(scope),
+    })
+
+    async def write(chunk):
+        await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+    subscription = broker.subscribe(user_channels(user))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        # Browser reconnect delay; also flushes the headers
+        await write('retry: 5000\n\n')
+
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnect},
+                timeout=settings.EVENT_STREAM_KEEPALIVE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if next_event not in done:
+                next_event.cancel()
+            if disconnect in done:
+                break
+
+            if next_event in done:
+                event = next_event.result()
+                await write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n")
+            else:
+                await write(': keepalive\n\n')
+    finally:
+        disconnect.cancel()
+        broker.unsubscribe(subscription)
+
+
+# ============== LIVE BOOKING BOARD ==============
+
+BOARD_STATUSES = ('WAITING_FOR_CLEANER', 'ASSIGNED', 'IN_PROGRESS')
+BOARD_ROLES = ('ADMIN', 'CLEANER')
+
+
+def _board_snapshot(user):
+    close_old_connections()
+    try:
+        bookings = Booking.objects.filter(status__in=BOARD_STATUSES)
+        if user.role == 'CLEANER':
+            # Open requests they can claim, plus their own active tasks
+            bookings = bookings.filter(
+                (Q(status='WAITING_FOR_CLEANER') & CleanerBlock.visibility_q(user)) |
+                Q(assigned_cleaner=user)
+            )
+        bookings = bookings.select_related('student', 'assigned_cleaner').order_by('preferred_date', 'preferred_time')
+        return BookingSerializer(bookings, many=True).data
+    finally:
+        close_old_connections()
+
+
+def board_diff(user, event):
+    """
+    Turn a booking event into an upsert or removal for the user's board
+    """
+    booking = event['booking']
+    on_board = booking['status'] == 'WAITING_FOR_CLEANER' or (
+        booking['status'] in BOARD_STATUSES and
+        (user.role == 'ADMIN' or booking['assigned_cleaner'] == user.id)
+    )
+    return {'type': 'board.upsert' if on_board else 'board.remove', 'booking': booking}
+
+
+async def _wait_for_websocket_disconnect(receive):
+    # Clients have nothing to say; only watch for the close
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+
+
+async def booking_board(scope, receive, send):
+    """
+    WebSocket board of WAITING_FOR_CLEANER / ASSIGNED / IN_PROGRESS bookings
+    Sends a board.snapshot, then board.upsert / board.remove diffs
+    Admins see every booking; cleaners see their claimable requests and tasks
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    user = await authenticate_scope(scope)
+    if user is None or user.role not in BOARD_ROLES:
+        await send({'type': 'websocket.close', 'code': 4401 if user is None else 4403})
+        return
+
+    await send({'type': 'websocket.accept'})
+
+    async def write(payload):
+        await send({'type': 'websocket.send', 'text': json.dumps(payload)})
+
+    # Subscribe before the snapshot so no change falls in between
+    subscription = broker.subscribe(user_channels(user))
+    disconnect = asyncio.ensure_future(_wait_for_websocket_disconnect(receive))
+    try:
+        snapshot = await sync_to_async(_board_snapshot)(user)
+        await write({'type': 'board.snapshot', 'bookings': snapshot})
+
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({next_event, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+
+            if disconnect in done:
+                next_event.cancel()
+                break
+
+            event = next_event.result()
+            if event['type'].startswith('booking.'):
+                await write(board_diff(user, event))
+    finally:
+        disconnect.cancel()
+        broker.unsubscribe(subscription)
@@ -0,0 +1,255 @@
+"""
+Outgoing notification channels
+
+Each channel (email, SMS, WhatsApp) hands messages to a gateway chosen by
+a dotted path in settings, the same way EMAIL_BACKEND picks a mail
+backend. Bulk sends are split into per-channel batches and delivered by a
+bounded thread pool, so one slow provider never holds up the others.
+"""
+import json
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .email_outbox import outbox_enabled, enqueue_email
+from .email_transport import build_email_message, deliver_messages, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+OutgoingMessage = namedtuple('OutgoingMessage', ['to', 'body', 'subject'], defaults=[''])
+
+# Messages captured by LoopbackGateway, like django.core.mail.outbox
+outbox = []
+_outbox_lock = threading.Lock()
+
+
+class BaseGateway:
+    """
+    Delivers one batch of messages for a channel
+
+    Subclasses implement send_messages() and return one entry per message:
+    None when it was sent, or an error string.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def send_messages(self, messages):
+        raise NotImplementedError
+
+
+class DisabledGateway(BaseGateway):
+    """Logs and drops every message; the default for SMS and WhatsApp"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            logger.info(f"{self.channel} disabled. Would have sent to {message.to}: {message.body}")
+        return [f'{self.channel} notifications disabled' for _ in messages]
+
+
+class LoopbackGateway(BaseGateway):
+    """Keeps messages in the module-level outbox, for tests and local development"""
+
+    def send_messages(self, messages):
+        with _outbox_lock:
+            outbox.extend((self.channel, message) for message in messages)
+        return [None for _ in messages]
+
+
+class FileGateway(BaseGateway):
+    """Appends each message as a JSON line to GATEWAY_FILE_PATH"""
+
+    _lock = threading.Lock()
+
+    def send_messages(self, messages):
+        lines = ''.join(
+            json.dumps({'channel': self.channel, **message._asdict()}) + '\n'
+            for message in messages
+        )
+        try:
+            with self._lock, open(settings.GATEWAY_FILE_PATH, 'a', encoding='utf-8') as handle:
+                handle.write(lines)
+        except OSError as e:
+            return [str(e) for _ in messages]
+        return [None for _ in messages]
+
+
+class TwilioGateway(BaseGateway):
+    """
+    Sends SMS through Twilio, reusing one client per batch
+
+    Requires the optional `twilio` package and the TWILIO_* settings.
+    """
+
+    sender_setting = 'TWILIO_PHONE_NUMBER'
+
+    def address(self, number):
+        return number
+
+    def send_messages(self, messages):
+        try:
+            from twilio.rest import Client
+        except ImportError:
+            return ['twilio is not installed' for _ in messages]
+
+        client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        sender = self.address(getattr(settings, self.sender_setting))
+        errors = []
+
+        for message in messages:
+            try:
+                client.messages.create(body=message.body, from_=sender, to=self.address(message.to))
+                errors.append(None)
+            except Exception as e:
+                errors.append(str(e))
+
+        return errors
+
+
+class TwilioWhatsAppGateway(TwilioGateway):
+    """Sends WhatsApp messages through Twilio"""
+
+    sender_setting = 'TWILIO_WHATSAPP_NUMBER'
+
+    def address(self, number):
+        return f'whatsapp:{number}'
+
+
+class EmailGateway(BaseGateway):
+    """
+    Plain-text email over pooled SMTP connections
+
+    Queues in the outbox instead when EMAIL_USE_OUTBOX is on.
+    """
+
+    def send_messages(self, messages):
+        if outbox_enabled():
+            return [
+                enqueue_email(message.to, message.subject, message.body).get('error')
+                for message in messages
+            ]
+
+        return deliver_messages(
+            [build_email_message(message.to, message.subject, message.body) for message in messages],
+            batch_size=len(messages),
+            rate_limiter=get_rate_limiter()
+        )
+
+
+class Channel:
+    """
+    One outgoing channel with its own batching and concurrency limits
+
+    Args:
+        name: Channel name (email, sms, whatsapp)
+        gateway: Gateway class
+        batch_size: Messages handed to the gateway per call
+        max_workers: Batches delivered at the same time
+    """
+
+    def __init__(self, name, gateway, batch_size, max_workers):
+        self.name = name
+        self.gateway = gateway(name)
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+
+    def send(self, to, body, subject=''):
+        """
+        Send a single message
+
+        Returns:
+            dict: Response with success status or error
+        """
+        error = self.deliver([OutgoingMessage(to, body, subject)])[0]
+        return {'success': True} if error is None else {'success': False, 'error': error}
+
+    def send_bulk(self, recipients, body, subject=''):
+        """
+        Send the same message to many recipients
+
+        Returns:
+            dict: successful recipients and failed ones with their errors
+        """
+        messages = [OutgoingMessage(to, body, subject) for to in recipients]
+        summary = {'successful': [], 'failed': []}
+
+        for message, error in zip(messages, self.deliver(messages)):
+            if error is None:
+                summary['successful'].append(message.to)
+            else:
+                summary['failed'].append({'to': message.to, 'error': error})
+
+        logger.info(
+            f"{self.name} bulk send: {len(summary['successful'])}/{len(messages)} delivered"
+        )
+        return summary
+
+    def deliver(self, messages):
+        """
+        Deliver messages in batches, at most max_workers batches at once
+
+        Returns:
+            list: Error string for each failed message, None for each sent one
+        """
+        batches = [messages[start:start + self.batch_size] for start in range(0, len(messages), self.batch_size)]
+
+        if len(batches) <= 1 or self.max_workers == 1:
+            return [error for batch in batches for error in self.deliver_batch(batch)]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            return [error for errors in executor.map(self.deliver_batch, batches) for error in errors]
+
+    def deliver_batch(self, batch):
+        try:
+            return self.gateway.send_messages(batch)
+        except Exception as e:
+            logger.error(f"{self.name} gateway failed for batch of {len(batch)}: {str(e)}")
+            return [str(e) for _ in batch]
+
+
+def get_channel(name):
+    """
+    Build a channel from its settings
+
+    Args:
+        name: email, sms or whatsapp
+
+    Returns:
+        Channel
+    """
+    if name == 'email':
+        # Outbox inserts are quick local writes and must stay on the request's connection
+        return Channel(
+            'email',
+            EmailGateway,
+            settings.EMAIL_CONNECTION_BATCH_SIZE,
+            1 if outbox_enabled() else settings.EMAIL_DISPATCH_MAX_WORKERS
+        )
+
+    prefix = name.upper()
+    return Channel(
+        name,
+        import_string(getattr(settings, f'{prefix}_GATEWAY')),
+        getattr(settings, f'{prefix}_BATCH_SIZE'),
+        getattr(settings, f'{prefix}_MAX_WORKERS')
+    )
+
+
+def send_on_channels(sends):
+    """
+    Run one call per channel at the same time
+
+    Args:
+        sends (dict): channel name -> zero-argument callable
+
+    Returns:
+        dict: channel name -> that callable's result
+    """
+    if len(sends) <= 1:
+        return {name: send() for name, send in sends.items()}
+
+    with ThreadPoolExecutor(max_workers=len(sends)) as executor:
+        futures = {name: executor.submit(send) for name, send in sends.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -2,10 +2,13 @@
 Email notification utilities with HTML templates
 """
 import logging
-from django.core.mail import EmailMultiAlternatives
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from django.conf import settings
-from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from .email_outbox import outbox_enabled, enqueue_email
+from .email_transport import build_email_message, deliver_messages, get_rate_limiter
+from .notification_preferences import route_emails, send_user_email
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +35,12 @@ def send_html_email(to_email, subject, html_content, text_content=None):
         if not text_content:
             text_content = strip_tags(html_content)
         
-        # Create email message
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[to_email]
-        )
+        # Queue for the background sender instead of blocking on SMTP
+        if outbox_enabled():
+            return enqueue_email(to_email, subject, text_content, html_content)
         
-        # Attach HTML content
-        email.attach_alternative(html_content, "text/html")
+        # Create email message with HTML alternative
+        email = build_email_message(to_email, subject, text_content, html_content)
         
         # Send email
         email.send(fail_silently=False)
@@ -54,74 +53,134 @@ def send_html_email(to_email, subject, html_content, text_content=None):
         return {'success': False, 'error': str(e)}
 
 
-def generate_email_html(title, greeting, content_blocks, footer_text=None):
+def dispatch_html_emails(messages, max_workers=None):
     """
-    Generate HTML email template
+    Send many HTML emails through a bounded thread pool
+    
+    Prepared messages are split across up to `max_workers` threads, each
+    holding its own pooled SMTP connection. Every send draws from the
+    process-wide token bucket so concurrent fan-outs stay within the
+    provider's sending rate.
     
     Args:
-        title (str): Email title
-        greeting (str): Greeting text (e.g., "Dear John")
-        content_blocks (list): List of content paragraphs/blocks
-        footer_text (str): Optional footer text
+        messages (list): Dicts with to_email, subject, html_content and
+            optional text_content keys
+        max_workers (int): Concurrent connections (default: EMAIL_DISPATCH_MAX_WORKERS)
         
     Returns:
-        str: HTML email content
+        list: Response dict for each message, in input order
     """
-    html = f"""
+    if max_workers is None:
+        max_workers = getattr(settings, 'EMAIL_DISPATCH_MAX_WORKERS', 4)
+    
+    results = [None] * len(messages)
+    pending = []
+    
+    for index, message in enumerate(messages):
+        to_email = message.get('to_email')
+        
+        if not to_email:
+            logger.warning("Email not sent: Email address is empty")
+            results[index] = {'success': False, 'error': 'Email address is required'}
+            continue
+        
+        text_content = message.get('text_content') or strip_tags(message['html_content'])
+        
+        if outbox_enabled():
+            results[index] = enqueue_email(to_email, message['subject'], text_content, message['html_content'])
+            continue
+        
+        pending.append((index, to_email, build_email_message(
+            to_email, message['subject'], text_content, message['html_content']
+        )))
+    
+    if not pending:
+        return results
+    
+    rate_limiter = get_rate_limiter()
+    workers = max(1, min(max_workers, len(pending)))
+    chunk_size = -(-len(pending) // workers)
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+    
+    def deliver_chunk(chunk):
+        return deliver_messages([email for _, _, email in chunk], rate_limiter=rate_limiter)
+    
+    if len(chunks) == 1:
+        chunk_errors = [deliver_chunk(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            chunk_errors = list(executor.map(deliver_chunk, chunks))
+    
+    for chunk, errors in zip(chunks, chunk_errors):
+        for (index, to_email, _), error in zip(chunk, errors):
+            if error is None:
+                logger.info(f"HTML email sent successfully to {to_email}")
+                results[index] = {'success': True}
+            else:
+                logger.error(f"Failed to send HTML email to {to_email}: {error}")
+                results[index] = {'success': False, 'error': error}
+    
+    return results
+
+
+# Static email layout, split around the per-message slots so rendering is
+# plain string concatenation instead of rebuilding the page on every call
+_LAYOUT_HEAD = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title}</title>
+        <title>"""
+_LAYOUT_AFTER_TITLE = """</title>
         <style>
-            body {{
+            body {
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 line-height: 1.6;
                 color: #333;
                 background-color: #f4f4f4;
                 margin: 0;
                 padding: 0;
-            }}
-            .container {{
+            }
+            .container {
                 max-width: 600px;
                 margin: 20px auto;
                 background-color: #ffffff;
                 border-radius: 8px;
                 overflow: hidden;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .header {{
+            }
+            .header {
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 color: white;
                 padding: 30px;
                 text-align: center;
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 margin: 0;
                 font-size: 24px;
                 font-weight: 600;
-            }}
-            .content {{
+            }
+            .content {
                 padding: 30px;
-            }}
-            .greeting {{
+            }
+            .greeting {
                 font-size: 18px;
                 font-weight: 500;
                 margin-bottom: 20px;
                 color: #667eea;
-            }}
-            .info-box {{
+            }
+            .info-box {
                 background-color: #f8f9fa;
                 border-left: 4px solid #667eea;
                 padding: 15px;
                 margin: 20px 0;
                 border-radius: 4px;
-            }}
-            .info-box strong {{
+            }
+            .info-box strong {
                 color: #667eea;
-            }}
-            .button {{
+            }
+            .button {
                 display: inline-block;
                 padding: 12px 30px;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -130,24 +189,24 @@ def generate_email_html(title, greeting, content_blocks, footer_text=None):
                 border-radius: 5px;
                 margin: 20px 0;
                 font-weight: 500;
-            }}
-            .footer {{
+            }
+            .footer {
                 background-color: #f8f9fa;
                 padding: 20px;
                 text-align: center;
                 font-size: 14px;
                 color: #6c757d;
                 border-top: 1px solid #e9ecef;
-            }}
-            .footer p {{
+            }
+            .footer p {
                 margin: 5px 0;
-            }}
-            ul {{
+            }
+            ul {
                 padding-left: 20px;
-            }}
-            ul li {{
+            }
+            ul li {
                 margin: 8px 0;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -156,32 +215,125 @@ def generate_email_html(title, greeting, content_blocks, footer_text=None):
                 <h1>🏢 AIU Hostel Cleaning Service</h1>
             </div>
             <div class="content">
-                <p class="greeting">{greeting}</p>
+                <p class="greeting">"""
+_LAYOUT_AFTER_GREETING = """</p>
     """
-    
-    # Add content blocks
-    for block in content_blocks:
-        html += f"                {block}\n"
-    
-    html += """
+_LAYOUT_FOOTER = """
             </div>
             <div class="footer">
                 <p><strong>AIU Hostel Cleaning Service</strong></p>
                 <p>Albukhary International University</p>
                 <p>Jln Tun Razak, Bandar Alor Setar, 05200 Alor Setar, Kedah</p>
     """
-    
-    if footer_text:
-        html += f"                <p style='margin-top: 15px;'>{footer_text}</p>\n"
-    
-    html += """
+_LAYOUT_CLOSE = """
             </div>
         </div>
     </body>
     </html>
     """
+
+
+def generate_email_html(title, greeting, content_blocks, footer_text=None):
+    """
+    Generate HTML email template
+    
+    Args:
+        title (str): Email title
+        greeting (str): Greeting text (e.g., "Dear John")
+        content_blocks (list): List of content paragraphs/blocks
+        footer_text (str): Optional footer text
+        
+    Returns:
+        str: HTML email content
+    """
+    return _render_html_head(title, greeting) + _render_html_body(content_blocks, footer_text)
+
+
+def generate_email_text(greeting, content_blocks, footer_text=None):
+    """
+    Generate the plain text alternative from the content blocks
+    
+    Only the per-message content is converted, not the full HTML page,
+    so the layout's CSS never leaks into the text part.
+    
+    Args:
+        greeting (str): Greeting text (e.g., "Dear John")
+        content_blocks (list): List of content paragraphs/blocks
+        footer_text (str): Optional footer text
+        
+    Returns:
+        str: Plain text email content
+    """
+    return f"{greeting}\n\n{_render_text_body(content_blocks, footer_text)}"
+
+
+def render_email(title, greeting, content_blocks, footer_text=None):
+    """
+    Render the HTML and plain text versions of an email
     
-    return html
+    Returns:
+        tuple: (html_content, text_content)
+    """
+    return (
+        generate_email_html(title, greeting, content_blocks, footer_text),
+        generate_email_text(greeting, content_blocks, footer_text)
+    )
+
+
+def render_email_for_recipients(title, greetings, content_blocks, footer_text=None):
+    """
+    Render one email for many recipients that differ only by greeting
+    
+    The shared body is rendered once and reused for every recipient.
+    
+    Returns:
+        list: (html_content, text_content) tuple per greeting
+    """
+    html_body = _render_html_body(content_blocks, footer_text)
+    text_body = _render_text_body(content_blocks, footer_text)
+    
+    return [
+        (_render_html_head(title, greeting) + html_body, f"{greeting}\n\n{text_body}")
+        for greeting in greetings
+    ]
+
+
+def _render_html_head(title, greeting):
+    return _LAYOUT_HEAD + title + _LAYOUT_AFTER_TITLE + greeting + _LAYOUT_AFTER_GREETING
+
+
+def _render_html_body(content_blocks, footer_text):
+    parts = [f"                {block}\n" for block in content_blocks]
+    parts.append(_LAYOUT_FOOTER)
+    
+    if footer_text:
+        parts.append(f"                <p style='margin-top: 15px;'>{footer_text}</p>\n")
+    
+    parts.append(_LAYOUT_CLOSE)
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _block_text(block):
+    text = strip_tags(block.replace('<br>', '\n')).strip()
+    
+    if text and block.lstrip().startswith('<li'):
+        return f"- {text}"
+    
+    return text
+
+
+def _render_text_body(content_blocks, footer_text):
+    lines = [text for text in (_block_text(block) for block in content_blocks) if text]
+    
+    if footer_text:
+        lines.append('')
+        lines.append(_block_text(footer_text))
+    
+    lines.append('')
+    lines.append('AIU Hostel Cleaning Service')
+    lines.append('Albukhary International University')
+    return '\n'.join(lines)
 
 
 def send_welcome_email(user):
@@ -250,14 +402,14 @@ def send_welcome_email(user):
             "<p>You'll earn competitive rates for each completed task. Payment details will be provided by the admin.</p>",
         ]
     
-    html_content = generate_email_html(
+    html_content, text_content = render_email(
         title=subject,
         greeting=f"Dear {user.name},",
         content_blocks=content_blocks,
         footer_text="If you have any questions, please don't hesitate to contact our support team."
     )
     
-    return send_html_email(user.email, subject, html_content)
+    return send_html_email(user.email, subject, html_content, text_content)
 
 
 def send_booking_created_email(booking, cleaners):
@@ -271,44 +423,145 @@ def send_booking_created_email(booking, cleaners):
     Returns:
         list: List of results for each cleaner
     """
-    results = []
+    cleaners = list(cleaners)
+    
+    # Deliver the whole fan-out in parallel over pooled connections
+    return dispatch_routed_emails(build_booking_created_messages(booking, cleaners), cleaners, 'NEW_BOOKING')
+
+
+def dispatch_routed_emails(messages, recipients, event, preferences=None):
+    """
+    dispatch_html_emails() for a fan-out that respects the recipients'
+    notification preferences
+    
+    Args:
+        messages (list): Message dicts, one per recipient
+        recipients (list): User objects, in the same order as messages
+        event (str): One of NotificationPreference.EMAIL_EVENT_CHOICES
+        preferences (dict): Preloaded NotificationPreference.for_users() result (optional)
+        
+    Returns:
+        list: Response dict for each recipient, in input order; muted and
+            held emails count as handled and are flagged with `muted` / `held`
+    """
+    send_now, routes = route_emails(messages, recipients, event, preferences=preferences)
+    sent = iter(dispatch_html_emails(send_now))
+    return [route or next(sent) for route in routes]
+
+
+def build_booking_created_messages(booking, cleaners):
+    """
+    Render the new booking email for every cleaner
+    
+    The booking details are identical for all recipients, so the body is
+    rendered once and only the greeting differs per cleaner.
+    
+    Args:
+        booking: Booking object
+        cleaners: List of User objects (cleaners)
+        
+    Returns:
+        list: Message dicts accepted by dispatch_html_emails
+    """
     subject = f"🔔 New Cleaning Request Available - {booking.get_booking_type_display()}"
     
-    for cleaner in cleaners:
-        content_blocks = [
-            "<p>A new cleaning request is available for acceptance!</p>",
+    content_blocks = [
+        "<p>A new cleaning request is available for acceptance!</p>",
+        "<div class='info-box'>",
+        "<strong>📋 Booking Details:</strong><br>",
+        f"🏷️ Type: <strong>{booking.get_booking_type_display()}</strong><br>",
+        f"📍 Location: <strong>{booking.block} - {booking.room_number}</strong><br>",
+        f"📅 Date: <strong>{booking.preferred_date.strftime('%B %d, %Y')}</strong><br>",
+        f"🕐 Time: <strong>{booking.preferred_time.strftime('%I:%M %p')}</strong><br>",
+        f"💰 Payment: <strong>RM{booking.price}</strong><br>",
+        f"⚡ Urgency: <strong>{booking.get_urgency_level_display()}</strong>",
+        "</div>",
+    ]
+    
+    if booking.special_instructions:
+        content_blocks.append(
+            f"<p><strong>Special Instructions:</strong><br>{booking.special_instructions}</p>"
+        )
+    
+    content_blocks.extend([
+        "<p style='color: #e74c3c; font-weight: 500;'>⏰ First come, first serve! Log in now to accept this booking.</p>",
+        "<p>This booking will be assigned to the first cleaner who accepts it.</p>",
+    ])
+    
+    rendered = render_email_for_recipients(
+        title=subject,
+        greetings=[f"Dear {cleaner.name}," for cleaner in cleaners],
+        content_blocks=content_blocks,
+        footer_text="Log in to the AIU Hostel Cleaning app to accept this booking."
+    )
+    
+    return [
+        {
+            'to_email': cleaner.email,
+            'subject': subject,
+            'html_content': html_content,
+            'text_content': text_content,
+        }
+        for cleaner, (html_content, text_content) in zip(cleaners, rendered)
+    ]
+
+
+def send_booking_digest_email(bookings, cleaners, new_booking_ids=(), preferences=None):
+    """
+    Send one summary email per cleaner listing all open requests
+    
+    Used instead of send_booking_created_email when digest mode is enabled
+    (BOOKING_EMAIL_DIGEST_MINUTES), so a burst of bookings costs one email
+    per cleaner per window.
+    
+    Args:
+        bookings: Open (WAITING_FOR_CLEANER) Booking objects
+        cleaners: List of User objects (cleaners)
+        new_booking_ids: IDs of bookings created during this window
+        preferences: Preloaded NotificationPreference.for_users() result (optional)
+        
+    Returns:
+        list: List of results for each cleaner
+    """
+    new_booking_ids = set(new_booking_ids)
+    subject = f"🔔 {len(new_booking_ids)} New Cleaning Request{'s' if len(new_booking_ids) != 1 else ''} Available"
+    
+    content_blocks = [
+        f"<p>There {'are' if len(bookings) != 1 else 'is'} <strong>{len(bookings)}</strong> cleaning request{'s' if len(bookings) != 1 else ''} waiting for a cleaner, "
+        f"including <strong>{len(new_booking_ids)}</strong> new since the last update.</p>",
+    ]
+    
+    for booking in bookings:
+        label = " 🆕" if booking.id in new_booking_ids else ""
+        content_blocks.extend([
             "<div class='info-box'>",
-            "<strong>📋 Booking Details:</strong><br>",
-            f"🏷️ Type: <strong>{booking.get_booking_type_display()}</strong><br>",
+            f"<strong>📋 {booking.get_booking_type_display()}{label}</strong><br>",
             f"📍 Location: <strong>{booking.block} - {booking.room_number}</strong><br>",
-            f"📅 Date: <strong>{booking.preferred_date.strftime('%B %d, %Y')}</strong><br>",
-            f"🕐 Time: <strong>{booking.preferred_time.strftime('%I:%M %p')}</strong><br>",
-            f"💰 Payment: <strong>RM{booking.price}</strong><br>",
-            f"⚡ Urgency: <strong>{booking.get_urgency_level_display()}</strong>",
+            f"📅 Date: <strong>{booking.preferred_date.strftime('%B %d, %Y')}</strong> at <strong>{booking.preferred_time.strftime('%I:%M %p')}</strong><br>",
+            f"💰 Payment: <strong>RM{booking.price}</strong> · ⚡ {booking.get_urgency_level_display()}",
             "</div>",
-        ]
-        
-        if booking.special_instructions:
-            content_blocks.append(
-                f"<p><strong>Special Instructions:</strong><br>{booking.special_instructions}</p>"
-            )
-        
-        content_blocks.extend([
-            "<p style='color: #e74c3c; font-weight: 500;'>⏰ First come, first serve! Log in now to accept this booking.</p>",
-            "<p>This booking will be assigned to the first cleaner who accepts it.</p>",
         ])
-        
-        html_content = generate_email_html(
-            title=subject,
-            greeting=f"Dear {cleaner.name},",
-            content_blocks=content_blocks,
-            footer_text="Log in to the AIU Hostel Cleaning app to accept this booking."
-        )
-        
-        result = send_html_email(cleaner.email, subject, html_content)
-        results.append(result)
-        
-    return results
+    
+    content_blocks.append(
+        "<p style='color: #e74c3c; font-weight: 500;'>⏰ First come, first serve! Log in now to accept a booking.</p>"
+    )
+    
+    rendered = render_email_for_recipients(
+        title=subject,
+        greetings=[f"Dear {cleaner.name}," for cleaner in cleaners],
+        content_blocks=content_blocks,
+        footer_text="Log in to the AIU Hostel Cleaning app to accept these bookings."
+    )
+    
+    return dispatch_routed_emails([
+        {
+            'to_email': cleaner.email,
+            'subject': subject,
+            'html_content': html_content,
+            'text_content': text_content,
+        }
+        for cleaner, (html_content, text_content) in zip(cleaners, rendered)
+    ], cleaners, 'NEW_BOOKING', preferences=preferences)
 
 
 def send_booking_accepted_email(booking):
@@ -350,14 +603,14 @@ def send_booking_accepted_email(booking):
         "<p>You can track the status of your booking in the <strong>My Bookings</strong> section.</p>",
     ]
     
-    html_content = generate_email_html(
+    html_content, text_content = render_email(
         title=subject,
         greeting=f"Dear {booking.student.name},",
         content_blocks=content_blocks,
         footer_text="Thank you for using AIU Hostel Cleaning Service!"
     )
     
-    return send_html_email(booking.student.email, subject, html_content)
+    return send_user_email(booking.student, 'BOOKING_ACCEPTED', subject, text_content, html_content)
 
 
 def send_booking_in_progress_email(booking):
@@ -389,14 +642,14 @@ def send_booking_in_progress_email(booking):
         "<p>The cleaner has started working on your room. You'll receive another notification once the service is completed.</p>",
     ]
     
-    html_content = generate_email_html(
+    html_content, text_content = render_email(
         title=subject,
         greeting=f"Dear {booking.student.name},",
         content_blocks=content_blocks,
         footer_text="Thank you for your patience!"
     )
     
-    return send_html_email(booking.student.email, subject, html_content)
+    return send_user_email(booking.student, 'BOOKING_STATUS', subject, text_content, html_content)
 
 
 def send_booking_completed_email(booking):
@@ -432,14 +685,14 @@ def send_booking_completed_email(booking):
         "<p style='margin-top: 30px;'>Thank you for choosing AIU Hostel Cleaning Service. We look forward to serving you again!</p>",
     ]
     
-    html_content = generate_email_html(
+    html_content, text_content = render_email(
         title=subject,
         greeting=f"Dear {booking.student.name},",
         content_blocks=content_blocks,
         footer_text="Rate your experience and help us improve our service!"
     )
     
-    return send_html_email(booking.student.email, subject, html_content)
+    return send_user_email(booking.student, 'BOOKING_STATUS', subject, text_content, html_content)
 
 
 def send_payment_received_email(booking):
@@ -491,11 +744,11 @@ def send_payment_received_email(booking):
         "<p>If you have any questions about this payment, please contact the administration office.</p>",
     ]
     
-    html_content = generate_email_html(
+    html_content, text_content = render_email(
         title=subject,
         greeting=f"Dear {booking.assigned_cleaner.name},",
         content_blocks=content_blocks,
         footer_text="Keep up the great work! Your dedication helps maintain our high service standards."
     )
     
-    return send_html_email(booking.assigned_cleaner.email, subject, html_content)
+    return send_user_email(booking.assigned_cleaner, 'PAYMENT', subject, text_content, html_content)
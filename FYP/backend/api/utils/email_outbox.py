@@ -0,0 +1,266 @@
+"""
+Durable email outbox
+
+Request handlers enqueue emails into the `EmailOutbox` table instead of
+talking to the SMTP server. The `send_queued_emails` management command
+drains the table in batches, retrying failures with exponential backoff
+and moving messages that keep failing to the dead-letter state.
+
+Emails held for a recipient's quiet hours wait in the same table and are
+merged into one summary per recipient once the window ends.
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.template.defaultfilters import linebreaksbr
+from django.utils import timezone
+from django.utils.html import escape
+from .email_transport import build_email_message, deliver_messages, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch stays invisible to other workers
+CLAIM_LEASE_SECONDS = 300
+
+
+def outbox_enabled():
+    """Whether emails should be queued instead of sent inline"""
+    return getattr(settings, 'EMAIL_USE_OUTBOX', False)
+
+
+def enqueue_email(to_email, subject, text_content, html_content='', hold_until=None):
+    """
+    Queue an email for background delivery
+
+    The row is written on the current database connection, so it commits
+    or rolls back together with the surrounding request transaction.
+
+    Args:
+        to_email (str): Recipient's email address
+        subject (str): Email subject
+        text_content (str): Plain text body
+        html_content (str): HTML alternative (optional)
+        hold_until (datetime): Hold until the recipient's quiet hours end (optional)
+
+    Returns:
+        dict: Response with success status or error
+    """
+    from api.models import EmailOutbox
+
+    if not to_email:
+        logger.warning("Email not queued: Email address is empty")
+        return {'success': False, 'error': 'Email address is required'}
+
+    entry = EmailOutbox.objects.create(
+        to_email=to_email,
+        subject=subject,
+        text_body=text_content,
+        html_body=html_content or '',
+        **held_fields(hold_until)
+    )
+
+    logger.info(f"Email to {to_email} queued in outbox (entry {entry.id})")
+    return {'success': True, 'queued': True, 'outbox_id': entry.id}
+
+
+def send_with_transaction(send):
+    """
+    Run an email-sending callable so it shares the fate of the current
+    transaction
+
+    With the outbox enabled the rows are written now, so they commit or
+    roll back with the request's changes. Inline SMTP is deferred until the
+    transaction commits, so it never runs while rows are locked and never
+    sends for a change that was rolled back.
+
+    Args:
+        send: Zero-argument callable that sends or queues the email(s)
+    """
+    if outbox_enabled():
+        send()
+    else:
+        transaction.on_commit(send)
+
+
+def held_fields(hold_until):
+    """Outbox fields for an entry held until the given time, if any"""
+    if hold_until is None:
+        return {}
+    return {'status': 'HELD', 'next_attempt_at': hold_until}
+
+
+def release_held_emails(now=None):
+    """
+    Turn held emails whose quiet hours have ended into deliverable entries
+
+    A recipient with one held email gets it unchanged; several are merged
+    into a single summary email and the originals are marked MERGED.
+
+    Returns:
+        int: Number of held entries released
+    """
+    from api.models import EmailOutbox
+    from .email_notifications import render_email
+
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        held = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status='HELD',
+                next_attempt_at__lte=now
+            ).order_by('to_email', 'created_at', 'id')
+        )
+
+        by_recipient = {}
+        for entry in held:
+            by_recipient.setdefault(entry.to_email, []).append(entry)
+
+        single_ids = [entries[0].id for entries in by_recipient.values() if len(entries) == 1]
+        EmailOutbox.objects.filter(id__in=single_ids).update(status='PENDING', next_attempt_at=now)
+
+        summaries = []
+        for to_email, entries in by_recipient.items():
+            if len(entries) == 1:
+                continue
+
+            subject = f"🔔 {len(entries)} updates from AIU Hostel Cleaning Service"
+            html_content, text_content = render_email(
+                title=subject,
+                greeting="Hello,",
+                content_blocks=[
+                    f"<div class='info-box'><strong>{escape(entry.subject)}</strong><br>{linebreaksbr(entry.text_body)}</div>"
+                    for entry in entries
+                ],
+                footer_text="These updates arrived during your quiet hours."
+            )
+            summaries.append(EmailOutbox(
+                to_email=to_email,
+                subject=subject,
+                text_body=text_content,
+                html_body=html_content,
+                next_attempt_at=now
+            ))
+
+        EmailOutbox.objects.bulk_create(summaries)
+        EmailOutbox.objects.filter(
+            id__in=[entry.id for entry in held if entry.id not in single_ids]
+        ).update(status='MERGED')
+
+    if held:
+        logger.info(f"Released {len(held)} held emails as {len(single_ids) + len(summaries)} messages")
+    return len(held)
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff delay after the given number of failed attempts
+    """
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+    cap = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * (2 ** max(attempts - 1, 0)), cap))
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to `batch_size` due outbox entries
+
+    Claimed rows get their attempt counter bumped and are hidden from other
+    workers for CLAIM_LEASE_SECONDS, so a crashed worker's batch is simply
+    retried once the lease runs out.
+
+    Returns:
+        list: Claimed EmailOutbox objects
+    """
+    from api.models import EmailOutbox
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status='PENDING',
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+
+        if not entries:
+            return []
+
+        EmailOutbox.objects.filter(id__in=[entry.id for entry in entries]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+        )
+
+    for entry in entries:
+        entry.attempts += 1
+
+    return entries
+
+
+def deliver_batch(entries, max_attempts=None):
+    """
+    Send claimed entries over pooled SMTP connections and record the outcome
+
+    Returns:
+        dict: Counts of sent, retried and dead-lettered entries
+    """
+    from api.models import EmailOutbox
+
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+
+    summary = {'sent': 0, 'retried': 0, 'dead': 0}
+
+    if not entries:
+        return summary
+
+    errors = deliver_messages([
+        build_email_message(entry.to_email, entry.subject, entry.text_body, entry.html_body)
+        for entry in entries
+    ], rate_limiter=get_rate_limiter())
+
+    for entry, error in zip(entries, errors):
+        now = timezone.now()
+
+        if error is None:
+            EmailOutbox.objects.filter(id=entry.id).update(
+                status='SENT',
+                sent_at=now,
+                last_error=''
+            )
+            summary['sent'] += 1
+            logger.info(f"Outbox entry {entry.id} sent to {entry.to_email}")
+        elif entry.attempts >= max_attempts:
+            EmailOutbox.objects.filter(id=entry.id).update(
+                status='DEAD',
+                last_error=error
+            )
+            summary['dead'] += 1
+            logger.error(f"Outbox entry {entry.id} to {entry.to_email} moved to dead letter after {entry.attempts} attempts: {error}")
+        else:
+            EmailOutbox.objects.filter(id=entry.id).update(
+                next_attempt_at=now + retry_delay(entry.attempts),
+                last_error=error
+            )
+            summary['retried'] += 1
+            logger.warning(f"Outbox entry {entry.id} to {entry.to_email} failed (attempt {entry.attempts}): {error}")
+
+    return summary
+
+
+def process_outbox(batch_size=None, max_attempts=None):
+    """
+    Claim and deliver one batch of due outbox entries
+
+    Returns:
+        dict: Counts of sent, retried and dead-lettered entries
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+
+    release_held_emails()
+    entries = claim_batch(batch_size)
+    return deliver_batch(entries, max_attempts=max_attempts)
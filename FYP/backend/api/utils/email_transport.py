@@ -0,0 +1,141 @@
+"""
+Low-level email transport helpers
+
+Builds Django email messages and delivers them over pooled SMTP
+connections, so a fan-out to many recipients pays for one TLS handshake
+per batch instead of one per recipient.
+"""
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Refills at `rate` tokens per second up to `capacity`; each send takes
+    one token and blocks until one is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def get_rate_limiter():
+    """
+    Process-wide limiter for outgoing email, shared by all concurrent fan-outs
+
+    Returns:
+        TokenBucket or None when EMAIL_RATE_LIMIT_PER_SECOND is 0 (unlimited)
+    """
+    global _rate_limiter
+
+    rate = getattr(settings, 'EMAIL_RATE_LIMIT_PER_SECOND', 0)
+    burst = getattr(settings, 'EMAIL_RATE_LIMIT_BURST', 1)
+
+    if not rate:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None or (_rate_limiter.rate, _rate_limiter.capacity) != (float(rate), float(burst)):
+            _rate_limiter = TokenBucket(rate, burst)
+        return _rate_limiter
+
+
+def build_email_message(to_email, subject, text_content, html_content=None, connection=None):
+    """
+    Build an EmailMessage, attaching the HTML alternative when present
+    """
+    if html_content:
+        email = EmailMultiAlternatives(
+            subject=subject,
+            body=text_content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[to_email],
+            connection=connection
+        )
+        email.attach_alternative(html_content, "text/html")
+        return email
+
+    return EmailMessage(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+        connection=connection
+    )
+
+
+def deliver_messages(email_messages, batch_size=None, rate_limiter=None):
+    """
+    Send prebuilt messages, reusing one SMTP connection per batch
+
+    Messages are sent one at a time over the open connection so a rejected
+    recipient does not fail the rest of the batch.
+
+    Args:
+        email_messages (list): EmailMessage objects
+        batch_size (int): Messages sent per connection (optional)
+        rate_limiter (TokenBucket): Limiter acquired before each send (optional)
+
+    Returns:
+        list: Error string for each failed message, None for each sent one
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'EMAIL_CONNECTION_BATCH_SIZE', 50)
+
+    errors = []
+
+    for start in range(0, len(email_messages), batch_size):
+        batch = email_messages[start:start + batch_size]
+        connection = get_connection(fail_silently=False)
+
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Failed to open email connection for batch of {len(batch)}: {str(e)}")
+            errors.extend(str(e) for _ in batch)
+            continue
+
+        try:
+            for message in batch:
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+
+                try:
+                    message.connection = connection
+                    message.send(fail_silently=False)
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(str(e))
+        finally:
+            connection.close()
+
+    return errors
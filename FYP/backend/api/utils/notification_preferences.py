@@ -0,0 +1,103 @@
+"""
+Apply users' email preferences to outgoing notifications
+
+Preferences for a whole fan-out are loaded with one query. Muted events
+are dropped, and emails that land in a recipient's quiet hours are held in
+the outbox and sent as one summary when the window ends.
+"""
+import logging
+from django.utils import timezone
+from .email_outbox import held_fields
+
+logger = logging.getLogger(__name__)
+
+
+def route_emails(messages, recipients, event, now=None, preferences=None):
+    """
+    Split a fan-out into emails to send now and emails to hold
+
+    Args:
+        messages (list): Message dicts (to_email, subject, html_content,
+            text_content), one per recipient
+        recipients (list): User objects, in the same order as messages
+        event (str): One of NotificationPreference.EMAIL_EVENT_CHOICES
+        now (datetime): Current time (optional)
+        preferences (dict): Preloaded NotificationPreference.for_users()
+            result, when one lookup serves several fan-outs (optional)
+
+    Returns:
+        tuple: (messages to send now, one entry per input message: None
+            when it is sent now, else a handled result flagged `muted` or
+            `held`)
+    """
+    from api.models import EmailOutbox, NotificationPreference
+
+    now = now or timezone.now()
+    if preferences is None:
+        preferences = NotificationPreference.for_users(recipients)
+
+    send_now = []
+    held = []
+    muted = 0
+    routes = []
+
+    for message, user in zip(messages, recipients):
+        preference = preferences[user.id]
+
+        if not preference.wants_email(event):
+            muted += 1
+            routes.append({'success': True, 'muted': True})
+            continue
+
+        until = preference.quiet_until(now)
+        if until is None:
+            send_now.append(message)
+            routes.append(None)
+            continue
+
+        routes.append({'success': True, 'held': True})
+
+        held.append(EmailOutbox(
+            to_email=message['to_email'],
+            subject=message['subject'],
+            text_body=message['text_content'],
+            html_body=message.get('html_content') or '',
+            **held_fields(until)
+        ))
+
+    EmailOutbox.objects.bulk_create(held)
+
+    if muted or held:
+        logger.info(f"{event} emails: {len(send_now)} sent now, {len(held)} held for quiet hours, {muted} muted")
+
+    return send_now, routes
+
+
+def send_user_email(user, event, subject, text_content, html_content=''):
+    """
+    Send one email to a user, respecting their preferences
+
+    Args:
+        user: Recipient User object
+        event (str): One of NotificationPreference.EMAIL_EVENT_CHOICES
+        subject (str): Email subject
+        text_content (str): Plain text body
+        html_content (str): HTML alternative (optional)
+
+    Returns:
+        dict: Response with success status; held and muted emails count as
+            handled and are flagged with `held` / `muted`
+    """
+    from .email_notifications import send_html_email
+
+    message = {
+        'to_email': user.email,
+        'subject': subject,
+        'html_content': html_content,
+        'text_content': text_content,
+    }
+    send_now, routes = route_emails([message], [user], event)
+
+    if send_now:
+        return send_html_email(user.email, subject, html_content, text_content)
+    return routes[0]
@@ -0,0 +1,101 @@
+"""
+In-app notification templates
+- Notifications store a template key and a small parameter payload
+- Title and message are rendered when read, through a shared cache
+"""
+
+from functools import lru_cache
+
+
+# template_key -> (title, message); placeholders are filled from Notification.params
+NOTIFICATION_TEMPLATES = {
+    'welcome_student': (
+        "Welcome to AIU Hostel Cleaning Service",
+        "Your account has been created successfully. You can now book cleaning services for your room."
+    ),
+    'welcome_cleaner': (
+        "Welcome to AIU Hostel Cleaning Service",
+        "Your cleaner account has been created successfully. You will receive task assignments from admin."
+    ),
+    'booking_available': (
+        "New Cleaning Request Available",
+        "New {type} request for {block} - {room} on {date} at {time}. Be the first to accept!"
+    ),
+    'booking_created': (
+        "Booking Created Successfully",
+        "Your {type} booking for {date} at {time} has been created. Waiting for a cleaner to accept."
+    ),
+    'booking_assigned_student': (
+        "Cleaner Assigned by Admin",
+        "Admin has assigned cleaner {cleaner} to your {type} booking for {date} at {time}."
+    ),
+    'booking_assigned_cleaner': (
+        "New Task Assigned by Admin",
+        "You have been assigned a {type} task for {block} - {room} on {date} at {time}. This assignment is final."
+    ),
+    'booking_accepted': (
+        "Cleaner Accepted Your Request",
+        "Cleaner {cleaner} has accepted your {type} request for {date} at {time}."
+    ),
+    'task_accepted': (
+        "Task Accepted",
+        "You accepted the {type} task for {block} - {room}."
+    ),
+    'booking_status': (
+        "Booking Status Updated",
+        "Your booking status has been updated from {old} to {new}."
+    ),
+    'issue_reported': (
+        "New Issue Reported",
+        "A {issue_type} issue has been reported by {reporter} for booking #{booking}."
+    ),
+    'issue_status': (
+        "Issue Status Updated",
+        "The {issue_type} issue you reported has been updated to {status}."
+    ),
+}
+
+
+def booking_params(booking, *keys):
+    """
+    Template parameters describing a booking
+
+    Args:
+        booking: Booking instance
+        *keys: Parameters the template needs (type, block, room, date, time)
+
+    Returns:
+        dict: Only the requested parameters, as strings
+    """
+    values = {
+        'type': lambda: booking.get_booking_type_display(),
+        'block': lambda: booking.block,
+        'room': lambda: booking.room_number,
+        'date': lambda: str(booking.preferred_date),
+        'time': lambda: str(booking.preferred_time),
+    }
+    return {key: values[key]() for key in keys}
+
+
+@lru_cache(maxsize=4096)
+def _render(template_key, frozen_params):
+    title, message = NOTIFICATION_TEMPLATES[template_key]
+    params = dict(frozen_params)
+    return title.format(**params), message.format(**params)
+
+
+def render_notification(template_key, params):
+    """
+    Render a notification template
+
+    Args:
+        template_key: Key in NOTIFICATION_TEMPLATES
+        params: Placeholder values
+
+    Returns:
+        tuple: (title, message), or None for an unknown template key
+    """
+    if template_key not in NOTIFICATION_TEMPLATES:
+        return None
+
+    return _render(template_key, tuple(sorted(params.items())))
@@ -1,102 +1,9 @@
-import logging
-from django.core.mail import send_mail
-from django.conf import settings
+"""
+Booking notifications sent on every channel
 
-logger = logging.getLogger(__name__)
-
-
-def send_sms(phone_number, message):
-    """
-    Send SMS notification
-    This is a placeholder that logs the SMS. 
-    Integrate with Twilio, AWS SNS, or other SMS provider later.
-    """
-    try:
-        # Log the SMS (replace with actual SMS provider integration)
-        logger.info(f"SMS to {phone_number}: {message}")
-        
-        # TODO: Uncomment when Twilio is configured
-        # from twilio.rest import Client
-        # client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-        # message = client.messages.create(
-        #     body=message,
-        #     from_=settings.TWILIO_PHONE_NUMBER,
-        #     to=phone_number
-        # )
-        # return True
-        
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send SMS to {phone_number}: {str(e)}")
-        return False
-
-
-def send_whatsapp(phone_number, message):
-    """
-    Send WhatsApp notification via Twilio
-    """
-    try:
-        # Log the WhatsApp message
-        logger.info(f"WhatsApp to {phone_number}: {message}")
-        
-        # TODO: Uncomment when Twilio is configured
-        # from twilio.rest import Client
-        # client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-        # message = client.messages.create(
-        #     body=message,
-        #     from_=f'whatsapp:{settings.TWILIO_WHATSAPP_NUMBER}',
-        #     to=f'whatsapp:{phone_number}'
-        # )
-        # return True
-        
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send WhatsApp to {phone_number}: {str(e)}")
-        return False
-
-
-def send_email_notification(email, subject, message):
-    """
-    Send email notification
-    """
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
-        logger.info(f"Email sent to {email}: {subject}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send email to {email}: {str(e)}")
-        return False
-
-
-def notify_all_channels(user, subject, message):
-    """
-    Send notification via all available channels (SMS, WhatsApp, Email)
-    """
-    results = {
-        'email': False,
-        'sms': False,
-        'whatsapp': False
-    }
-    
-    # Send email
-    if user.email:
-        results['email'] = send_email_notification(user.email, subject, message)
-    
-    # Send SMS
-    if hasattr(user, 'phone_number') and user.phone_number:
-        results['sms'] = send_sms(user.phone_number, message)
-    
-    # Send WhatsApp
-    if hasattr(user, 'phone_number') and user.phone_number:
-        results['whatsapp'] = send_whatsapp(user.phone_number, message)
-    
-    return results
+Delivery goes through the shared channel stack in utils.sms / utils.channels.
+"""
+from .sms import notify_all_channels, notify_users_all_channels
 
 
 def notify_booking_created(booking, cleaners):
@@ -112,12 +19,7 @@ def notify_booking_created(booking, cleaners):
     )
     subject = "New Cleaning Request Available"
     
-    results = []
-    for cleaner in cleaners:
-        result = notify_all_channels(cleaner, subject, message)
-        results.append({'cleaner': cleaner.name, **result})
-    
-    return results
+    return notify_users_all_channels(list(cleaners), subject, message)
 
 
 def notify_booking_accepted(booking):
@@ -1,55 +1,52 @@
 import logging
+from functools import partial
 from django.conf import settings
+from .channels import get_channel, send_on_channels
+from .email_outbox import outbox_enabled
 
 logger = logging.getLogger(__name__)
 
 
 def send_sms(to_phone_number, message):
     """
-    SMS notifications disabled - Using email only
+    Send an SMS through the configured SMS_GATEWAY
     
     Args:
         to_phone_number (str): Recipient's phone number
         message (str): SMS message content
         
     Returns:
-        dict: Response indicating SMS is disabled
+        dict: Response with success status or error
     """
-    logger.info(f"SMS disabled. Would have sent to {to_phone_number}: {message}")
-    return {'success': False, 'error': 'SMS notifications disabled - using email only'}
+    return get_channel('sms').send(to_phone_number, message)
 
 
 def send_bulk_sms(phone_numbers, message):
     """
-    SMS notifications disabled - Using email only
+    Send the same SMS to many numbers, batched per SMS_BATCH_SIZE
     
     Args:
         phone_numbers (list): List of phone numbers
         message (str): SMS message content
         
     Returns:
-        dict: Summary indicating SMS is disabled
+        dict: successful numbers and failed ones with their errors
     """
-    logger.info(f"Bulk SMS disabled. Would have sent to {len(phone_numbers)} recipients")
-    return {
-        'successful': [],
-        'failed': [{'error': 'SMS notifications disabled'} for _ in phone_numbers]
-    }
+    return get_channel('sms').send_bulk(phone_numbers, message)
 
 
 def send_whatsapp(to_phone_number, message):
     """
-    WhatsApp notifications disabled - Using email only
+    Send a WhatsApp message through the configured WHATSAPP_GATEWAY
     
     Args:
         to_phone_number (str): Recipient's phone number
         message (str): WhatsApp message content
         
     Returns:
-        dict: Response indicating WhatsApp is disabled
+        dict: Response with success status or error
     """
-    logger.info(f"WhatsApp disabled. Would have sent to {to_phone_number}: {message}")
-    return {'success': False, 'error': 'WhatsApp notifications disabled - using email only'}
+    return get_channel('whatsapp').send(to_phone_number, message)
 
 
 def send_email(to_email, subject, message):
@@ -72,6 +69,11 @@ def send_email(to_email, subject, message):
             logger.warning("Email not sent: Email address is empty")
             return {'success': False, 'error': 'Email address is required'}
         
+        # Queue for the background sender instead of blocking on SMTP
+        from .email_outbox import outbox_enabled, enqueue_email
+        if outbox_enabled():
+            return enqueue_email(to_email, subject, message)
+        
         send_mail(
             subject=subject,
             message=message,
@@ -90,34 +92,77 @@ def send_email(to_email, subject, message):
 
 def notify_all_channels(user, subject, sms_message, email_message=None):
     """
-    Send notification via Email only (SMS/WhatsApp disabled)
+    Send a notification on email, SMS and WhatsApp at the same time
     
     Args:
         user: User object
         subject: Email subject
-        sms_message: Message (not used - kept for compatibility)
+        sms_message: Short message for SMS and WhatsApp (and email when no
+            email_message is given)
         email_message: Email message content
         
     Returns:
-        dict: Results for email channel
+        dict: Response dict for each channel
     """
-    results = {
-        'email': {'success': False}
-    }
+    summaries = notify_users_all_channels([user], subject, sms_message, email_message)
     
-    # Send Email
-    if user.email:
-        results['email'] = send_email(
-            user.email,
-            subject,
-            email_message if email_message else sms_message
-        )
+    results = {}
+    for name in ('email', 'sms', 'whatsapp'):
+        summary = summaries.get(name)
+        if summary is None:
+            results[name] = {'success': False, 'error': 'No recipient address'}
+        elif summary['failed']:
+            results[name] = {'success': False, 'error': summary['failed'][0]['error']}
+        else:
+            results[name] = {'success': True}
     
-    logger.info(f"Email notification sent to user {user.id}: {results['email']['success']}")
+    delivered = [name for name, result in results.items() if result['success']]
+    logger.info(f"Notification sent to user {user.id} via: {', '.join(delivered) or 'no channel'}")
     
     return results
 
 
+def notify_users_all_channels(users, subject, sms_message, email_message=None):
+    """
+    Fan a notification out to many users, one bulk send per channel
+    
+    Channels run in parallel and each batches its own recipients, so the
+    slowest provider sets the total time instead of the sum of all three.
+    
+    Args:
+        users: User objects
+        subject: Email subject
+        sms_message: Short message for SMS and WhatsApp
+        email_message: Email message content
+        
+    Returns:
+        dict: successful/failed summary for each channel with recipients
+    """
+    emails = [user.email for user in users if user.email]
+    phones = [format_phone_number(user.get_phone_number()) for user in users]
+    phones = [phone for phone in phones if phone]
+    
+    recipients = {
+        'email': (emails, email_message or sms_message, subject),
+        'sms': (phones, sms_message, ''),
+        'whatsapp': (phones, sms_message, ''),
+    }
+    
+    sends = {
+        name: partial(get_channel(name).send_bulk, to, body, channel_subject)
+        for name, (to, body, channel_subject) in recipients.items()
+        if to
+    }
+    
+    # Outbox inserts stay on this thread's database connection
+    if 'email' in sends and outbox_enabled():
+        results = {'email': sends.pop('email')()}
+        results.update(send_on_channels(sends))
+        return results
+    
+    return send_on_channels(sends)
+
+
 def format_phone_number(phone_number, country_code='+60'):
     """
     Format phone number to E.164 format
@@ -1,21 +1,31 @@
 from rest_framework import status, generics, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth import authenticate
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Q, Count, Max
 from django.utils import timezone
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 
-from .models import User, StudentProfile, CleanerProfile, Booking, Issue, Notification
+from .models import User, StudentProfile, CleanerProfile, CleanerBlock, Booking, Issue, Notification, NotificationReceipt, NotificationCounter, NotificationPreference
 from .serializers import (
     UserSerializer, StudentRegistrationSerializer, CleanerRegistrationSerializer,
-    BookingSerializer, IssueSerializer, NotificationSerializer,
+    BookingSerializer, BookingRowSerializer, IssueSerializer, NotificationSerializer, NotificationBulkReadSerializer, NotificationPreferenceSerializer,
     StudentProfileSerializer, CleanerProfileSerializer
 )
+from .conditional import conditional_response, etag_response, stats_etag
+from .events import publish_booking_event
+from .pagination import KeysetPagination, QuerysetKeysetPagination, paginated_response
 from .permissions import IsAdmin, IsCleaner, IsStudent, IsOwnerOrAdmin
+from .utils.email_outbox import send_with_transaction
+from .utils.notification_preferences import send_user_email
+from .utils.notification_templates import booking_params
 from .utils.sms import send_sms, send_bulk_sms, format_phone_number, send_whatsapp, send_email, notify_all_channels
 from .utils.email_notifications import (
     send_welcome_email,
@@ -28,6 +38,9 @@ from .utils.email_notifications import (
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT when fanning notifications out to many recipients
+NOTIFICATION_BULK_BATCH_SIZE = 500
+
 
 # ============== AUTH VIEWS ==============
 
@@ -47,8 +60,7 @@ def register_student(request):
         # Create welcome notification
         Notification.objects.create(
             user=user,
-            title="Welcome to AIU Hostel Cleaning Service",
-            message="Your account has been created successfully. You can now book cleaning services for your room."
+            template_key='welcome_student'
         )
         
         # Send HTML welcome email
@@ -84,8 +96,7 @@ def register_cleaner(request):
         # Create welcome notification
         Notification.objects.create(
             user=user,
-            title="Welcome to AIU Hostel Cleaning Service",
-            message="Your cleaner account has been created successfully. You will receive task assignments from admin."
+            template_key='welcome_cleaner'
         )
         
         # Send HTML welcome email
@@ -287,9 +298,11 @@ def reset_password(request):
 class BookingViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing bookings
+    Lists are keyset paginated when the client passes ?limit= or ?cursor=
     """
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = QuerysetKeysetPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -321,40 +334,67 @@ class BookingViewSet(viewsets.ModelViewSet):
         if type_filter:
             queryset = queryset.filter(booking_type=type_filter)
         
-        return queryset.select_related('student', 'assigned_cleaner')
+        return self.get_serializer_class().prepare_queryset(queryset, self.request)
     
-    def perform_create(self, serializer):
-        # Save booking with WAITING_FOR_CLEANER status
-        booking = serializer.save(student=self.request.user, status='WAITING_FOR_CLEANER')
+    def list(self, request, *args, **kwargs):
+        # Polled by the dashboards: answer 304 when nothing changed
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(request, queryset, partial(self.row_list, queryset))
+    
+    def row_list(self, queryset):
+        """
+        Serialize the main list with BookingRowSerializer: the admin list
+        runs to hundreds of rows, and building model instances and running
+        BookingSerializer on each one dominates the response time
+        """
+        rows = BookingRowSerializer.rows(queryset, self.request)
+        context = self.get_serializer_context()
         
-        # Notify ALL active cleaners about the new booking
-        active_cleaners = User.objects.filter(role='CLEANER', is_active=True)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(BookingRowSerializer(rows, context=context).data)
         
-        for cleaner in active_cleaners:
-            # Create in-app notification
+        return self.get_paginated_response(BookingRowSerializer(page, context=context).data)
+    
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            # Save booking with WAITING_FOR_CLEANER status
+            booking = serializer.save(student=self.request.user, status='WAITING_FOR_CLEANER')
+            
+            # Notify the active cleaners covering this block (everyone if nobody covers it)
+            active_cleaners = User.objects.cleaners_for_block(booking.block)
+            
+            # One broadcast in-app notification for the block's cleaners; read
+            # state is tracked per cleaner in NotificationReceipt
             Notification.objects.create(
-                user=cleaner,
-                title="New Cleaning Request Available",
-                message=f"New {booking.get_booking_type_display()} request for {booking.block} - {booking.room_number} on {booking.preferred_date} at {booking.preferred_time}. Be the first to accept!",
+                audience_role='CLEANER',
+                audience_block=booking.block,
+                template_key='booking_available',
+                params=booking_params(booking, 'type', 'block', 'room', 'date', 'time'),
                 notification_type='NEW_BOOKING',
                 booking=booking
             )
-        
-        # Send HTML email notifications to all cleaners
-        email_results = send_booking_created_email(booking, active_cleaners)
-        successful_emails = sum(1 for result in email_results if result.get('success'))
-        logger.info(f"Booking {booking.id} created: {successful_emails}/{len(active_cleaners)} email notifications sent")
-        
-        # Create notification for student
-        Notification.objects.create(
-            user=self.request.user,
-            title="Booking Created Successfully",
-            message=f"Your {booking.get_booking_type_display()} booking for {booking.preferred_date} at {booking.preferred_time} has been created. Waiting for a cleaner to accept.",
-            notification_type='GENERAL',
-            booking=booking
-        )
+            
+            # Create notification for student
+            Notification.objects.create(
+                user=self.request.user,
+                template_key='booking_created',
+                params=booking_params(booking, 'type', 'date', 'time'),
+                notification_type='GENERAL',
+                booking=booking
+            )
+            
+            # Send HTML email notifications to all cleaners with the booking,
+            # unless they are collected into the periodic digest
+            if settings.BOOKING_EMAIL_DIGEST_MINUTES:
+                logger.info(f"Booking {booking.id} created: cleaner emails deferred to the next digest")
+            else:
+                send_with_transaction(partial(send_created_emails, booking, active_cleaners))
+            
+            publish_booking_event('booking.created', booking, active_cleaners)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
+    @transaction.atomic
     def assign_cleaner(self, request, pk=None):
         """
         Admin endpoint to assign a cleaner to a booking
@@ -388,12 +428,15 @@ class BookingViewSet(viewsets.ModelViewSet):
                 notification_type='NEW_BOOKING'
             ).delete()[0]
             logger.info(f"Deleted {deleted_count} pending cleaner notifications for booking {booking.id}")
+            publish_booking_event('booking.claimed', booking, User.objects.cleaners_for_block(booking.block))
+        else:
+            publish_booking_event('booking.status', booking)
         
         # Create notification for student
         Notification.objects.create(
             user=booking.student,
-            title="Cleaner Assigned by Admin",
-            message=f"Admin has assigned cleaner {cleaner.name} to your {booking.get_booking_type_display()} booking for {booking.preferred_date} at {booking.preferred_time}.",
+            template_key='booking_assigned_student',
+            params={'cleaner': cleaner.name, **booking_params(booking, 'type', 'date', 'time')},
             notification_type='BOOKING_ACCEPTED',
             booking=booking
         )
@@ -401,37 +444,14 @@ class BookingViewSet(viewsets.ModelViewSet):
         # Create notification for assigned cleaner
         Notification.objects.create(
             user=cleaner,
-            title="New Task Assigned by Admin",
-            message=f"You have been assigned a {booking.get_booking_type_display()} task for {booking.block} - {booking.room_number} on {booking.preferred_date} at {booking.preferred_time}. This assignment is final.",
+            template_key='booking_assigned_cleaner',
+            params=booking_params(booking, 'type', 'block', 'room', 'date', 'time'),
             notification_type='BOOKING_ACCEPTED',
             booking=booking
         )
         
-        # Send email notification to cleaner
-        try:
-            from .utils.sms import send_email
-            email_result = send_email(
-                cleaner.email,
-                "New Task Assigned - AIU Hostel Cleaning",
-                f"You have been assigned a {booking.get_booking_type_display()} task for {booking.block} - {booking.room_number} on {booking.preferred_date} at {booking.preferred_time}. Please check your dashboard for details."
-            )
-            if email_result['success']:
-                logger.info(f"Assignment email sent to cleaner: {cleaner.email}")
-        except Exception as e:
-            logger.error(f"Failed to send assignment email: {str(e)}")
-        
-        # Send email notification to student
-        try:
-            from .utils.sms import send_email
-            email_result = send_email(
-                booking.student.email,
-                "Cleaner Assigned - AIU Hostel Cleaning",
-                f"A cleaner ({cleaner.name}) has been assigned to your booking for {booking.preferred_date} at {booking.preferred_time}."
-            )
-            if email_result['success']:
-                logger.info(f"Assignment confirmation email sent to student: {booking.student.email}")
-        except Exception as e:
-            logger.error(f"Failed to send student confirmation email: {str(e)}")
+        # Email the cleaner and the student with the assignment
+        send_with_transaction(partial(send_assignment_emails, booking, cleaner))
         
         return Response({
             'message': f'Cleaner {cleaner.name} successfully assigned to booking',
@@ -439,6 +459,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    @transaction.atomic
     def update_status(self, request, pk=None):
         """
         Update booking status (Admin or assigned cleaner)
@@ -462,28 +483,29 @@ class BookingViewSet(viewsets.ModelViewSet):
         booking.status = new_status
         booking.save()
         
+        # An open request leaving the queue must also leave the block's
+        # cleaners' lists and unread counters
+        if old_status == 'WAITING_FOR_CLEANER' and new_status != old_status:
+            Notification.objects.filter(
+                booking=booking,
+                notification_type='NEW_BOOKING'
+            ).delete()
+            publish_booking_event('booking.status', booking, User.objects.cleaners_for_block(booking.block))
+        else:
+            publish_booking_event('booking.status', booking)
+        
         # Create notification for student
         Notification.objects.create(
             user=booking.student,
-            title="Booking Status Updated",
-            message=f"Your booking status has been updated from {old_status} to {new_status}."
+            template_key='booking_status',
+            params={'old': old_status, 'new': new_status},
+            notification_type='BOOKING_STATUS',
+            booking=booking
         )
         
-        # Send HTML email notification if status changed to COMPLETED
-        if new_status == 'COMPLETED':
-            email_result = send_booking_completed_email(booking)
-            if email_result['success']:
-                logger.info(f"Completion email sent for booking {booking.id}")
-            else:
-                logger.warning(f"Failed to send completion email for booking {booking.id}: {email_result.get('error')}")
-        
-        # Send HTML email notification if status changed to IN_PROGRESS
-        elif new_status == 'IN_PROGRESS':
-            email_result = send_booking_in_progress_email(booking)
-            if email_result['success']:
-                logger.info(f"In-progress email sent for booking {booking.id}")
-            else:
-                logger.warning(f"Failed to send in-progress email for booking {booking.id}: {email_result.get('error')}")
+        # Send HTML email notification if status changed to IN_PROGRESS or COMPLETED
+        if new_status in ('IN_PROGRESS', 'COMPLETED'):
+            send_with_transaction(partial(send_status_email, booking))
         
         return Response(BookingSerializer(booking).data)
     
@@ -493,8 +515,7 @@ class BookingViewSet(viewsets.ModelViewSet):
         Get current user's bookings (students only)
         """
         bookings = Booking.objects.filter(student=request.user).order_by('-created_at')
-        serializer = self.get_serializer(bookings, many=True)
-        return Response(serializer.data)
+        return conditional_response(request, bookings, partial(self.paginated_list, bookings))
     
     @action(detail=False, methods=['get'], permission_classes=[IsStudent])
     def history(self, request):
@@ -505,24 +526,46 @@ class BookingViewSet(viewsets.ModelViewSet):
             student=request.user,
             status__in=['COMPLETED', 'CANCELLED']
         ).order_by('-created_at')
-        serializer = self.get_serializer(bookings, many=True)
-        return Response(serializer.data)
+        return self.paginated_list(bookings)
+    
+    def paginated_list(self, queryset):
+        """
+        Serialize a custom list action, paginated the same way as list()
+        """
+        queryset = self.get_serializer_class().prepare_queryset(queryset, self.request)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+        
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
 
 # ============== CLEANER VIEWS ==============
 
+def serialize_bookings(request, bookings):
+    return BookingSerializer(bookings, many=True, context={'request': request}).data
+
+
 @api_view(['GET'])
 @permission_classes([IsCleaner])
 def cleaner_new_requests(request):
     """
     Get new task requests waiting for cleaner acceptance
+    Only bookings in the cleaner's assigned blocks, plus bookings in
+    blocks no active cleaner covers
     """
     tasks = Booking.objects.filter(
         status='WAITING_FOR_CLEANER'
+    ).filter(
+        CleanerBlock.visibility_q(request.user)
     ).order_by('preferred_date', 'preferred_time')
+    tasks = BookingSerializer.prepare_queryset(tasks, request)
     
-    serializer = BookingSerializer(tasks, many=True, context={'request': request})
-    return Response(serializer.data)
+    return conditional_response(
+        request,
+        tasks,
+        partial(paginated_response, request, tasks, partial(serialize_bookings, request))
+    )
 
 
 @api_view(['POST'])
@@ -530,74 +573,142 @@ def cleaner_new_requests(request):
 def accept_booking(request, pk):
     """
     Accept a booking - First come first serve
+    
+    The claim is one conditional UPDATE, committed on its own: whichever
+    cleaner's statement matches the still-unassigned row wins, and everyone
+    else updates zero rows. The notifications follow in a second short
+    transaction, which also queues the email when the outbox is enabled;
+    inline SMTP and the live events go out only after it commits.
     """
-    from django.db import transaction
+    claimed = Booking.objects.filter(
+        pk=pk,
+        status='WAITING_FOR_CLEANER',
+        assigned_cleaner__isnull=True
+    ).update(
+        assigned_cleaner=request.user,
+        status='ASSIGNED',
+        updated_at=timezone.now()
+    )
     
-    try:
-        with transaction.atomic():
-            # Lock the row to prevent race conditions
-            booking = Booking.objects.select_for_update().get(
-                pk=pk,
-                status='WAITING_FOR_CLEANER'
-            )
-            
-            # Check if already assigned (another cleaner was faster)
-            if booking.assigned_cleaner is not None:
-                return Response(
-                    {'error': 'This task has already been accepted by another cleaner'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Assign the booking to current cleaner
-            booking.assigned_cleaner = request.user
-            booking.status = 'ASSIGNED'
-            booking.save()
-            
-            # IMPORTANT: Notify ONLY the student who created this booking
-            # NOT all students - only booking.student
-            logger.info(f"Creating notification for booking owner ONLY: {booking.student.email}")
-            
-            Notification.objects.create(
-                user=booking.student,  # Single student - booking owner
-                title="Cleaner Accepted Your Request",
-                message=f"Cleaner {request.user.name} has accepted your {booking.get_booking_type_display()} request for {booking.preferred_date} at {booking.preferred_time}.",
-                notification_type='BOOKING_ACCEPTED',
-                booking=booking
-            )
-            
-            # Send HTML email notification to ONLY the student who created this booking
-            logger.info(f"Sending acceptance email to booking owner ONLY: {booking.student.email} (Booking ID: {booking.id})")
-            email_result = send_booking_accepted_email(booking)
-            if email_result['success']:
-                logger.info(f"✅ Booking acceptance email sent successfully to {booking.student.email}")
-            else:
-                logger.warning(f"❌ Failed to send acceptance email to {booking.student.email}: {email_result.get('error')}")
-            
-            # Delete notifications for other cleaners
-            Notification.objects.filter(
-                booking=booking,
-                notification_type='NEW_BOOKING'
-            ).exclude(user=request.user).delete()
-            
-            # Update current cleaner's notification to accepted
-            Notification.objects.filter(
-                booking=booking,
-                user=request.user,
-                notification_type='NEW_BOOKING'
-            ).update(
-                title="Task Accepted",
-                message=f"You accepted the {booking.get_booking_type_display()} task for {booking.block} - {booking.room_number}.",
-                is_read=True
-            )
-            
-            serializer = BookingSerializer(booking)
-            return Response(serializer.data)
-            
-    except Booking.DoesNotExist:
+    # Another cleaner was faster, or the booking does not exist
+    if not claimed:
         return Response(
             {'error': 'Booking not found or already accepted'},
             status=status.HTTP_404_NOT_FOUND
         )
+    
+    booking = Booking.objects.select_related('student', 'assigned_cleaner').get(pk=pk)
+    
+    with transaction.atomic():
+        # Competing cleaners drop the request from their list
+        publish_booking_event('booking.claimed', booking, User.objects.cleaners_for_block(booking.block))
+        
+        # IMPORTANT: Notify ONLY the student who created this booking
+        # NOT all students - only booking.student
+        logger.info(f"Creating notification for booking owner ONLY: {booking.student.email}")
+        
+        Notification.objects.create(
+            user=booking.student,  # Single student - booking owner
+            template_key='booking_accepted',
+            params={'cleaner': request.user.name, **booking_params(booking, 'type', 'date', 'time')},
+            notification_type='BOOKING_ACCEPTED',
+            booking=booking
+        )
+        
+        # Remove the new booking broadcast for every cleaner
+        Notification.objects.filter(
+            booking=booking,
+            notification_type='NEW_BOOKING'
+        ).delete()
+        
+        # Keep a record of the accepted task for the current cleaner
+        Notification.objects.create(
+            user=request.user,
+            template_key='task_accepted',
+            params=booking_params(booking, 'type', 'block', 'room'),
+            notification_type='BOOKING_ACCEPTED',
+            booking=booking,
+            is_read=True
+        )
+        
+        # Queued with the notifications, or sent by SMTP once they commit
+        send_with_transaction(partial(send_accepted_email, booking))
+    
+    serializer = BookingSerializer(booking)
+    return Response(serializer.data)
+
+
+def send_created_emails(booking, cleaners):
+    """
+    Send the new-booking email to the block's cleaners
+    """
+    email_results = send_booking_created_email(booking, cleaners)
+    successful_emails = sum(1 for result in email_results if result.get('success'))
+    logger.info(f"Booking {booking.id} created: {successful_emails}/{len(email_results)} email notifications sent")
+
+
+def send_assignment_emails(booking, cleaner):
+    """
+    Email the cleaner an admin assigned and the booking's student
+    """
+    # Send email notification to cleaner
+    try:
+        email_result = send_user_email(
+            cleaner,
+            'BOOKING_ASSIGNED',
+            "New Task Assigned - AIU Hostel Cleaning",
+            f"You have been assigned a {booking.get_booking_type_display()} task for {booking.block} - {booking.room_number} on {booking.preferred_date} at {booking.preferred_time}. Please check your dashboard for details."
+        )
+        if email_result['success']:
+            logger.info(f"Assignment email sent to cleaner: {cleaner.email}")
+    except Exception as e:
+        logger.error(f"Failed to send assignment email: {str(e)}")
+    
+    # Send email notification to student
+    try:
+        email_result = send_user_email(
+            booking.student,
+            'BOOKING_ASSIGNED',
+            "Cleaner Assigned - AIU Hostel Cleaning",
+            f"A cleaner ({cleaner.name}) has been assigned to your booking for {booking.preferred_date} at {booking.preferred_time}."
+        )
+        if email_result['success']:
+            logger.info(f"Assignment confirmation email sent to student: {booking.student.email}")
+    except Exception as e:
+        logger.error(f"Failed to send student confirmation email: {str(e)}")
+
+
+def send_status_email(booking):
+    """
+    Send the HTML email for a booking that moved to IN_PROGRESS or COMPLETED
+    """
+    # Send HTML email notification if status changed to COMPLETED
+    if booking.status == 'COMPLETED':
+        email_result = send_booking_completed_email(booking)
+        if email_result['success']:
+            logger.info(f"Completion email sent for booking {booking.id}")
+        else:
+            logger.warning(f"Failed to send completion email for booking {booking.id}: {email_result.get('error')}")
+    
+    # Send HTML email notification if status changed to IN_PROGRESS
+    elif booking.status == 'IN_PROGRESS':
+        email_result = send_booking_in_progress_email(booking)
+        if email_result['success']:
+            logger.info(f"In-progress email sent for booking {booking.id}")
+        else:
+            logger.warning(f"Failed to send in-progress email for booking {booking.id}: {email_result.get('error')}")
+
+
+def send_accepted_email(booking):
+    """
+    Send the acceptance email to ONLY the student who created this booking
+    """
+    logger.info(f"Sending acceptance email to booking owner ONLY: {booking.student.email} (Booking ID: {booking.id})")
+    email_result = send_booking_accepted_email(booking)
+    if email_result['success']:
+        logger.info(f"✅ Booking acceptance email sent successfully to {booking.student.email}")
+    else:
+        logger.warning(f"❌ Failed to send acceptance email to {booking.student.email}: {email_result.get('error')}")
 
 
 @api_view(['GET'])
@@ -612,6 +723,7 @@ def cleaner_today_tasks(request):
         preferred_date=today,
         status__in=['ASSIGNED', 'IN_PROGRESS']
     ).order_by('preferred_time')
+    tasks = BookingSerializer.prepare_queryset(tasks, request)
     
     serializer = BookingSerializer(tasks, many=True, context={'request': request})
     return Response(serializer.data)
@@ -626,9 +738,9 @@ def cleaner_all_tasks(request):
     tasks = Booking.objects.filter(
         assigned_cleaner=request.user
     ).order_by('-preferred_date', '-preferred_time')
+    tasks = BookingSerializer.prepare_queryset(tasks, request)
     
-    serializer = BookingSerializer(tasks, many=True, context={'request': request})
-    return Response(serializer.data)
+    return paginated_response(request, tasks, partial(serialize_bookings, request))
 
 
 @api_view(['GET'])
@@ -641,9 +753,9 @@ def cleaner_history(request):
         assigned_cleaner=request.user,
         status='COMPLETED'
     ).order_by('-updated_at')
+    tasks = BookingSerializer.prepare_queryset(tasks, request)
     
-    serializer = BookingSerializer(tasks, many=True, context={'request': request})
-    return Response(serializer.data)
+    return paginated_response(request, tasks, partial(serialize_bookings, request))
 
 
 @api_view(['GET'])
@@ -720,21 +832,31 @@ class IssueViewSet(viewsets.ModelViewSet):
             # Students can see issues related to their bookings
             queryset = Issue.objects.filter(booking__student=user)
         
-        return queryset.select_related('booking', 'reported_by')
+        return self.get_serializer_class().prepare_queryset(queryset, self.request)
     
+    @transaction.atomic
     def perform_create(self, serializer):
         issue = serializer.save(reported_by=self.request.user)
         
-        # Create notification for admin (get first admin user)
+        # Create notification for every active admin in batched INSERTs
         admin_users = User.objects.filter(role='ADMIN', is_active=True)
-        for admin in admin_users:
-            Notification.objects.create(
+        params = {
+            'issue_type': issue.get_issue_type_display(),
+            'reporter': self.request.user.name,
+            'booking': issue.booking_id
+        }
+        Notification.objects.bulk_create([
+            Notification(
                 user=admin,
-                title="New Issue Reported",
-                message=f"A {issue.get_issue_type_display()} issue has been reported by {self.request.user.name} for booking #{issue.booking.id}."
+                template_key='issue_reported',
+                params=params
             )
+            for admin in admin_users
+        ], batch_size=NOTIFICATION_BULK_BATCH_SIZE)
+        NotificationCounter.adjust(admin_users, 1)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
+    @transaction.atomic
     def update_status(self, request, pk=None):
         """
         Admin endpoint to update issue status
@@ -753,8 +875,8 @@ class IssueViewSet(viewsets.ModelViewSet):
         # Create notification for reporter
         Notification.objects.create(
             user=issue.reported_by,
-            title="Issue Status Updated",
-            message=f"The {issue.get_issue_type_display()} issue you reported has been updated to {new_status}."
+            template_key='issue_status',
+            params={'issue_type': issue.get_issue_type_display(), 'status': new_status}
         )
         
         return Response(IssueSerializer(issue).data)
@@ -912,38 +1034,219 @@ def admin_payment_receipts(request):
 class NotificationViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing notifications
+    Lists the user's personal notifications merged with the broadcasts
+    addressed to them
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user).order_by('-created_at')
+        queryset = Notification.objects.for_user(self.request.user).order_by('-created_at', '-id')
+        
+        if self.request.query_params.get('unread_only') in ('1', 'true', 'True'):
+            queryset = queryset.filter(read_state=False)
+        
+        return self.get_serializer_class().prepare_queryset(queryset, self.request)
+    
+    def list(self, request, *args, **kwargs):
+        return etag_response(request, self.list_etag(), self.merged_list)
+    
+    def list_etag(self):
+        """
+        ETag from indexed lookups only, so a 304 does not re-evaluate the
+        read state of the user's whole history. Notifications have no
+        updated_at: the unread counter covers read changes and the
+        dismissed receipt count covers dismissals.
+        """
+        user = self.request.user
+        stats = {'unread': NotificationCounter.unread_for(user)}
+        
+        for name, queryset in (
+            ('personal', Notification.objects.filter(user=user)),
+            ('broadcast', Notification.objects.filter(Notification.objects.broadcast_q(user))),
+        ):
+            part = queryset.order_by().aggregate(count=Count('pk'), latest=Max('created_at'))
+            stats.update({f'{name}_{key}': value for key, value in part.items()})
+        
+        stats['dismissed'] = NotificationReceipt.objects.filter(user=user, is_dismissed=True).count()
+        return stats_etag(self.request, stats)
+    
+    def list_querysets(self):
+        """
+        The list as its two disjoint parts, personal rows and broadcasts.
+        The paginator seeks each on its own index and merges the pages;
+        OR-ing them together forces a sort of the user's whole history.
+        """
+        user = self.request.user
+        personal = Notification.objects.personal_for(user)
+        broadcasts = Notification.objects.broadcasts_for(user)
+        
+        if self.request.query_params.get('unread_only') in ('1', 'true', 'True'):
+            personal = personal.filter(is_read=False)
+            broadcasts = broadcasts.filter(read_state=False)
+        
+        serializer_class = self.get_serializer_class()
+        return [serializer_class.prepare_queryset(queryset, self.request) for queryset in (personal, broadcasts)]
+    
+    def merged_list(self):
+        page = self.paginator.paginate_querysets(self.list_querysets(), self.request, view=self)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    def perform_update(self, serializer):
+        notification = serializer.instance
+        if notification.is_broadcast:
+            raise PermissionDenied('Broadcast notifications cannot be edited')
+        
+        was_read = notification.is_read
+        
+        # Write only the submitted columns, not the whole row
+        for field, value in serializer.validated_data.items():
+            setattr(notification, field, value)
+        notification.save(update_fields=list(serializer.validated_data))
+        
+        if notification.is_read != was_read:
+            NotificationCounter.adjust([notification.user_id], -1 if notification.is_read else 1)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Broadcasts are shared, so deleting one only dismisses it for this user
+        if instance.is_broadcast:
+            self.update_receipt(instance, is_dismissed=True)
+        else:
+            instance.delete()
+    
+    def update_receipt(self, notification, **flags):
+        """
+        Set read/dismiss flags on the user's receipt for a broadcast and
+        take it off their unread counter if it was still unread
+        """
+        user = self.request.user
+        receipt, created = NotificationReceipt.objects.get_or_create(
+            notification=notification,
+            user=user,
+            defaults=flags
+        )
+        
+        if created:
+            newly_seen = True
+        else:
+            # Conditional UPDATE so concurrent requests only count once
+            newly_seen = NotificationReceipt.objects.filter(
+                pk=receipt.pk, is_read=False, is_dismissed=False
+            ).update(**flags) > 0
+            if not newly_seen:
+                NotificationReceipt.objects.filter(pk=receipt.pk).update(**flags)
+        
+        if newly_seen:
+            NotificationCounter.adjust([user.id], -1)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def mark_read(self, request, pk=None):
         """
         Mark notification as read
         """
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
-        return Response(NotificationSerializer(notification).data)
+        
+        if notification.is_broadcast:
+            self.update_receipt(notification, is_read=True)
+        elif Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True):
+            NotificationCounter.adjust([request.user.id], -1)
+        
+        notification.is_read = notification.read_state = True
+        return Response(self.get_serializer(notification).data)
+    
+    @action(detail=False, methods=['post'])
+    @transaction.atomic
+    def mark_read_bulk(self, request):
+        """
+        Mark many notifications as read in one request
+        Body: {"ids": [...]} or {"before": "<ISO timestamp>"}
+        """
+        serializer = NotificationBulkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        marked = self.mark_visible_read(serializer.as_q())
+        NotificationCounter.adjust([request.user.id], -marked)
+        
+        return Response({'marked': marked})
     
     @action(detail=False, methods=['post'])
+    @transaction.atomic
     def mark_all_read(self, request):
         """
         Mark all notifications as read
         """
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        # Subtract what this call marked rather than zeroing the counter,
+        # which would also drop notifications created meanwhile
+        marked = self.mark_visible_read(Q())
+        NotificationCounter.adjust([request.user.id], -marked)
+        
         return Response({'message': 'All notifications marked as read'})
     
+    def mark_visible_read(self, selection):
+        """
+        Mark the user's unread notifications matching `selection` as read,
+        with one UPDATE for personal rows and one for broadcast receipts
+        
+        Returns:
+            int: Number of notifications this call changed from unread to
+                read; rows a concurrent request marked first are not counted
+        """
+        user = self.request.user
+        personal = Notification.objects.filter(selection, user=user, is_read=False).update(is_read=True)
+        
+        # Broadcasts: create the missing receipts as unread, then flip them
+        # all with a conditional UPDATE whose row count is the number this
+        # call actually marked
+        unread_broadcasts = list(
+            Notification.objects.for_user(user).filter(
+                selection, user__isnull=True, read_state=False
+            ).values_list('id', flat=True)
+        )
+        NotificationReceipt.objects.bulk_create([
+            NotificationReceipt(notification_id=notification_id, user=user)
+            for notification_id in unread_broadcasts
+        ], ignore_conflicts=True)
+        broadcasts = NotificationReceipt.objects.filter(
+            user=user,
+            notification_id__in=unread_broadcasts,
+            is_read=False,
+            is_dismissed=False
+        ).update(is_read=True)
+        
+        return personal + broadcasts
+    
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """
         Get count of unread notifications
+        Reads the user's maintained counter instead of counting rows
+        """
+        return Response({'count': NotificationCounter.unread_for(request.user)})
+    
+    @action(detail=False, methods=['get', 'put', 'patch'])
+    def preferences(self, request):
         """
-        count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return Response({'count': count})
+        Get or update the user's email preferences and quiet hours
+        """
+        preference, _ = NotificationPreference.objects.get_or_create(user=request.user)
+        
+        if request.method == 'GET':
+            return Response(NotificationPreferenceSerializer(preference).data)
+        
+        serializer = NotificationPreferenceSerializer(
+            preference,
+            data=request.data,
+            partial=request.method == 'PATCH'
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
 
 
 # ============== PROFILE VIEWS ==============
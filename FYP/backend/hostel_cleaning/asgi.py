@@ -2,6 +2,9 @@
 ASGI config for hostel_cleaning project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Live-update endpoints (the SSE event stream and the booking board
+WebSocket) are served by raw ASGI apps from ``api.streams``; everything
+else goes to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +16,29 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hostel_cleaning.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from api.streams import event_stream, booking_board  # noqa: E402
+
+STREAM_ROUTES = {
+    '/api/events/': event_stream,
+}
+
+WEBSOCKET_ROUTES = {
+    '/ws/board/': booking_board,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] in STREAM_ROUTES:
+        return await STREAM_ROUTES[scope['path']](scope, receive, send)
+
+    if scope['type'] == 'websocket':
+        route = WEBSOCKET_ROUTES.get(scope['path'])
+        if route is None:
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        return await route(scope, receive, send)
+
+    return await django_application(scope, receive, send)
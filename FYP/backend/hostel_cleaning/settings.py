@@ -133,6 +133,20 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Keyset pagination for long lists (clients may ask for up to the max via ?page_size=)
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', '20'))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '100'))
+
+# Comment line sent on idle /api/events/ streams so proxies keep them open
+EVENT_STREAM_KEEPALIVE_SECONDS = int(os.environ.get('EVENT_STREAM_KEEPALIVE_SECONDS', '15'))
+
+# Retention for `python manage.py prune_notifications`: read notifications
+# older than NOTIFICATION_RETENTION_DAYS are deleted, and superseded booking
+# status updates older than NOTIFICATION_STATUS_COLLAPSE_DAYS are collapsed
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', '90'))
+NOTIFICATION_STATUS_COLLAPSE_DAYS = int(os.environ.get('NOTIFICATION_STATUS_COLLAPSE_DAYS', '7'))
+NOTIFICATION_PRUNE_BATCH_SIZE = int(os.environ.get('NOTIFICATION_PRUNE_BATCH_SIZE', '1000'))
+
 # =========================
 # JWT
 # =========================
@@ -158,6 +172,48 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 
+# Messages sent per pooled SMTP connection during fan-out
+EMAIL_CONNECTION_BATCH_SIZE = int(os.environ.get('EMAIL_CONNECTION_BATCH_SIZE', '50'))
+
+# Parallel fan-out: concurrent SMTP connections and a process-wide token
+# bucket kept below Gmail's sending limits (0 disables rate limiting)
+EMAIL_DISPATCH_MAX_WORKERS = int(os.environ.get('EMAIL_DISPATCH_MAX_WORKERS', '4'))
+EMAIL_RATE_LIMIT_PER_SECOND = float(os.environ.get('EMAIL_RATE_LIMIT_PER_SECOND', '5'))
+EMAIL_RATE_LIMIT_BURST = int(os.environ.get('EMAIL_RATE_LIMIT_BURST', '20'))
+
+# Collect new-booking emails to cleaners into one digest per window
+# (sent by `python manage.py send_booking_digest --loop`); 0 sends immediately
+BOOKING_EMAIL_DIGEST_MINUTES = int(os.environ.get('BOOKING_EMAIL_DIGEST_MINUTES', '0'))
+
+# Queue emails in the outbox table and deliver them with
+# `python manage.py send_queued_emails --loop` instead of sending inline
+EMAIL_USE_OUTBOX = os.environ.get('EMAIL_USE_OUTBOX', 'False') == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 60
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = 3600
+
+# =========================
+# SMS / WHATSAPP
+# =========================
+# Gateways are dotted paths into api.utils.channels: DisabledGateway (log only),
+# LoopbackGateway (in-memory, for tests), FileGateway (JSON lines written to
+# GATEWAY_FILE_PATH), TwilioGateway / TwilioWhatsAppGateway (needs `twilio`)
+SMS_GATEWAY = os.environ.get('SMS_GATEWAY', 'api.utils.channels.DisabledGateway')
+WHATSAPP_GATEWAY = os.environ.get('WHATSAPP_GATEWAY', 'api.utils.channels.DisabledGateway')
+GATEWAY_FILE_PATH = os.environ.get('GATEWAY_FILE_PATH', str(BASE_DIR / 'sent_messages.log'))
+
+# Messages handed to the gateway per call, and batches sent at the same time
+SMS_BATCH_SIZE = int(os.environ.get('SMS_BATCH_SIZE', '50'))
+SMS_MAX_WORKERS = int(os.environ.get('SMS_MAX_WORKERS', '2'))
+WHATSAPP_BATCH_SIZE = int(os.environ.get('WHATSAPP_BATCH_SIZE', '50'))
+WHATSAPP_MAX_WORKERS = int(os.environ.get('WHATSAPP_MAX_WORKERS', '2'))
+
+TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
+TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
+TWILIO_PHONE_NUMBER = os.environ.get('TWILIO_PHONE_NUMBER')
+TWILIO_WHATSAPP_NUMBER = os.environ.get('TWILIO_WHATSAPP_NUMBER')
+
 # =========================
 # LOGGING
 # =========================
@@ -0,0 +1,136 @@
+"""
+Test the live booking board WebSocket
+"""
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models import User, StudentProfile, CleanerProfile, Booking
+from hostel_cleaning.asgi import application
+from datetime import date, time, timedelta
+
+
+class FakeWebSocket:
+    """Plays the ASGI server side of one WebSocket connection"""
+
+    def __init__(self, user, path='/ws/board/'):
+        token = str(RefreshToken.for_user(user).access_token) if user else 'bogus'
+        self.scope = {'type': 'websocket', 'path': path, 'query_string': f'token={token}'.encode(), 'headers': []}
+        self.incoming = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.incoming.put_nowait({'type': 'websocket.connect'})
+        self.task = asyncio.ensure_future(application(self.scope, self.incoming.get, self.sent.put))
+
+    async def next_sent(self):
+        return await asyncio.wait_for(self.sent.get(), timeout=1)
+
+    async def next_message(self):
+        return json.loads((await self.next_sent())['text'])
+
+    async def close(self):
+        await self.incoming.put({'type': 'websocket.disconnect', 'code': 1000})
+        await asyncio.wait_for(self.task, timeout=1)
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class BookingBoardTestCase(TestCase):
+    """Test board snapshots and diffs for admins and cleaners"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.admin_user = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+
+        self.cleaners = []
+        for name in ('first', 'second'):
+            cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks='25E')
+            self.cleaners.append(cleaner)
+
+        self.waiting = self.create_booking('WAITING_FOR_CLEANER')
+        self.create_booking('COMPLETED')
+        self.client = APIClient()
+
+    def create_booking(self, booking_status):
+        return Booking.objects.create(
+            student=self.student_user,
+            booking_type='STANDARD',
+            preferred_date=date.today() + timedelta(days=1),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status=booking_status
+        )
+
+    def claim(self, cleaner):
+        self.client.force_authenticate(user=cleaner)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/cleaner/bookings/{self.waiting.id}/accept/')
+        self.assertEqual(response.status_code, 200)
+
+    async def test_claim_is_pushed_to_every_board(self):
+        """Test the winner and admins get an upsert, the competing cleaner a removal"""
+        admin = FakeWebSocket(self.admin_user)
+        winner = FakeWebSocket(self.cleaners[0])
+        loser = FakeWebSocket(self.cleaners[1])
+
+        for socket in (admin, winner, loser):
+            self.assertEqual((await socket.next_sent())['type'], 'websocket.accept')
+            snapshot = await socket.next_message()
+            self.assertEqual(snapshot['type'], 'board.snapshot')
+            self.assertEqual([booking['id'] for booking in snapshot['bookings']], [self.waiting.id])
+
+        await sync_to_async(self.claim)(self.cleaners[0])
+
+        admin_diff = await admin.next_message()
+        self.assertEqual(admin_diff['type'], 'board.upsert')
+        self.assertEqual(admin_diff['booking']['status'], 'ASSIGNED')
+        self.assertEqual((await winner.next_message())['type'], 'board.upsert')
+        self.assertEqual((await loser.next_message())['type'], 'board.remove')
+
+        for socket in (admin, winner, loser):
+            await socket.close()
+
+    def cancel(self):
+        self.client.force_authenticate(user=self.student_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/bookings/{self.waiting.id}/update_status/', {'status': 'CANCELLED'})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_cancelled_request_leaves_cleaner_boards(self):
+        """Test a student cancelling an open request removes its card from covering cleaners"""
+        cleaner = FakeWebSocket(self.cleaners[0])
+        self.assertEqual((await cleaner.next_sent())['type'], 'websocket.accept')
+        snapshot = await cleaner.next_message()
+        self.assertEqual([booking['id'] for booking in snapshot['bookings']], [self.waiting.id])
+
+        await sync_to_async(self.cancel)()
+
+        diff = await cleaner.next_message()
+        self.assertEqual(diff['type'], 'board.remove')
+        self.assertEqual(diff['booking']['id'], self.waiting.id)
+
+        await cleaner.close()
+
+    async def test_students_and_bad_tokens_are_refused(self):
+        student = FakeWebSocket(self.student_user)
+        self.assertEqual(await student.next_sent(), {'type': 'websocket.close', 'code': 4403})
+
+        anonymous = FakeWebSocket(None)
+        self.assertEqual(await anonymous.next_sent(), {'type': 'websocket.close', 'code': 4401})
+
+    async def test_unknown_websocket_path_is_closed(self):
+        socket = FakeWebSocket(self.admin_user, path='/ws/nope/')
+        self.assertEqual(await socket.next_sent(), {'type': 'websocket.close', 'code': 4404})
@@ -0,0 +1,109 @@
+"""
+Test the conditional-UPDATE booking claim
+"""
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Booking, Notification, EmailOutbox
+from datetime import date, time, timedelta
+
+
+@override_settings(EMAIL_RATE_LIMIT_PER_SECOND=0)
+class BookingClaimTestCase(TestCase):
+    """Test a booking is claimed exactly once and side effects wait for commit"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.cleaners = []
+        for name in ('first', 'second'):
+            cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks='25E')
+            self.cleaners.append(cleaner)
+
+        self.booking = Booking.objects.create(
+            student=self.student_user,
+            booking_type='STANDARD',
+            preferred_date=date.today() + timedelta(days=1),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status='WAITING_FOR_CLEANER'
+        )
+        self.client = APIClient()
+
+    def claim(self, cleaner):
+        self.client.force_authenticate(user=cleaner)
+        return self.client.post(f'/api/cleaner/bookings/{self.booking.id}/accept/')
+
+    def test_only_the_first_claim_wins(self):
+        """Test the second cleaner's claim matches no row"""
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.claim(self.cleaners[0])
+        second = self.claim(self.cleaners[1])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['status'], 'ASSIGNED')
+        self.assertEqual(second.status_code, 404)
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.assigned_cleaner, self.cleaners[0])
+        self.assertEqual(Notification.objects.filter(template_key='booking_accepted').count(), 1)
+
+    def test_claim_is_a_single_conditional_update(self):
+        """Test the claim is decided in the UPDATE's WHERE clause, not by a locked read"""
+        with CaptureQueriesContext(connection) as queries:
+            self.claim(self.cleaners[0])
+
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "bookings"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"status" = \'WAITING_FOR_CLEANER\'', updates[0])
+        self.assertIn('"assigned_cleaner_id" IS NULL', updates[0])
+        self.assertFalse(any('FOR UPDATE' in query['sql'] for query in queries))
+
+    def test_claim_commits_before_the_notifications(self):
+        """Test the claim UPDATE runs outside the transaction that writes the notifications"""
+        with CaptureQueriesContext(connection) as queries:
+            self.claim(self.cleaners[0])
+
+        sql = [query['sql'] for query in queries]
+        claim = next(i for i, query in enumerate(sql) if query.startswith('UPDATE "bookings"'))
+        notifications = next(i for i, query in enumerate(sql) if query.startswith('INSERT INTO "notifications"'))
+        transaction_start = next(i for i, query in enumerate(sql) if query.startswith('SAVEPOINT'))
+        self.assertLess(claim, transaction_start)
+        self.assertLess(transaction_start, notifications)
+
+    def test_email_is_sent_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.claim(self.cleaners[0])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual([message.to for message in mail.outbox], [['student@test.com']])
+
+    @override_settings(EMAIL_USE_OUTBOX=True)
+    def test_outbox_email_is_queued_with_the_notifications(self):
+        """Test the outbox row is written in the notification transaction, not after it"""
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.claim(self.cleaners[0])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(EmailOutbox.objects.values_list('to_email', flat=True)), ['student@test.com'])
+        self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,86 @@
+"""
+Test digest mode for new-booking emails to cleaners
+"""
+from io import StringIO
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Notification, BookingDigestRun
+from datetime import date, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5, EMAIL_RATE_LIMIT_PER_SECOND=0)
+class BookingDigestTestCase(TestCase):
+    """Test that bursts of bookings produce one email per cleaner per window"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            password='testpass123',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        for i in range(2):
+            cleaner = User.objects.create_user(
+                email=f'cleaner{i}@test.com',
+                name=f'Cleaner {i}',
+                password='testpass123',
+                role='CLEANER'
+            )
+            CleanerProfile.objects.create(
+                user=cleaner,
+                staff_id=f'C00{i}',
+                phone='+60123456789'
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student_user)
+
+    def create_booking(self, preferred_time):
+        return self.client.post('/api/bookings/', {
+            'booking_type': 'STANDARD',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': preferred_time,
+            'block': '25E',
+            'room_number': '25E-04-10',
+        })
+
+    def test_bookings_are_collected_into_one_digest(self):
+        """Test a burst of bookings sends one digest email per cleaner"""
+        self.create_booking('10:00')
+        self.create_booking('11:00')
+        self.create_booking('12:00')
+
+        # In-app notifications stay immediate, emails wait for the digest
+        self.assertEqual(Notification.objects.filter(notification_type='NEW_BOOKING').count(), 3)
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('send_booking_digest', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('3 New Cleaning Requests', mail.outbox[0].subject)
+        self.assertEqual(mail.outbox[0].body.count('Standard Cleaning'), 3)
+
+        run = BookingDigestRun.objects.get()
+        self.assertEqual(run.new_bookings, 3)
+        self.assertEqual(run.recipients, 2)
+
+    def test_no_digest_without_new_bookings(self):
+        """Test an empty window sends nothing"""
+        self.create_booking('10:00')
+        call_command('send_booking_digest', stdout=StringIO())
+        mail.outbox.clear()
+
+        call_command('send_booking_digest', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(BookingDigestRun.objects.count(), 1)
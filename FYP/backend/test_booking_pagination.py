@@ -0,0 +1,92 @@
+"""
+Test keyset pagination on the booking list endpoints
+"""
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, Booking
+from datetime import date, time, timedelta
+
+
+class BookingPaginationTestCase(TestCase):
+    """Test booking lists page with stable cursors and stay arrays by default"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.admin_user = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+        self.cleaner = User.objects.create_user(email='cleaner@test.com', name='Cleaner', role='CLEANER')
+
+        # Pairs of bookings share a timestamp so the id tie-breaker matters
+        created_at = timezone.now()
+        for i in range(7):
+            booking = Booking.objects.create(
+                student=self.student_user,
+                assigned_cleaner=self.cleaner,
+                booking_type='STANDARD',
+                preferred_date=date.today() + timedelta(days=i // 2),
+                preferred_time=time(10, 0),
+                block='25E',
+                room_number='25E-04-10',
+                status='ASSIGNED'
+            )
+            Booking.objects.filter(id=booking.id).update(created_at=created_at - timedelta(minutes=i // 2))
+
+        self.client = APIClient()
+
+    def walk(self, url, limit=3):
+        """Follow `next` links and return the ids of every page"""
+        pages = []
+        response = self.client.get(url, {'limit': limit})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), limit)
+            pages.append([booking['id'] for booking in response.data['results']])
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_admin_list_pages_in_created_order(self):
+        self.client.force_authenticate(user=self.admin_user)
+
+        pages = self.walk('/api/bookings/')
+
+        expected = list(Booking.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_cleaner_tasks_page_on_their_own_ordering(self):
+        self.client.force_authenticate(user=self.cleaner)
+
+        pages = self.walk('/api/cleaner/tasks/all/', limit=2)
+
+        expected = list(
+            Booking.objects.order_by('-preferred_date', '-preferred_time', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_lists_stay_arrays_without_limit(self):
+        """Test existing clients that expect a plain list are unaffected"""
+        self.client.force_authenticate(user=self.student_user)
+
+        response = self.client.get('/api/bookings/my_bookings/')
+
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get('/api/bookings/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
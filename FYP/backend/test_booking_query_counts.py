@@ -0,0 +1,71 @@
+"""
+Test booking list endpoints run a constant number of queries
+"""
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Booking
+from datetime import time, timedelta
+
+
+class BookingQueryCountTestCase(TestCase):
+    """Test student and cleaner lists do not query once per row"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.cleaner = User.objects.create_user(email='cleaner@test.com', name='Cleaner', role='CLEANER')
+        CleanerProfile.objects.create(user=self.cleaner, staff_id='C001', phone='+60123456789', assigned_blocks='25E')
+        self.client = APIClient()
+
+    def add_bookings(self, count):
+        """Add `count` bookings in each state the lists select"""
+        today = timezone.now().date()
+        for _ in range(count):
+            for status, cleaner, day in (
+                ('WAITING_FOR_CLEANER', None, today + timedelta(days=1)),
+                ('ASSIGNED', self.cleaner, today),
+                ('COMPLETED', self.cleaner, today - timedelta(days=1)),
+            ):
+                Booking.objects.create(
+                    student=self.student_user,
+                    assigned_cleaner=cleaner,
+                    booking_type='STANDARD',
+                    preferred_date=day,
+                    preferred_time=time(10, 0),
+                    block='25E',
+                    room_number='25E-04-10',
+                    status=status
+                )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # (user, url, queries); polled lists add one ETag aggregate query
+        endpoints = [
+            (self.student_user, '/api/bookings/my_bookings/', 2),
+            (self.student_user, '/api/bookings/history/', 1),
+            (self.cleaner, '/api/cleaner/tasks/new/', 2),
+            (self.cleaner, '/api/cleaner/tasks/today/', 1),
+            (self.cleaner, '/api/cleaner/tasks/all/', 1),
+            (self.cleaner, '/api/cleaner/history/', 1),
+        ]
+
+        for batch in (1, 5):
+            self.add_bookings(batch)
+            for user, url, queries in endpoints:
+                with self.subTest(url=url, rows_per_status=batch):
+                    self.client.force_authenticate(user=user)
+                    with self.assertNumQueries(queries):
+                        response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response.data)
+                    self.assertEqual(response.data[0]['student_name'], 'Test Student')
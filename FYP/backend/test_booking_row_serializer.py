@@ -0,0 +1,101 @@
+"""
+Test the values_list() fast path for booking lists against BookingSerializer
+"""
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from api.models import User, StudentProfile, Booking
+from api.serializers import BookingSerializer, BookingRowSerializer
+from datetime import date, time, timedelta
+
+
+class BookingRowSerializerTestCase(TestCase):
+    """Test BookingRowSerializer emits byte-identical JSON to BookingSerializer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.admin_user = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+        self.cleaner = User.objects.create_user(email='cleaner@test.com', name='Cleaner', role='CLEANER')
+
+        # One booking per shape: unassigned, assigned with notes, paid with a receipt
+        Booking.objects.create(
+            student=self.student_user,
+            booking_type='STANDARD',
+            preferred_date=date.today() + timedelta(days=1),
+            preferred_time=time(10, 30),
+            block='25E',
+            room_number='25E-04-10',
+            status='WAITING_FOR_CLEANER'
+        )
+        Booking.objects.create(
+            student=self.student_user,
+            assigned_cleaner=self.cleaner,
+            booking_type='DEEP',
+            preferred_date=date.today(),
+            preferred_time=time(14, 0),
+            urgency_level='URGENT',
+            special_instructions='Mind the plants',
+            block='25E',
+            room_number='25E-04-10',
+            status='ASSIGNED'
+        )
+        paid = Booking.objects.create(
+            student=self.student_user,
+            assigned_cleaner=self.cleaner,
+            booking_type='DEEP',
+            preferred_date=date.today() - timedelta(days=3),
+            preferred_time=time(9, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status='COMPLETED',
+            payment_method='ONLINE',
+            payment_status='PAID'
+        )
+        Booking.objects.filter(id=paid.id).update(payment_receipt='payment_receipts/receipt.jpg')
+
+    def render_both(self, params=None):
+        request = Request(APIRequestFactory().get('/api/bookings/', params or {}))
+        queryset = Booking.objects.select_related('student', 'assigned_cleaner')
+
+        expected = BookingSerializer(queryset, many=True, context={'request': request}).data
+        rows = BookingRowSerializer.rows(queryset, request)
+        actual = BookingRowSerializer(rows, context={'request': request}).data
+
+        return JSONRenderer().render(expected), JSONRenderer().render(actual)
+
+    def test_matches_booking_serializer(self):
+        expected, actual = self.render_both()
+
+        self.assertEqual(actual, expected)
+        self.assertIn(b'http://testserver/media/payment_receipts/receipt.jpg', actual)
+
+    def test_matches_sparse_fieldsets(self):
+        for params in ({'fields': 'id,assigned_cleaner_name,price,created_at'}, {'omit': 'student_email,payment_receipt'}):
+            with self.subTest(params=params):
+                expected, actual = self.render_both(params)
+                self.assertEqual(actual, expected)
+
+    def test_list_endpoint_uses_fast_path(self):
+        """Test the list endpoint answers from one query and keeps its shape"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+
+        # ETag aggregate + values_list rows
+        with self.assertNumQueries(2):
+            response = client.get('/api/bookings/')
+
+        request = Request(APIRequestFactory().get('/api/bookings/'))
+        expected = BookingSerializer(Booking.objects.all(), many=True, context={'request': request}).data
+        self.assertEqual(JSONRenderer().render(response.data), JSONRenderer().render(expected))
@@ -0,0 +1,125 @@
+"""
+Test new-booking broadcasts stored as one row with per-cleaner read state
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Notification, NotificationReceipt
+from datetime import date, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class BroadcastNotificationTestCase(TestCase):
+    """Test the new booking broadcast row and its receipts"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.cleaners = [self.create_cleaner(f'cleaner{i}', '25E') for i in range(3)]
+        self.client = APIClient()
+
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.post('/api/bookings/', {
+            'booking_type': 'DEEP',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': '10:00',
+            'block': '25E',
+            'room_number': '25E-04-10',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.booking_id = response.data['id']
+        self.broadcast = Notification.objects.get(booking_id=self.booking_id, notification_type='NEW_BOOKING')
+
+    def create_cleaner(self, name, assigned_blocks):
+        cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+        CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks=assigned_blocks)
+        return cleaner
+
+    def test_booking_creates_single_broadcast_row(self):
+        """Test one row is written however many cleaners are notified"""
+        self.assertIsNone(self.broadcast.user)
+        self.assertEqual(self.broadcast.audience_role, 'CLEANER')
+        self.assertEqual(self.broadcast.audience_block, '25E')
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        response = self.client.get('/api/notifications/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['user'], self.cleaners[0].id)
+        self.assertFalse(response.data['results'][0]['is_read'])
+
+    def test_read_state_is_per_cleaner(self):
+        """Test marking a broadcast read only affects the reader"""
+        self.client.force_authenticate(user=self.cleaners[0])
+        response = self.client.post(f'/api/notifications/{self.broadcast.id}/mark_read/')
+        self.assertTrue(response.data['is_read'])
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['count'], 0)
+
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['count'], 1)
+
+        self.broadcast.refresh_from_db()
+        self.assertFalse(self.broadcast.is_read)
+
+    def test_mark_all_read_covers_broadcasts(self):
+        """Test mark all read writes receipts for unread broadcasts"""
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.client.post('/api/notifications/mark_all_read/')
+        self.client.post('/api/notifications/mark_all_read/')
+
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['count'], 0)
+        self.assertEqual(NotificationReceipt.objects.filter(user=self.cleaners[1]).count(), 1)
+
+    def test_delete_dismisses_broadcast_for_one_cleaner(self):
+        """Test deleting a broadcast hides it without removing the shared row"""
+        self.client.force_authenticate(user=self.cleaners[0])
+        response = self.client.delete(f'/api/notifications/{self.broadcast.id}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get('/api/notifications/').data['results'], [])
+        self.assertTrue(Notification.objects.filter(id=self.broadcast.id).exists())
+
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.assertEqual(len(self.client.get('/api/notifications/').data['results']), 1)
+
+    def test_other_blocks_do_not_see_broadcast(self):
+        """Test cleaners outside the booking's block are not addressed"""
+        outsider = self.create_cleaner('outsider', '30A')
+
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get('/api/notifications/').data['results'], [])
+
+    def test_accept_removes_broadcast_in_constant_queries(self):
+        """Test accepting clears the broadcast for everyone with one delete"""
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.client.post(f'/api/notifications/{self.broadcast.id}/mark_read/')
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/api/cleaner/bookings/{self.booking_id}/accept/')
+        self.assertEqual(response.status_code, 200)
+
+        deletes = [q for q in queries if q['sql'].startswith('DELETE FROM "notifications"')]
+        self.assertEqual(len(deletes), 1)
+        self.assertFalse(Notification.objects.filter(notification_type='NEW_BOOKING').exists())
+        self.assertFalse(NotificationReceipt.objects.exists())
+
+        accepted = Notification.objects.get(user=self.cleaners[0], booking_id=self.booking_id)
+        self.assertEqual(accepted.render()[0], 'Task Accepted')
+        self.assertTrue(accepted.is_read)
+
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.assertEqual(self.client.get('/api/notifications/').data['results'], [])
@@ -0,0 +1,94 @@
+"""
+Test block-targeted cleaner fan-out using the normalized assigned-blocks index
+"""
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, CleanerBlock, Booking
+from datetime import date, time, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class CleanerBlockTargetingTestCase(TestCase):
+    """Test bookings only reach cleaners covering the booking's block"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.east_cleaner = self.create_cleaner('east', ' 25e, 26F ,25E')
+        self.west_cleaner = self.create_cleaner('west', '30A')
+        self.client = APIClient()
+
+    def create_cleaner(self, name, assigned_blocks):
+        cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+        CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks=assigned_blocks)
+        return cleaner
+
+    def create_booking(self, block):
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.post('/api/bookings/', {
+            'booking_type': 'DEEP',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': '10:00',
+            'block': block,
+            'room_number': f'{block}-04-10',
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_assigned_blocks_are_normalized(self):
+        """Test the comma-separated string is split, uppercased and deduplicated"""
+        blocks = CleanerBlock.objects.filter(cleaner__user=self.east_cleaner).values_list('block', flat=True)
+        self.assertEqual(sorted(blocks), ['25E', '26F'])
+
+        profile = self.east_cleaner.cleaner_profile
+        profile.assigned_blocks = '26F'
+        profile.save()
+        self.assertEqual(list(profile.blocks.values_list('block', flat=True)), ['26F'])
+
+    def unread_count(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.get('/api/notifications/unread_count/').data['count']
+
+    def test_booking_notifies_only_covering_cleaners(self):
+        """Test the broadcast reaches only the cleaners covering the booking's block"""
+        self.create_booking('25E')
+
+        self.assertEqual(self.unread_count(self.east_cleaner), 1)
+        self.assertEqual(self.unread_count(self.west_cleaner), 0)
+
+    def test_uncovered_block_falls_back_to_everyone(self):
+        """Test a block nobody covers is broadcast to all active cleaners"""
+        self.create_booking('40Z')
+
+        self.assertEqual(self.unread_count(self.east_cleaner), 1)
+        self.assertEqual(self.unread_count(self.west_cleaner), 1)
+
+    def test_new_requests_are_filtered_by_block(self):
+        """Test cleaners see their blocks plus uncovered blocks"""
+        for block in ('25E', '30A', '40Z'):
+            Booking.objects.create(
+                student=self.student_user,
+                booking_type='DEEP',
+                preferred_date=date.today() + timedelta(days=1),
+                preferred_time=time(10, 0),
+                block=block,
+                room_number=f'{block}-04-10',
+                status='WAITING_FOR_CLEANER'
+            )
+
+        self.client.force_authenticate(user=self.west_cleaner)
+        response = self.client.get('/api/cleaner/tasks/new/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(task['block'] for task in response.data), ['30A', '40Z'])
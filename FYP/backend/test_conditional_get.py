@@ -0,0 +1,111 @@
+"""
+Test ETag / 304 Not Modified on the polled list endpoints
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Booking, Notification, NotificationReceipt
+from datetime import date, time, timedelta
+
+
+class ConditionalGetTestCase(TestCase):
+    """Test unchanged polls are answered without a body"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.cleaner_user = User.objects.create_user(
+            email='cleaner@test.com',
+            name='Test Cleaner',
+            role='CLEANER'
+        )
+        CleanerProfile.objects.create(user=self.cleaner_user, staff_id='C001', phone='+60123456789', assigned_blocks='25E')
+
+        self.booking = self.create_booking(time(10, 0))
+        Notification.objects.create(user=self.student_user, title='Hello', message='Welcome')
+        self.client = APIClient()
+
+    def create_booking(self, preferred_time):
+        return Booking.objects.create(
+            student=self.student_user,
+            booking_type='STANDARD',
+            preferred_date=date.today() + timedelta(days=1),
+            preferred_time=preferred_time,
+            block='25E',
+            room_number='25E-04-10',
+            status='WAITING_FOR_CLEANER'
+        )
+
+    def assert_revalidates(self, user, url, change, queries=1):
+        self.client.force_authenticate(user=user)
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        with self.assertNumQueries(queries):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+        self.assertEqual(cached['ETag'], etag)
+
+        change()
+
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+
+    def test_cleaner_new_requests(self):
+        self.assert_revalidates(self.cleaner_user, '/api/cleaner/tasks/new/', lambda: self.create_booking(time(11, 0)))
+
+    def test_booking_list(self):
+        def cancel():
+            self.booking.status = 'CANCELLED'
+            self.booking.save()
+
+        self.assert_revalidates(self.student_user, '/api/bookings/', cancel)
+
+    def test_my_bookings(self):
+        self.assert_revalidates(self.student_user, '/api/bookings/my_bookings/', lambda: self.create_booking(time(12, 0)))
+
+    def test_notification_list_tracks_read_state(self):
+        def mark_read():
+            self.client.post('/api/notifications/mark_all_read/')
+
+        # Unread counter, personal and broadcast aggregates, dismissed receipts
+        self.assert_revalidates(self.student_user, '/api/notifications/', mark_read, queries=4)
+
+    def test_notification_list_tracks_broadcasts(self):
+        def broadcast():
+            Notification.objects.create(audience_role='STUDENT', title='Water cut', message='Tomorrow 9am')
+
+        self.assert_revalidates(self.student_user, '/api/notifications/', broadcast, queries=4)
+
+    def test_notification_list_tracks_dismissals(self):
+        """Test dismissing an already read broadcast still changes the tag"""
+        notice = Notification.objects.create(audience_role='STUDENT', title='Water cut', message='Tomorrow 9am')
+        NotificationReceipt.objects.create(notification=notice, user=self.student_user, is_read=True)
+
+        def dismiss():
+            self.client.delete(f'/api/notifications/{notice.id}/')
+
+        self.assert_revalidates(self.student_user, '/api/notifications/', dismiss, queries=4)
+
+    def test_etag_is_per_user(self):
+        """Test another user's validator never matches"""
+        self.client.force_authenticate(user=self.student_user)
+        etag = self.client.get('/api/bookings/')['ETag']
+
+        admin = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+        self.client.force_authenticate(user=admin)
+
+        self.assertEqual(self.client.get('/api/bookings/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
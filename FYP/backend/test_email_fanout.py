@@ -0,0 +1,163 @@
+"""
+Test batched email fan-out for new booking broadcasts
+"""
+from time import monotonic
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from api.models import User, StudentProfile, Booking
+from api.utils.email_notifications import (
+    send_booking_created_email, dispatch_html_emails,
+    build_booking_created_messages, render_email, generate_email_html
+)
+from api.utils.email_transport import TokenBucket
+from datetime import date, time
+
+
+class CountingEmailBackend(EmailBackend):
+    """In-memory backend that counts how many connections were opened"""
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return True
+
+
+@override_settings(
+    EMAIL_BACKEND='test_email_fanout.CountingEmailBackend',
+    EMAIL_CONNECTION_BATCH_SIZE=50,
+    EMAIL_DISPATCH_MAX_WORKERS=1,
+    EMAIL_RATE_LIMIT_PER_SECOND=0
+)
+class BookingBroadcastEmailTestCase(TestCase):
+    """Test that broadcast emails share pooled connections"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        CountingEmailBackend.opened = 0
+
+        student = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            password='testpass123',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=student,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.booking = Booking.objects.create(
+            student=student,
+            booking_type='DEEP',
+            preferred_date=date.today(),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status='WAITING_FOR_CLEANER'
+        )
+
+        # Recipients only need a name and email address
+        self.cleaners = [
+            User(email=f'cleaner{i}@test.com', name=f'Cleaner {i}', role='CLEANER')
+            for i in range(30)
+        ]
+
+    def test_broadcast_uses_one_connection_per_batch(self):
+        """Test 30 recipients are delivered over a single connection"""
+        results = send_booking_created_email(self.booking, self.cleaners)
+
+        self.assertEqual(len(results), 30)
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(len(mail.outbox), 30)
+        self.assertEqual(CountingEmailBackend.opened, 1)
+
+    @override_settings(EMAIL_CONNECTION_BATCH_SIZE=10)
+    def test_broadcast_splits_large_fanout_into_batches(self):
+        """Test the fan-out opens one connection per batch"""
+        send_booking_created_email(self.booking, self.cleaners)
+
+        self.assertEqual(CountingEmailBackend.opened, 3)
+
+    def test_results_keep_recipient_order(self):
+        """Test per-recipient results line up with the input list"""
+        results = dispatch_html_emails([
+            {'to_email': 'a@test.com', 'subject': 'A', 'html_content': '<p>A</p>'},
+            {'to_email': '', 'subject': 'B', 'html_content': '<p>B</p>'},
+            {'to_email': 'c@test.com', 'subject': 'C', 'html_content': '<p>C</p>'},
+        ], max_workers=1)
+
+        self.assertEqual([result['success'] for result in results], [True, False, True])
+        self.assertEqual([message.to for message in mail.outbox], [['a@test.com'], ['c@test.com']])
+
+    @override_settings(EMAIL_DISPATCH_MAX_WORKERS=4)
+    def test_parallel_dispatch_bounds_connections(self):
+        """Test the thread pool opens at most one connection per worker"""
+        results = send_booking_created_email(self.booking, self.cleaners)
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(len(mail.outbox), 30)
+        self.assertEqual(CountingEmailBackend.opened, 4)
+
+    @override_settings(EMAIL_RATE_LIMIT_PER_SECOND=50, EMAIL_RATE_LIMIT_BURST=5)
+    def test_dispatch_respects_rate_limit(self):
+        """Test sends beyond the burst are paced by the token bucket"""
+        messages = [
+            {'to_email': f'user{i}@test.com', 'subject': 'Hi', 'html_content': '<p>Hi</p>'}
+            for i in range(15)
+        ]
+
+        started = monotonic()
+        results = dispatch_html_emails(messages, max_workers=3)
+        elapsed = monotonic() - started
+
+        self.assertEqual(len(results), 15)
+        # 5 burst tokens, the remaining 10 refill at 50/s
+        self.assertGreaterEqual(elapsed, 0.18)
+
+
+class TokenBucketTestCase(TestCase):
+    """Test the token bucket used for provider rate limiting"""
+
+    def test_burst_is_immediate_then_paced(self):
+        bucket = TokenBucket(rate=100, capacity=3)
+
+        started = monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertLess(monotonic() - started, 0.01)
+
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(monotonic() - started, 0.045)
+
+
+class EmailRenderingTestCase(TestCase):
+    """Test the precompiled email layout and plain text alternative"""
+
+    def test_fanout_messages_share_body_and_skip_layout_in_text(self):
+        booking = Booking(
+            booking_type='STANDARD',
+            preferred_date=date(2030, 1, 15),
+            preferred_time=time(9, 30),
+            block='25E',
+            room_number='25E-04-10'
+        )
+        cleaners = [User(email=f'c{i}@test.com', name=f'Cleaner {i}') for i in range(3)]
+
+        messages = build_booking_created_messages(booking, cleaners)
+
+        self.assertEqual(len(messages), 3)
+        self.assertIn('<p class="greeting">Dear Cleaner 1,</p>', messages[1]['html_content'])
+        self.assertTrue(messages[1]['text_content'].startswith('Dear Cleaner 1,'))
+        self.assertIn('Location: 25E - 25E-04-10', messages[1]['text_content'])
+        self.assertNotIn('font-family', messages[1]['text_content'])
+
+    def test_render_email_matches_generate_email_html(self):
+        html_content, text_content = render_email('Title', 'Dear A,', ['<p>Hello</p>', '<li>Item</li>'], 'Bye')
+
+        self.assertEqual(html_content, generate_email_html('Title', 'Dear A,', ['<p>Hello</p>', '<li>Item</li>'], 'Bye'))
+        self.assertIn('<title>Title</title>', html_content)
+        self.assertIn('- Item', text_content)
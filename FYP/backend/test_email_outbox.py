@@ -0,0 +1,150 @@
+"""
+Test the durable email outbox and the send_queued_emails worker
+"""
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Booking, EmailOutbox
+from api.utils.email_outbox import process_outbox
+from datetime import date, time, timedelta
+
+
+@override_settings(EMAIL_USE_OUTBOX=True)
+class EmailOutboxTestCase(TestCase):
+    """Test that emails are queued in the request and delivered by the worker"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            password='testpass123',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        for i in range(3):
+            cleaner = User.objects.create_user(
+                email=f'cleaner{i}@test.com',
+                name=f'Cleaner {i}',
+                password='testpass123',
+                role='CLEANER'
+            )
+            CleanerProfile.objects.create(
+                user=cleaner,
+                staff_id=f'C00{i}',
+                phone='+60123456789'
+            )
+
+        self.client = APIClient()
+
+    def create_booking(self, execute=True):
+        self.client.force_authenticate(user=self.student_user)
+        with self.captureOnCommitCallbacks(execute=execute) as self.callbacks:
+            return self.client.post('/api/bookings/', {
+                'booking_type': 'DEEP',
+                'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+                'preferred_time': '10:00',
+                'block': '25E',
+                'room_number': '25E-04-10',
+            })
+
+    def test_booking_creation_queues_instead_of_sending(self):
+        """Test booking creation writes outbox rows and sends nothing inline"""
+        response = self.create_booking()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailOutbox.objects.filter(status='PENDING').count(), 3)
+
+    def test_booking_emails_are_queued_in_the_request_transaction(self):
+        """Test the outbox rows are written before commit, not by an on_commit callback"""
+        response = self.create_booking(execute=False)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(EmailOutbox.objects.filter(status='PENDING').count(), 3)
+
+    def test_failed_booking_rolls_back_its_emails(self):
+        """Test outbox rows disappear with a booking whose transaction fails after enqueueing"""
+        with mock.patch('api.views.publish_booking_event', side_effect=RuntimeError('broker down')):
+            with self.assertRaises(RuntimeError):
+                self.create_booking()
+
+        self.assertFalse(Booking.objects.exists())
+        self.assertEqual(EmailOutbox.objects.count(), 0)
+
+    def test_failed_status_change_rolls_back_its_emails(self):
+        """Test a failure after the emails are queued undoes the booking change and its outbox rows"""
+        admin = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+        cleaner = User.objects.get(email='cleaner0@test.com')
+        waiting, assigned = [
+            Booking.objects.create(
+                student=self.student_user,
+                assigned_cleaner=assigned_cleaner,
+                booking_type='DEEP',
+                preferred_date=date.today() + timedelta(days=1),
+                preferred_time=time(10, 0),
+                block='25E',
+                room_number='25E-04-10',
+                status=booking_status
+            )
+            for assigned_cleaner, booking_status in ((None, 'WAITING_FOR_CLEANER'), (cleaner, 'ASSIGNED'))
+        ]
+        self.client.force_authenticate(user=admin)
+
+        for booking, url, data in (
+            (waiting, f'/api/bookings/{waiting.id}/assign_cleaner/', {'cleaner_id': cleaner.id}),
+            (assigned, f'/api/bookings/{assigned.id}/update_status/', {'status': 'COMPLETED'}),
+        ):
+            with self.subTest(url=url):
+                with mock.patch('api.views.BookingSerializer', side_effect=RuntimeError('serializer broke')):
+                    with self.assertRaises(RuntimeError):
+                        self.client.post(url, data)
+
+                original_status = booking.status
+                booking.refresh_from_db()
+                self.assertEqual(booking.status, original_status)
+                self.assertEqual(EmailOutbox.objects.count(), 0)
+
+    def test_worker_delivers_queued_emails(self):
+        """Test the management command drains the outbox"""
+        self.create_booking()
+
+        call_command('send_queued_emails', stdout=mock.MagicMock())
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(EmailOutbox.objects.filter(status='SENT').count(), 3)
+        self.assertTrue(all(len(message.alternatives) == 1 for message in mail.outbox))
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        """Test a failed send is rescheduled instead of dropped"""
+        entry = EmailOutbox.objects.create(to_email='a@test.com', subject='Hi', text_body='Hello')
+
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=Exception('SMTP down')):
+            summary = process_outbox()
+
+        entry.refresh_from_db()
+        self.assertEqual(summary['retried'], 1)
+        self.assertEqual(entry.status, 'PENDING')
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, 'SMTP down')
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+    def test_exhausted_entry_moves_to_dead_letter(self):
+        """Test an entry that keeps failing ends up in the dead-letter state"""
+        entry = EmailOutbox.objects.create(to_email='a@test.com', subject='Hi', text_body='Hello', attempts=4)
+
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=Exception('SMTP down')):
+            summary = process_outbox(max_attempts=5)
+
+        entry.refresh_from_db()
+        self.assertEqual(summary['dead'], 1)
+        self.assertEqual(entry.status, 'DEAD')
@@ -0,0 +1,210 @@
+"""
+Test live booking events and the Server-Sent Events stream
+"""
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.events import broker
+from api.models import User, StudentProfile, CleanerProfile
+from hostel_cleaning.asgi import application
+from datetime import date, timedelta
+
+
+class EventCollector:
+    """Subscribes on a private event loop and drains what was delivered"""
+
+    def __init__(self, channels):
+        self.loop = asyncio.new_event_loop()
+        self.subscription = self.loop.run_until_complete(self._subscribe(channels))
+
+    async def _subscribe(self, channels):
+        return broker.subscribe(channels)
+
+    async def _drain(self):
+        await asyncio.sleep(0)
+        events = []
+        while not self.subscription.queue.empty():
+            events.append(self.subscription.queue.get_nowait())
+        return events
+
+    def events(self):
+        return self.loop.run_until_complete(self._drain())
+
+    def close(self):
+        broker.unsubscribe(self.subscription)
+        self.loop.close()
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class BookingEventTestCase(TestCase):
+    """Test booking write paths publish to the right users"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.cleaners = []
+        for name, blocks in (('east', '25E'), ('east2', '25E'), ('west', '30A')):
+            cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks=blocks)
+            self.cleaners.append(cleaner)
+
+        self.client = APIClient()
+        self.collectors = {}
+
+    def tearDown(self):
+        for collector in self.collectors.values():
+            collector.close()
+
+    def listen(self, user):
+        self.collectors[user.id] = EventCollector([f'user:{user.id}', f'role:{user.role}'])
+
+    def received(self, user):
+        return [event['type'] for event in self.collectors[user.id].events()]
+
+    def test_create_and_claim_reach_block_cleaners_and_student(self):
+        """Test created/claimed events go to the student and covering cleaners only"""
+        for user in [self.student_user] + self.cleaners:
+            self.listen(user)
+
+        self.client.force_authenticate(user=self.student_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/bookings/', {
+                'booking_type': 'DEEP',
+                'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+                'preferred_time': '10:00',
+                'block': '25E',
+                'room_number': '25E-04-10',
+            })
+        booking_id = response.data['id']
+
+        self.assertEqual(self.received(self.student_user), ['booking.created'])
+        self.assertEqual(self.received(self.cleaners[0]), ['booking.created'])
+        self.assertEqual(self.received(self.cleaners[1]), ['booking.created'])
+        self.assertEqual(self.received(self.cleaners[2]), [])
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/cleaner/bookings/{booking_id}/accept/')
+
+        self.assertEqual(self.received(self.cleaners[1]), ['booking.claimed'])
+        self.assertEqual(self.received(self.student_user), ['booking.claimed'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/bookings/{booking_id}/update_status/', {'status': 'IN_PROGRESS'})
+
+        self.assertEqual(self.received(self.student_user), ['booking.status'])
+        self.assertEqual(self.received(self.cleaners[1]), [])
+
+    def test_cancel_of_open_request_reaches_block_cleaners(self):
+        """Test cancelling a waiting booking clears it from cleaners' lists and unread counts"""
+        self.client.force_authenticate(user=self.student_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/bookings/', {
+                'booking_type': 'DEEP',
+                'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+                'preferred_time': '10:00',
+                'block': '25E',
+                'room_number': '25E-04-10',
+            })
+        booking_id = response.data['id']
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['count'], 1)
+
+        for user in self.cleaners:
+            self.listen(user)
+
+        self.client.force_authenticate(user=self.student_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/bookings/{booking_id}/update_status/', {'status': 'CANCELLED'})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.received(self.cleaners[0]), ['booking.status'])
+        self.assertEqual(self.received(self.cleaners[1]), ['booking.status'])
+        self.assertEqual(self.received(self.cleaners[2]), [])
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        self.assertEqual(self.client.get('/api/notifications/unread_count/').data['count'], 0)
+        self.assertEqual(self.client.get('/api/cleaner/tasks/new/').data, [])
+
+
+class FakeConnection:
+    """Plays the ASGI server side of one HTTP connection"""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = asyncio.Queue()
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send(self, message):
+        await self.sent.put(message)
+
+    async def next_sent(self):
+        return await asyncio.wait_for(self.sent.get(), timeout=1)
+
+
+class EventStreamTestCase(TestCase):
+    """Test the SSE endpoint served from asgi.py"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def scope(self, token):
+        return {
+            'type': 'http',
+            'path': '/api/events/',
+            'query_string': f'token={token}'.encode(),
+            'headers': [(b'origin', b'http://localhost:3000')],
+        }
+
+    async def test_stream_pushes_events_until_disconnect(self):
+        connection = FakeConnection()
+        stream = asyncio.ensure_future(application(self.scope(self.token), connection.receive, connection.send))
+
+        start = await connection.next_sent()
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), start['headers'])
+        self.assertIn((b'access-control-allow-origin', b'http://localhost:3000'), start['headers'])
+        self.assertEqual((await connection.next_sent())['body'], b'retry: 5000\n\n')
+
+        # Views publish from a worker thread
+        delivered = await sync_to_async(broker.publish)(
+            [f'user:{self.user.id}'], {'type': 'booking.status', 'booking': {'id': 7}}
+        )
+        self.assertEqual(delivered, 1)
+
+        chunk = (await connection.next_sent())['body'].decode()
+        self.assertTrue(chunk.startswith('event: booking.status\n'))
+        self.assertEqual(json.loads(chunk.split('data: ')[1])['booking']['id'], 7)
+
+        await connection.incoming.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(stream, timeout=1)
+        self.assertEqual(broker.publish([f'user:{self.user.id}'], {'type': 'noop'}), 0)
+
+    async def test_stream_requires_valid_token(self):
+        connection = FakeConnection()
+        await application(self.scope('bogus'), connection.receive, connection.send)
+
+        self.assertEqual((await connection.next_sent())['status'], 401)
@@ -0,0 +1,111 @@
+"""
+Test marking notifications read in bulk
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, Notification, NotificationReceipt, NotificationCounter
+from datetime import timedelta
+from unittest import mock
+
+
+class NotificationBulkReadTestCase(TestCase):
+    """Test the bulk mark-read endpoint and single-column updates"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cleaner = User.objects.create_user(email='cleaner@test.com', name='Cleaner', role='CLEANER')
+        self.other = User.objects.create_user(email='other@test.com', name='Other', role='CLEANER')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.cleaner)
+
+    def notify(self, days_old=0, **fields):
+        fields.setdefault('user', self.cleaner)
+        notification = Notification.objects.create(title='Notice', message='Hello', **fields)
+        Notification.objects.filter(id=notification.id).update(created_at=timezone.now() - timedelta(days=days_old))
+        return notification
+
+    def unread_count(self):
+        return self.client.get('/api/notifications/unread_count/').data['count']
+
+    def test_mark_ids_read(self):
+        """Test personal rows and broadcasts are marked in one request, other users' rows are untouched"""
+        personal = [self.notify() for _ in range(3)]
+        broadcast = self.notify(user=None, audience_role='CLEANER')
+        foreign = self.notify(user=self.other)
+        self.assertEqual(self.unread_count(), 4)
+
+        response = self.client.post('/api/notifications/mark_read_bulk/', {
+            'ids': [personal[0].id, personal[1].id, broadcast.id, foreign.id]
+        }, format='json')
+
+        self.assertEqual(response.data, {'marked': 3})
+        self.assertEqual(self.unread_count(), 1)
+        self.assertFalse(Notification.objects.get(id=personal[2].id).is_read)
+        self.assertFalse(Notification.objects.get(id=foreign.id).is_read)
+        self.assertTrue(NotificationReceipt.objects.get(notification=broadcast, user=self.cleaner).is_read)
+
+        # Repeating the request changes nothing
+        response = self.client.post('/api/notifications/mark_read_bulk/', {'ids': [personal[0].id]}, format='json')
+        self.assertEqual(response.data, {'marked': 0})
+        self.assertEqual(self.unread_count(), 1)
+
+    def test_concurrently_read_broadcast_is_not_counted_twice(self):
+        """Test a receipt another request marked first is left out of the count"""
+        broadcasts = [self.notify(user=None, audience_role='CLEANER') for _ in range(2)]
+        self.assertEqual(self.unread_count(), 2)
+        bulk_create = NotificationReceipt.objects.bulk_create
+
+        def race(receipts, **kwargs):
+            # The other request reads the first broadcast between our SELECT and INSERT
+            NotificationReceipt.objects.create(notification=broadcasts[0], user=self.cleaner, is_read=True)
+            NotificationCounter.adjust([self.cleaner.id], -1)
+            return bulk_create(receipts, **kwargs)
+
+        with mock.patch.object(NotificationReceipt.objects, 'bulk_create', side_effect=race):
+            response = self.client.post('/api/notifications/mark_read_bulk/', {
+                'ids': [broadcast.id for broadcast in broadcasts]
+            }, format='json')
+
+        self.assertEqual(response.data, {'marked': 1})
+        self.assertEqual(self.unread_count(), 0)
+        self.assertEqual(NotificationReceipt.objects.filter(user=self.cleaner, is_read=True).count(), 2)
+
+    def test_mark_everything_before_timestamp(self):
+        old = [self.notify(days_old=3) for _ in range(2)]
+        recent = self.notify()
+
+        response = self.client.post('/api/notifications/mark_read_bulk/', {
+            'before': (timezone.now() - timedelta(days=1)).isoformat()
+        }, format='json')
+
+        self.assertEqual(response.data, {'marked': 2})
+        self.assertEqual(
+            set(Notification.objects.filter(is_read=True).values_list('id', flat=True)),
+            {notification.id for notification in old}
+        )
+        self.assertFalse(Notification.objects.get(id=recent.id).is_read)
+
+    def test_selection_is_required(self):
+        response = self.client.post('/api/notifications/mark_read_bulk/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/notifications/mark_read_bulk/', {
+            'ids': [1], 'before': timezone.now().isoformat()
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_update_writes_only_is_read(self):
+        """Test PATCH updates the is_read column instead of saving the whole row"""
+        notification = self.notify()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/notifications/{notification.id}/', {'is_read': True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        update = next(query['sql'] for query in queries if query['sql'].startswith('UPDATE "notifications"'))
+        self.assertIn('"is_read"', update)
+        self.assertNotIn('"message"', update)
+        self.assertEqual(self.unread_count(), 0)
@@ -0,0 +1,129 @@
+"""
+Test the pluggable SMS / WhatsApp / email channels
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from django.core import mail
+from django.test import TestCase, override_settings
+from api.models import User, EmailOutbox
+from api.utils import channels
+from api.utils.channels import BaseGateway, Channel, LoopbackGateway
+from api.utils.sms import send_sms, send_bulk_sms, notify_all_channels
+
+# Both text channels must reach the gateway at the same time to get through
+parallel_barrier = threading.Barrier(2, timeout=2)
+
+
+class BarrierGateway(LoopbackGateway):
+    """Only delivers once another channel is sending at the same time"""
+
+    def send_messages(self, messages):
+        parallel_barrier.wait()
+        return super().send_messages(messages)
+
+
+class CountingGateway(BaseGateway):
+    """Records batch sizes and the peak number of batches in flight"""
+
+    def __init__(self, channel):
+        super().__init__(channel)
+        self.lock = threading.Lock()
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def send_messages(self, messages):
+        with self.lock:
+            self.batches.append(len(messages))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+        time.sleep(0.05)
+
+        with self.lock:
+            self.in_flight -= 1
+        return [None if message.to.endswith('1') else 'rejected' for message in messages]
+
+
+@override_settings(
+    SMS_GATEWAY='api.utils.channels.LoopbackGateway',
+    WHATSAPP_GATEWAY='api.utils.channels.LoopbackGateway',
+    SMS_BATCH_SIZE=2
+)
+class NotificationChannelTestCase(TestCase):
+    """Test batching, concurrency limits and parallel fan-out"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        channels.outbox.clear()
+        parallel_barrier.reset()
+        self.user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT',
+            phone_number='+60123456781'
+        )
+
+    def test_bulk_sms_is_batched_within_the_concurrency_limit(self):
+        """Test messages are grouped per batch and no more than max_workers batches run at once"""
+        channel = Channel('sms', CountingGateway, batch_size=3, max_workers=2)
+        numbers = [f'+6012345678{i}' for i in range(10)]
+
+        summary = channel.send_bulk(numbers, 'Hello')
+
+        self.assertEqual(sorted(channel.gateway.batches), [1, 3, 3, 3])
+        self.assertEqual(channel.gateway.peak, 2)
+        self.assertEqual(summary['successful'], ['+60123456781'])
+        self.assertEqual(len(summary['failed']), 9)
+        self.assertEqual(summary['failed'][0], {'to': '+60123456780', 'error': 'rejected'})
+
+    def test_send_sms_uses_the_configured_gateway(self):
+        self.assertEqual(send_sms('+60123456781', 'Hi'), {'success': True})
+
+        summary = send_bulk_sms(['+60111', '+60112', '+60113'], 'Bulk')
+
+        self.assertEqual(summary['successful'], ['+60111', '+60112', '+60113'])
+        self.assertEqual([message.to for _, message in channels.outbox], ['+60123456781', '+60111', '+60112', '+60113'])
+
+    @override_settings(SMS_GATEWAY='api.utils.channels.DisabledGateway')
+    def test_disabled_gateway_reports_failure(self):
+        result = send_sms('+60123456781', 'Hi')
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'sms notifications disabled')
+
+    def test_file_gateway_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'messages.log')
+
+            with self.settings(SMS_GATEWAY='api.utils.channels.FileGateway', GATEWAY_FILE_PATH=path):
+                send_bulk_sms(['+60111', '+60112'], 'Saved')
+
+            with open(path, encoding='utf-8') as handle:
+                lines = [json.loads(line) for line in handle]
+
+        self.assertEqual(lines[0], {'channel': 'sms', 'to': '+60111', 'body': 'Saved', 'subject': ''})
+        self.assertEqual(len(lines), 2)
+
+    @override_settings(
+        SMS_GATEWAY='test_notification_channels.BarrierGateway',
+        WHATSAPP_GATEWAY='test_notification_channels.BarrierGateway'
+    )
+    def test_notify_all_channels_sends_in_parallel(self):
+        """Test SMS and WhatsApp are in flight together rather than one after another"""
+        results = notify_all_channels(self.user, 'Subject', 'Short text', 'Long email text')
+
+        self.assertEqual(results, {'email': {'success': True}, 'sms': {'success': True}, 'whatsapp': {'success': True}})
+        self.assertEqual(sorted(name for name, _ in channels.outbox), ['sms', 'whatsapp'])
+        self.assertEqual(mail.outbox[0].body, 'Long email text')
+
+    @override_settings(EMAIL_USE_OUTBOX=True)
+    def test_notify_all_channels_queues_email_in_the_outbox(self):
+        results = notify_all_channels(self.user, 'Subject', 'Short text')
+
+        self.assertTrue(results['email']['success'])
+        self.assertEqual(EmailOutbox.objects.get().text_body, 'Short text')
+        self.assertEqual(len(mail.outbox), 0)
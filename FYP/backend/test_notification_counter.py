@@ -0,0 +1,143 @@
+"""
+Test the incrementally maintained unread notification counter
+"""
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Notification, NotificationCounter
+from api.views import NotificationViewSet
+from datetime import date, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class NotificationCounterTestCase(TestCase):
+    """Test the unread counter follows every notification write"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        self.cleaners = []
+        for i in range(2):
+            cleaner = User.objects.create_user(email=f'cleaner{i}@test.com', name=f'Cleaner {i}', role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=f'C00{i}', phone='+60123456789', assigned_blocks='25E')
+            self.cleaners.append(cleaner)
+
+        self.client = APIClient()
+
+    def unread_count(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.get('/api/notifications/unread_count/').data['count']
+
+    def notify(self, user, count=1):
+        for i in range(count):
+            Notification.objects.create(user=user, title=f'Notice {i}', message='Hello')
+
+    def create_booking(self):
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.post('/api/bookings/', {
+            'booking_type': 'DEEP',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': '10:00',
+            'block': '25E',
+            'room_number': '25E-04-10',
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_counter_is_initialised_from_history(self):
+        """Test the first read counts existing notifications once"""
+        self.notify(self.student_user, 3)
+        Notification.objects.create(user=self.student_user, title='Old', message='Read', is_read=True)
+
+        self.assertEqual(self.unread_count(self.student_user), 3)
+        self.assertEqual(NotificationCounter.objects.get(user=self.student_user).unread, 3)
+
+    def test_unread_count_does_not_scan_notifications(self):
+        """Test the endpoint is a single-row lookup however long the history"""
+        self.unread_count(self.student_user)
+        self.notify(self.student_user, 25)
+
+        self.client.force_authenticate(user=self.student_user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/notifications/unread_count/')
+        self.assertEqual(response.data['count'], 25)
+
+    def test_read_and_delete_update_counter(self):
+        """Test mark read, mark all read and delete keep the counter exact"""
+        self.unread_count(self.student_user)
+        self.notify(self.student_user, 4)
+        first, second = Notification.objects.filter(user=self.student_user)[:2]
+
+        self.client.post(f'/api/notifications/{first.id}/mark_read/')
+        self.client.post(f'/api/notifications/{first.id}/mark_read/')
+        self.assertEqual(self.unread_count(self.student_user), 3)
+
+        self.client.delete(f'/api/notifications/{second.id}/')
+        self.assertEqual(self.unread_count(self.student_user), 2)
+
+        self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(self.unread_count(self.student_user), 0)
+
+    def test_mark_all_read_keeps_notifications_created_meanwhile(self):
+        """Test a notification arriving between the mark-read UPDATE and the counter write stays counted"""
+        self.unread_count(self.student_user)
+        self.notify(self.student_user, 3)
+        mark_visible_read = NotificationViewSet.mark_visible_read
+
+        def racing_insert(view, selection):
+            marked = mark_visible_read(view, selection)
+            self.notify(self.student_user)
+            return marked
+
+        with mock.patch.object(NotificationViewSet, 'mark_visible_read', autospec=True, side_effect=racing_insert):
+            self.client.post('/api/notifications/mark_all_read/')
+
+        self.assertEqual(self.unread_count(self.student_user), 1)
+        self.assertEqual(NotificationCounter.count_unread(self.student_user), 1)
+
+    def test_broadcast_lifecycle_updates_cleaner_counters(self):
+        """Test booking broadcasts, receipts and accept_booking deletes are counted"""
+        for cleaner in self.cleaners:
+            self.unread_count(cleaner)
+
+        booking_id = self.create_booking()
+        self.assertEqual([self.unread_count(cleaner) for cleaner in self.cleaners], [1, 1])
+
+        broadcast = Notification.objects.get(booking_id=booking_id, notification_type='NEW_BOOKING')
+        self.client.force_authenticate(user=self.cleaners[1])
+        self.client.post(f'/api/notifications/{broadcast.id}/mark_read/')
+        self.client.delete(f'/api/notifications/{broadcast.id}/')
+        self.assertEqual(self.unread_count(self.cleaners[1]), 0)
+
+        self.client.force_authenticate(user=self.cleaners[0])
+        response = self.client.post(f'/api/cleaner/bookings/{booking_id}/accept/')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual([self.unread_count(cleaner) for cleaner in self.cleaners], [0, 0])
+
+    def test_reconcile_repairs_drift(self):
+        """Test the reconcile command resets counters to the real count"""
+        self.notify(self.student_user, 2)
+        self.unread_count(self.student_user)
+        NotificationCounter.objects.filter(user=self.student_user).update(unread=40)
+
+        out = StringIO()
+        call_command('reconcile_notification_counters', '--dry-run', stdout=out)
+        self.assertIn('counter 40, actual 2', out.getvalue())
+        self.assertEqual(NotificationCounter.objects.get(user=self.student_user).unread, 40)
+
+        call_command('reconcile_notification_counters', stdout=StringIO())
+        self.assertEqual(self.unread_count(self.student_user), 2)
@@ -0,0 +1,95 @@
+"""
+Test that notification fan-out uses a constant number of queries
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, Booking, Notification
+from datetime import date, time, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class NotificationFanoutTestCase(TestCase):
+    """Test booking and issue fan-out write notifications in bulk"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.client = APIClient()
+
+    def add_users(self, role, count):
+        start = User.objects.filter(role=role).count()
+        return [
+            User.objects.create_user(email=f'{role.lower()}{start + i}@test.com', name=f'{role} {start + i}', role=role)
+            for i in range(count)
+        ]
+
+    def create_booking(self, preferred_time):
+        self.client.force_authenticate(user=self.student_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/bookings/', {
+                'booking_type': 'DEEP',
+                'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+                'preferred_time': preferred_time,
+                'block': '25E',
+                'room_number': '25E-04-10',
+            })
+        self.assertEqual(response.status_code, 201)
+        return len(queries)
+
+    def test_booking_fanout_query_count_is_constant(self):
+        """Test query count does not grow with the number of cleaners"""
+        self.add_users('CLEANER', 3)
+        few = self.create_booking('10:00')
+
+        self.add_users('CLEANER', 20)
+        many = self.create_booking('11:00')
+
+        self.assertEqual(few, many)
+        # One broadcast row per booking, regardless of how many cleaners see it
+        self.assertEqual(Notification.objects.filter(notification_type='NEW_BOOKING').count(), 2)
+
+    def test_issue_fanout_query_count_is_constant(self):
+        """Test reporting an issue notifies every admin in bulk"""
+        cleaner = self.add_users('CLEANER', 1)[0]
+        booking = Booking.objects.create(
+            student=self.student_user,
+            booking_type='DEEP',
+            preferred_date=date.today(),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status='ASSIGNED',
+            assigned_cleaner=cleaner
+        )
+        self.client.force_authenticate(user=cleaner)
+
+        def report_issue():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/issues/', {
+                    'booking': booking.id,
+                    'issue_type': 'PLUMBING',
+                    'description': 'Leaking tap'
+                })
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        self.add_users('ADMIN', 2)
+        few = report_issue()
+
+        self.add_users('ADMIN', 10)
+        many = report_issue()
+
+        self.assertEqual(few, many)
+        self.assertEqual(Notification.objects.filter(template_key='issue_reported').count(), 2 + 12)
@@ -0,0 +1,108 @@
+"""
+Test keyset pagination and the unread filter on the notification list
+"""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, Notification, NotificationReceipt, NotificationCounter
+
+
+@override_settings(API_PAGE_SIZE=10, API_MAX_PAGE_SIZE=15)
+class NotificationPaginationTestCase(TestCase):
+    """Test walking the notification list page by page"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        Notification.objects.bulk_create([
+            Notification(user=self.user, title=f'Notice {i}', message='Hello', is_read=i % 2 == 0)
+            for i in range(25)
+        ])
+
+        # Half the rows share a timestamp so the id tiebreak is exercised
+        tied = Notification.objects.filter(user=self.user).order_by('id')[:12].values('id')
+        Notification.objects.filter(id__in=tied).update(created_at=timezone.now())
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(notification['id'] for notification in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_pages_cover_every_notification_once_in_order(self):
+        """Test following next links returns all rows newest first"""
+        ids, pages = self.walk('/api/notifications/')
+
+        expected = list(
+            Notification.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_unread_only_filter(self):
+        """Test unread_only returns just the unread notifications"""
+        ids, _ = self.walk('/api/notifications/?unread_only=true&page_size=5')
+
+        self.assertEqual(len(ids), 12)
+        self.assertFalse(Notification.objects.filter(id__in=ids, is_read=True).exists())
+
+    def test_broadcasts_are_merged_into_pages(self):
+        """Test broadcasts interleave with personal rows across page boundaries"""
+        broadcasts = Notification.objects.bulk_create([
+            Notification(audience_role='STUDENT', title=f'Broadcast {i}', message='Hello')
+            for i in range(7)
+        ])
+        NotificationReceipt.objects.create(notification=broadcasts[0], user=self.user, is_read=True)
+        NotificationReceipt.objects.create(notification=broadcasts[1], user=self.user, is_dismissed=True)
+        Notification.objects.create(audience_role='CLEANER', title='Not for students', message='Hello')
+
+        ids, pages = self.walk('/api/notifications/?page_size=4')
+
+        visible = Notification.objects.for_user(self.user).order_by('-created_at', '-id')
+        self.assertEqual(ids, list(visible.values_list('id', flat=True)))
+        self.assertEqual(len(ids), 25 + 6)
+        self.assertEqual(pages, 8)
+
+        unread, _ = self.walk('/api/notifications/?unread_only=true&page_size=4')
+        self.assertEqual(unread, list(visible.filter(read_state=False).values_list('id', flat=True)))
+        self.assertEqual(len(unread), 12 + 5)
+
+    def test_page_size_is_capped(self):
+        """Test clients cannot ask for more than the maximum page size"""
+        response = self.client.get('/api/notifications/?page_size=1000')
+
+        self.assertEqual(len(response.data['results']), 15)
+
+    def test_deep_pages_cost_the_same(self):
+        """Test a later page runs the same queries as the first"""
+        # The ETag reads the unread counter, which is created on first use
+        NotificationCounter.unread_for(self.user)
+
+        with CaptureQueriesContext(connection) as first_queries:
+            first = self.client.get('/api/notifications/')
+
+        with CaptureQueriesContext(connection) as deep_queries:
+            response = self.client.get(first.data['next'])
+
+        self.assertEqual(len(deep_queries), len(first_queries))
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected"""
+        response = self.client.get('/api/notifications/?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, 404)
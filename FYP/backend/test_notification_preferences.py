@@ -0,0 +1,153 @@
+"""
+Test per-user email preferences and quiet-hours batching
+"""
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, CleanerProfile, Booking, EmailOutbox, NotificationPreference
+from api.utils.email_notifications import send_booking_created_email
+from api.utils.email_outbox import process_outbox
+from datetime import date, time, timedelta, datetime
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=0, EMAIL_RATE_LIMIT_PER_SECOND=0)
+class NotificationPreferenceTestCase(TestCase):
+    """Test muted events are skipped and quiet-hours emails are merged"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.admin_user = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+
+        self.cleaners = []
+        for name in ('first', 'second'):
+            cleaner = User.objects.create_user(email=f'{name}@test.com', name=name, role='CLEANER')
+            CleanerProfile.objects.create(user=cleaner, staff_id=name, phone='+60123456789', assigned_blocks='25E')
+            self.cleaners.append(cleaner)
+
+        self.client = APIClient()
+
+    def quiet_now(self, user):
+        """Give the user quiet hours around the current local time"""
+        now = timezone.localtime()
+        return NotificationPreference.objects.create(
+            user=user,
+            quiet_hours_start=(now - timedelta(hours=1)).time(),
+            quiet_hours_end=(now + timedelta(hours=1)).time()
+        )
+
+    def test_muted_event_skips_email(self):
+        """Test a cleaner who muted new requests gets no email; the others still do"""
+        NotificationPreference.objects.create(user=self.cleaners[0], muted_email_events=['NEW_BOOKING'])
+        self.client.force_authenticate(user=self.student_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/bookings/', {
+                'booking_type': 'STANDARD',
+                'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+                'preferred_time': '10:00:00',
+                'block': '25E',
+                'room_number': '25E-04-10'
+            })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([message.to for message in mail.outbox], [['second@test.com']])
+
+    def test_fanout_results_keep_one_entry_per_recipient(self):
+        """Test muted and held cleaners keep their place in the results"""
+        NotificationPreference.objects.create(user=self.cleaners[0], muted_email_events=['NEW_BOOKING'])
+        self.quiet_now(self.cleaners[1])
+        third = User.objects.create_user(email='third@test.com', name='third', role='CLEANER')
+        booking = Booking.objects.create(
+            student=self.student_user,
+            booking_type='STANDARD',
+            preferred_date=date.today() + timedelta(days=1),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10'
+        )
+
+        results = send_booking_created_email(booking, self.cleaners + [third])
+
+        self.assertEqual(results[:2], [{'success': True, 'muted': True}, {'success': True, 'held': True}])
+        self.assertTrue(results[2]['success'])
+        self.assertNotIn('muted', results[2])
+        self.assertEqual([message.to for message in mail.outbox], [['third@test.com']])
+
+    def test_quiet_hours_emails_are_sent_as_one_summary(self):
+        """Test status emails in quiet hours are held, then merged into one email"""
+        self.quiet_now(self.student_user)
+        booking = Booking.objects.create(
+            student=self.student_user,
+            assigned_cleaner=self.cleaners[0],
+            booking_type='STANDARD',
+            preferred_date=date.today(),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status='ASSIGNED'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+        for new_status in ('IN_PROGRESS', 'COMPLETED'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(f'/api/bookings/{booking.id}/update_status/', {'status': new_status})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailOutbox.objects.filter(status='HELD').count(), 2)
+
+        # Nothing goes out before the window ends
+        self.assertEqual(process_outbox()['sent'], 0)
+
+        EmailOutbox.objects.filter(status='HELD').update(next_attempt_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(process_outbox()['sent'], 1)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, '🔔 2 updates from AIU Hostel Cleaning Service')
+        self.assertIn('Cleaning Service In Progress', mail.outbox[0].body)
+        self.assertIn('Cleaning Service Completed!', mail.outbox[0].body)
+        self.assertEqual(EmailOutbox.objects.filter(status='MERGED').count(), 2)
+
+    def test_quiet_hours_wrap_past_midnight(self):
+        preference = NotificationPreference(quiet_hours_start=time(22, 0), quiet_hours_end=time(7, 0))
+        tz = timezone.get_current_timezone()
+
+        late = timezone.make_aware(datetime(2025, 3, 1, 23, 30), tz)
+        early = timezone.make_aware(datetime(2025, 3, 2, 6, 0), tz)
+        midday = timezone.make_aware(datetime(2025, 3, 2, 12, 0), tz)
+
+        self.assertEqual(preference.quiet_until(late), timezone.make_aware(datetime(2025, 3, 2, 7, 0), tz))
+        self.assertEqual(preference.quiet_until(early), timezone.make_aware(datetime(2025, 3, 2, 7, 0), tz))
+        self.assertIsNone(preference.quiet_until(midday))
+
+    def test_preferences_endpoint(self):
+        self.client.force_authenticate(user=self.student_user)
+
+        response = self.client.get('/api/notifications/preferences/')
+        self.assertEqual(response.data['muted_email_events'], [])
+
+        response = self.client.patch('/api/notifications/preferences/', {
+            'muted_email_events': ['BOOKING_STATUS', 'PAYMENT', 'PAYMENT'],
+            'quiet_hours_start': '22:00',
+            'quiet_hours_end': '07:00'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['muted_email_events'], ['BOOKING_STATUS', 'PAYMENT'])
+
+        response = self.client.patch('/api/notifications/preferences/', {'quiet_hours_end': None}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch('/api/notifications/preferences/', {'muted_email_events': ['NOPE']}, format='json')
+        self.assertEqual(response.status_code, 400)
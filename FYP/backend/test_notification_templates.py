@@ -0,0 +1,72 @@
+"""
+Test template-based notification storage
+"""
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, Notification
+from api.utils.notification_templates import _render, render_notification
+from datetime import date, timedelta
+
+
+@override_settings(BOOKING_EMAIL_DIGEST_MINUTES=5)
+class NotificationTemplateTestCase(TestCase):
+    """Test notifications are stored compactly and render the same text"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student_user)
+
+    def test_booking_notification_renders_legacy_text(self):
+        """Test the API output matches the text that used to be stored"""
+        preferred_date = date.today() + timedelta(days=1)
+        response = self.client.post('/api/bookings/', {
+            'booking_type': 'STANDARD',
+            'preferred_date': preferred_date.isoformat(),
+            'preferred_time': '10:00:00',
+            'block': '25E',
+            'room_number': '25E-04-10'
+        })
+        self.assertEqual(response.status_code, 201)
+
+        stored = Notification.objects.get(user=self.student_user, template_key='booking_created')
+        self.assertEqual((stored.title, stored.message), ('', ''))
+        self.assertEqual(stored.params['type'], 'Standard Cleaning')
+
+        results = self.client.get('/api/notifications/').data['results']
+        created = next(item for item in results if item['title'] == 'Booking Created Successfully')
+        self.assertEqual(
+            created['message'],
+            f"Your Standard Cleaning booking for {preferred_date} at 10:00:00 has been created. "
+            "Waiting for a cleaner to accept."
+        )
+
+    def test_legacy_rows_keep_stored_text(self):
+        """Test rows written before templates still show their own text"""
+        Notification.objects.create(user=self.student_user, title='Old title', message='Old message')
+
+        item = self.client.get('/api/notifications/').data['results'][0]
+
+        self.assertEqual((item['title'], item['message']), ('Old title', 'Old message'))
+
+    def test_repeated_renders_hit_the_cache(self):
+        _render.cache_clear()
+        params = {'old': 'ASSIGNED', 'new': 'COMPLETED'}
+
+        first = render_notification('booking_status', params)
+        second = render_notification('booking_status', dict(reversed(list(params.items()))))
+
+        self.assertEqual(first, second)
+        self.assertEqual(_render.cache_info().hits, 1)
+        self.assertIsNone(render_notification('missing', params))
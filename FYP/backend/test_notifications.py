@@ -3,7 +3,7 @@ Test script for multi-channel notifications (SMS, WhatsApp, Email)
 
 This script tests the notification system without requiring actual Twilio credentials.
 In development mode, emails will print to console.
-SMS and WhatsApp will log warnings about missing Twilio credentials.
+SMS and WhatsApp go to the configured gateways (log only by default).
 
 To run: python manage.py shell < test_notifications.py
 """
@@ -85,11 +85,14 @@ print("TESTING COMPLETE")
 print("="*60)
 print("\nNOTES:")
 print("✅ Email: Should print to console in development mode")
-print("⚠️  SMS: Will show warning 'Twilio credentials not configured'")
-print("⚠️  WhatsApp: Will show warning 'Twilio WhatsApp credentials not configured'")
+print("⚠️  SMS: Disabled unless SMS_GATEWAY is set")
+print("⚠️  WhatsApp: Disabled unless WHATSAPP_GATEWAY is set")
 print("\nTo enable SMS and WhatsApp:")
 print("1. Install Twilio: pip install twilio")
-print("2. Set environment variables:")
+print("2. Set SMS_GATEWAY=api.utils.channels.TwilioGateway and")
+print("   WHATSAPP_GATEWAY=api.utils.channels.TwilioWhatsAppGateway")
+print("   (or api.utils.channels.FileGateway to write messages to a local file)")
+print("3. Set environment variables:")
 print("   - TWILIO_ACCOUNT_SID")
 print("   - TWILIO_AUTH_TOKEN")
 print("   - TWILIO_PHONE_NUMBER")
@@ -0,0 +1,91 @@
+"""
+Test the notification retention command
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from api.models import User, Booking, Notification, NotificationReceipt
+from datetime import date, time, timedelta
+
+
+class PruneNotificationsTestCase(TestCase):
+    """Test each retention policy and batching"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        self.booking = self.create_booking('IN_PROGRESS')
+
+    def create_booking(self, booking_status):
+        return Booking.objects.create(
+            student=self.user,
+            booking_type='STANDARD',
+            preferred_date=date.today(),
+            preferred_time=time(10, 0),
+            block='25E',
+            room_number='25E-04-10',
+            status=booking_status
+        )
+
+    def notify(self, days_old, **fields):
+        fields.setdefault('user', self.user)
+        notification = Notification.objects.create(title='Notice', message='Hello', **fields)
+        Notification.objects.filter(id=notification.id).update(created_at=timezone.now() - timedelta(days=days_old))
+        return notification
+
+    def prune(self, *args):
+        out = StringIO()
+        call_command('prune_notifications', *args, stdout=out)
+        return out.getvalue()
+
+    def test_old_read_notifications_are_removed(self):
+        """Test only read rows past the retention window go"""
+        old_read = [self.notify(120, is_read=True) for _ in range(5)]
+        old_unread = self.notify(120)
+        recent_read = self.notify(10, is_read=True)
+
+        output = self.prune('--batch-size', '2')
+
+        self.assertFalse(Notification.objects.filter(id__in=[n.id for n in old_read]).exists())
+        self.assertTrue(Notification.objects.filter(id=old_unread.id).exists())
+        self.assertTrue(Notification.objects.filter(id=recent_read.id).exists())
+        self.assertIn('Read notifications older than 90 days: 5', output)
+        self.assertIn('Removed 5 notifications in', output)
+
+    def test_status_updates_collapse_to_latest_per_booking(self):
+        """Test superseded status updates are collapsed per booking"""
+        other_booking = self.create_booking('COMPLETED')
+        updates = [self.notify(days, notification_type='BOOKING_STATUS', booking=self.booking) for days in (30, 20, 10)]
+        only_update = self.notify(30, notification_type='BOOKING_STATUS', booking=other_booking)
+
+        self.prune()
+
+        remaining = set(Notification.objects.filter(notification_type='BOOKING_STATUS').values_list('id', flat=True))
+        self.assertEqual(remaining, {updates[-1].id, only_update.id})
+
+    def test_broadcasts_for_closed_bookings_are_removed(self):
+        """Test a cancelled booking's broadcast and its receipts are cleaned up"""
+        cancelled = self.create_booking('CANCELLED')
+        open_booking = self.create_booking('WAITING_FOR_CLEANER')
+        stale = self.notify(1, user=None, audience_role='CLEANER', notification_type='NEW_BOOKING', booking=cancelled)
+        live = self.notify(1, user=None, audience_role='CLEANER', notification_type='NEW_BOOKING', booking=open_booking)
+        NotificationReceipt.objects.create(notification=stale, user=self.user, is_read=True)
+
+        self.prune()
+
+        self.assertFalse(Notification.objects.filter(id=stale.id).exists())
+        self.assertTrue(Notification.objects.filter(id=live.id).exists())
+        self.assertFalse(NotificationReceipt.objects.exists())
+
+    def test_dry_run_deletes_nothing(self):
+        self.notify(120, is_read=True)
+
+        output = self.prune('--dry-run')
+
+        self.assertIn('Would remove 1 notifications', output)
+        self.assertEqual(Notification.objects.count(), 1)
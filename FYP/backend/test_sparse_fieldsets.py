@@ -0,0 +1,132 @@
+"""
+Test ?fields= / ?omit= sparse fieldsets on list endpoints
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from api.models import User, StudentProfile, Booking, Issue, Notification
+from datetime import date, time, timedelta
+
+
+class SparseFieldsetTestCase(TestCase):
+    """Test unrequested fields are dropped from the payload and the query"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.student_user = User.objects.create_user(
+            email='student@test.com',
+            name='Test Student',
+            role='STUDENT'
+        )
+        StudentProfile.objects.create(
+            user=self.student_user,
+            student_id='AIU12345678',
+            block='25E',
+            room_number='25E-04-10'
+        )
+        self.admin_user = User.objects.create_user(email='admin@test.com', name='Admin', role='ADMIN')
+        self.cleaner = User.objects.create_user(email='cleaner@test.com', name='Cleaner', role='CLEANER')
+
+        self.bookings = [
+            Booking.objects.create(
+                student=self.student_user,
+                assigned_cleaner=self.cleaner,
+                booking_type='DEEP',
+                preferred_date=date.today() + timedelta(days=i),
+                preferred_time=time(10, 0),
+                block='25E',
+                room_number='25E-04-10',
+                special_instructions='Mind the plants',
+                status='ASSIGNED'
+            )
+            for i in range(3)
+        ]
+        self.client = APIClient()
+
+    def booking_select(self, queries):
+        return next(query['sql'] for query in queries if query['sql'].startswith('SELECT "bookings"."id"'))
+
+    def test_fields_limits_payload_and_columns(self):
+        self.client.force_authenticate(user=self.admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/bookings/', {'fields': 'id,status,price'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data[0],
+            {'id': self.bookings[-1].id, 'status': 'ASSIGNED', 'price': 30}
+        )
+        select = self.booking_select(queries)
+        self.assertIn('"booking_type"', select)
+        self.assertNotIn('"special_instructions"', select)
+        self.assertNotIn('JOIN', select)
+
+    def test_related_fields_keep_their_join(self):
+        """Test student_name is read through the existing join, not one query per row"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/bookings/', {'fields': 'id,student_name'})
+
+        self.assertEqual([row['student_name'] for row in response.data], ['Test Student'] * 3)
+        select = self.booking_select(queries)
+        self.assertIn('JOIN "users"', select)
+        self.assertNotIn('"email"', select)
+        self.assertFalse(any(query['sql'].startswith('SELECT "users"') for query in queries))
+
+    def test_omit_drops_fields(self):
+        self.client.force_authenticate(user=self.student_user)
+
+        response = self.client.get('/api/bookings/my_bookings/', {'omit': 'special_instructions,payment_receipt_url'})
+
+        self.assertNotIn('special_instructions', response.data[0])
+        self.assertNotIn('payment_receipt_url', response.data[0])
+        self.assertIn('student_email', response.data[0])
+
+    def test_sparse_pages_keep_their_cursor(self):
+        self.client.force_authenticate(user=self.cleaner)
+
+        response = self.client.get('/api/cleaner/tasks/all/', {'fields': 'id', 'limit': 2})
+        rest = self.client.get(response.data['next'])
+
+        self.assertEqual(response.data['results'], [{'id': self.bookings[2].id}, {'id': self.bookings[1].id}])
+        self.assertEqual(rest.data['results'], [{'id': self.bookings[0].id}])
+
+    def test_writes_ignore_fields(self):
+        """Test ?fields= on a POST neither drops input fields nor trims the response"""
+        self.client.force_authenticate(user=self.student_user)
+
+        response = self.client.post('/api/bookings/?fields=id', {
+            'booking_type': 'STANDARD',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': '10:00:00',
+            'block': '25E',
+            'room_number': '25E-04-10'
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('booking_type', response.data)
+
+    def test_issue_and_notification_fields(self):
+        Issue.objects.create(
+            booking=self.bookings[0],
+            reported_by=self.cleaner,
+            issue_type='PLUMBING',
+            description='Leaking tap'
+        )
+        Notification.objects.create(
+            user=self.cleaner,
+            template_key='issue_reported',
+            params={'issue_type': 'Plumbing', 'reporter': 'Cleaner', 'booking': self.bookings[0].id}
+        )
+        self.client.force_authenticate(user=self.cleaner)
+
+        issues = self.client.get('/api/issues/', {'fields': 'id,booking_details'})
+        notifications = self.client.get('/api/notifications/', {'fields': 'title,is_read'})
+
+        self.assertEqual(set(issues.data[0]), {'id', 'booking_details'})
+        self.assertEqual(issues.data[0]['booking_details']['room_number'], '25E-04-10')
+        self.assertEqual(set(notifications.data['results'][0]), {'title', 'is_read'})
+        self.assertTrue(notifications.data['results'][0]['title'])
@@ -76,8 +76,9 @@ export const bookingAPI = {
     api.post(`/bookings/${id}/assign_cleaner/`, { cleaner_id: cleanerId }),
   updateStatus: (id, status) =>
     api.post(`/bookings/${id}/update_status/`, { status }),
-  myBookings: () => api.get('/bookings/my_bookings/'),
-  history: () => api.get('/bookings/history/'),
+  // Booking lists return { next, results } pages when given { limit } or { cursor }
+  myBookings: (params) => api.get('/bookings/my_bookings/', { params }),
+  history: (params) => api.get('/bookings/history/', { params }),
   acceptBooking: (id) => api.post(`/cleaner/bookings/${id}/accept/`),
 
   markOfflinePayment: (id) =>
@@ -91,10 +92,10 @@ export const bookingAPI = {
 
 // ================= CLEANER APIs =================
 export const cleanerAPI = {
-  newRequests: () => api.get('/cleaner/tasks/new/'),
+  newRequests: (params) => api.get('/cleaner/tasks/new/', { params }),
   todayTasks: () => api.get('/cleaner/tasks/today/'),
-  allTasks: () => api.get('/cleaner/tasks/all/'),
-  history: () => api.get('/cleaner/history/'),
+  allTasks: (params) => api.get('/cleaner/tasks/all/', { params }),
+  history: (params) => api.get('/cleaner/history/', { params }),
   stats: () => api.get('/cleaner/stats/'),
 };
 
@@ -119,10 +120,15 @@ export const adminAPI = {
 
 // ================= NOTIFICATION APIs =================
 export const notificationAPI = {
-  list: () => api.get('/notifications/'),
+  // Keyset paginated: pass { cursor } from the previous page's `next` link
+  list: (params) => api.get('/notifications/', { params }),
   markRead: (id) => api.post(`/notifications/${id}/mark_read/`),
+  // { ids: [...] } or { before: <ISO timestamp> }
+  markReadBulk: (data) => api.post('/notifications/mark_read_bulk/', data),
   markAllRead: () => api.post('/notifications/mark_all_read/'),
   unreadCount: () => api.get('/notifications/unread_count/'),
+  getPreferences: () => api.get('/notifications/preferences/'),
+  updatePreferences: (data) => api.patch('/notifications/preferences/', data),
 };
 
 // ================= PROFILE APIs =================
@@ -133,4 +139,47 @@ export const profileAPI = {
   updateCleaner: (data) => api.put('/profile/cleaner/', data),
 };
 
+// ================= LIVE EVENTS =================
+// Calls onEvent(event) for each pushed event of the given types, and
+// onEvent(null) after a reconnect so the page can catch up. Falls back to
+// polling every fallbackMs if the stream is refused (e.g. expired token).
+// Returns a cleanup function for useEffect.
+export const subscribeToEvents = (eventTypes, onEvent, fallbackMs) => {
+  const token = localStorage.getItem('access_token');
+  const source = new EventSource(`${API_BASE_URL}/events/?token=${encodeURIComponent(token || '')}`);
+  let opened = false;
+  let fallback = null;
+
+  eventTypes.forEach((type) =>
+    source.addEventListener(type, (e) => onEvent(JSON.parse(e.data)))
+  );
+
+  source.onopen = () => {
+    if (opened) onEvent(null);
+    opened = true;
+  };
+
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED && !fallback) {
+      fallback = setInterval(() => onEvent(null), fallbackMs);
+    }
+  };
+
+  return () => {
+    source.close();
+    clearInterval(fallback);
+  };
+};
+
+// Live booking board for admins and cleaners: onMessage receives
+// board.snapshot, then board.upsert / board.remove diffs. Returns the socket.
+export const openBookingBoard = (onMessage) => {
+  const token = localStorage.getItem('access_token');
+  const wsBase = API_BASE_URL.replace(/^http/, 'ws').replace(/\/api$/, '');
+  const socket = new WebSocket(`${wsBase}/ws/board/?token=${encodeURIComponent(token || '')}`);
+
+  socket.onmessage = (e) => onMessage(JSON.parse(e.data));
+  return socket;
+};
+
 export default api;
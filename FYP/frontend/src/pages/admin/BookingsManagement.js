@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import DashboardSidebar from '../../components/DashboardSidebar';
 import LoadingSpinner from '../../components/LoadingSpinner';
 import Toast from '../../components/Toast';
-import { bookingAPI, adminAPI } from '../../api/api';
+import { bookingAPI, adminAPI, openBookingBoard } from '../../api/api';
 
 const BookingsManagement = () => {
   const [bookings, setBookings] = useState([]);
@@ -28,8 +28,25 @@ const BookingsManagement = () => {
   useEffect(() => {
     fetchBookings();
     fetchCleaners();
+
+    // Apply live changes from the booking board instead of refetching the list
+    const board = openBookingBoard((message) => {
+      if (message.type !== 'board.snapshot') {
+        upsertBooking(message.booking);
+      }
+    });
+
+    return () => board.close();
   }, []);
 
+  const upsertBooking = (booking) => {
+    setBookings((current) =>
+      current.some(b => b.id === booking.id)
+        ? current.map(b => (b.id === booking.id ? booking : b))
+        : [booking, ...current]
+    );
+  };
+
   const fetchBookings = async () => {
     try {
       const response = await bookingAPI.list();
@@ -63,12 +80,12 @@ const BookingsManagement = () => {
     }
 
     try {
-      await bookingAPI.assignCleaner(selectedBooking.id, selectedCleaner);
+      const response = await bookingAPI.assignCleaner(selectedBooking.id, selectedCleaner);
       setToast({ message: 'Cleaner assigned successfully', type: 'success' });
       setShowAssignModal(false);
       setSelectedBooking(null);
       setSelectedCleaner('');
-      fetchBookings();
+      upsertBooking(response.data.booking);
     } catch (error) {
       console.error('Error assigning cleaner:', error);
       setToast({ message: 'Failed to assign cleaner', type: 'error' });
@@ -77,9 +94,9 @@ const BookingsManagement = () => {
 
   const handleStatusUpdate = async (bookingId, newStatus) => {
     try {
-      await bookingAPI.updateStatus(bookingId, newStatus);
+      const response = await bookingAPI.updateStatus(bookingId, newStatus);
       setToast({ message: 'Status updated successfully', type: 'success' });
-      fetchBookings();
+      upsertBooking(response.data);
     } catch (error) {
       console.error('Error updating status:', error);
       setToast({ message: 'Failed to update status', type: 'error' });
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import DashboardSidebar from '../../components/DashboardSidebar';
 import LoadingSpinner from '../../components/LoadingSpinner';
 import Toast from '../../components/Toast';
-import { cleanerAPI, bookingAPI } from '../../api/api';
+import { cleanerAPI, bookingAPI, subscribeToEvents } from '../../api/api';
 
 const NewRequests = () => {
   const [requests, setRequests] = useState([]);
@@ -36,9 +36,9 @@ const NewRequests = () => {
 
   useEffect(() => {
     fetchNewRequests();
-    const interval = setInterval(fetchNewRequests, 15000);
 
-    return () => clearInterval(interval);
+    // Refetch when the server reports a change instead of polling
+    return subscribeToEvents(['booking.created', 'booking.claimed'], fetchNewRequests, 15000);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
@@ -4,7 +4,7 @@ import LoadingSpinner from '../../components/LoadingSpinner';
 import Toast from '../../components/Toast';
 import Modal from '../../components/Modal';
 import PaymentSection from '../../components/PaymentSection';
-import { bookingAPI } from '../../api/api';
+import { bookingAPI, subscribeToEvents } from '../../api/api';
 
 const MyBookings = () => {
   const [bookings, setBookings] = useState([]);
@@ -41,9 +41,9 @@ const MyBookings = () => {
 
   useEffect(() => {
     fetchBookings();
-    const interval = setInterval(fetchBookings, 20000);
 
-    return () => clearInterval(interval);
+    // Refetch when the server reports a change instead of polling
+    return subscribeToEvents(['booking.claimed', 'booking.status'], fetchBookings, 20000);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import DashboardSidebar from '../../components/DashboardSidebar';
 import LoadingSpinner from '../../components/LoadingSpinner';
 import Toast from '../../components/Toast';
@@ -6,8 +6,14 @@ import { notificationAPI } from '../../api/api';
 
 const Notifications = () => {
   const [notifications, setNotifications] = useState([]);
+  const [unreadCount, setUnreadCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [toast, setToast] = useState(null);
+  // Clicks are collected and sent as one bulk request
+  const pendingReads = useRef(new Set());
+  const flushTimer = useRef(null);
 
   const menuItems = [
     { label: 'Dashboard', path: '/student/dashboard', icon: '📊' },
@@ -20,14 +26,26 @@ const Notifications = () => {
 
   useEffect(() => {
     fetchNotifications();
+    return () => {
+      clearTimeout(flushTimer.current);
+      flushReads();
+    };
   }, []);
 
+  // Cursor for the following page, taken from the API's `next` link
+  const cursorFrom = (next) => (next ? new URL(next).searchParams.get('cursor') : null);
+
   const fetchNotifications = async () => {
     try {
-      const response = await notificationAPI.list();
+      const [response, countRes] = await Promise.all([
+        notificationAPI.list(),
+        notificationAPI.unreadCount(),
+      ]);
       // Ensure we always have an array
       const data = Array.isArray(response.data) ? response.data : (response.data.results || []);
       setNotifications(data);
+      setNextCursor(cursorFrom(response.data.next));
+      setUnreadCount(countRes.data.count);
     } catch (error) {
       setToast({ message: 'Error loading notifications', type: 'error' });
       setNotifications([]); // Set empty array on error
@@ -36,29 +54,53 @@ const Notifications = () => {
     }
   };
 
-  const markAsRead = async (id) => {
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await notificationAPI.list({ cursor: nextCursor });
+      setNotifications([...notifications, ...response.data.results]);
+      setNextCursor(cursorFrom(response.data.next));
+    } catch (error) {
+      setToast({ message: 'Error loading notifications', type: 'error' });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const flushReads = async () => {
+    const ids = [...pendingReads.current];
+    pendingReads.current.clear();
+    if (ids.length === 0) return;
+
     try {
-      await notificationAPI.markRead(id);
-      setNotifications(notifications.map(n =>
-        n.id === id ? { ...n, is_read: true } : n
-      ));
+      await notificationAPI.markReadBulk({ ids });
     } catch (error) {
       setToast({ message: 'Failed to mark as read', type: 'error' });
     }
   };
 
+  const markAsRead = (id) => {
+    setNotifications(current => current.map(n =>
+      n.id === id ? { ...n, is_read: true } : n
+    ));
+    setUnreadCount(count => Math.max(count - 1, 0));
+
+    pendingReads.current.add(id);
+    clearTimeout(flushTimer.current);
+    flushTimer.current = setTimeout(flushReads, 500);
+  };
+
   const markAllAsRead = async () => {
     try {
       await notificationAPI.markAllRead();
       setNotifications(notifications.map(n => ({ ...n, is_read: true })));
+      setUnreadCount(0);
       setToast({ message: 'All notifications marked as read', type: 'success' });
     } catch (error) {
       setToast({ message: 'Failed to mark all as read', type: 'error' });
     }
   };
 
-  const unreadCount = notifications.filter(n => !n.is_read).length;
-
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -145,6 +187,17 @@ const Notifications = () => {
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <div className="text-center">
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="btn btn-secondary"
+                  >
+                    {loadingMore ? 'Loading...' : 'Load More'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>